@@ -0,0 +1,105 @@
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPOSITORY_PATH = Path(__file__).resolve().parent.parent
+
+NOTIFIER_PATH = Path(REPOSITORY_PATH, "Galaxy Life Notifier.py")
+
+
+def load_notifier_module():
+    """
+    Imports Galaxy Life Notifier.py, which can't be imported normally because of the spaces in its name
+
+    :return: The imported module
+    """
+    spec = importlib.util.spec_from_file_location("galaxy_life_notifier", NOTIFIER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["galaxy_life_notifier"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def prepare_environment(notifier, notification_settings: dict | None = None) -> Path:
+    """
+    Points the notifier to a new temporary directory with a fresh data.json and settings.json, so a
+    benchmark never touches the files of the application
+
+    :param notifier: The module returned by load_notifier_module()
+    :param notification_settings: Settings which replace the defaults of the "notification_settings" section
+    :return: The path of the temporary directory
+    """
+    directory = Path(tempfile.mkdtemp(prefix="galaxy_life_notifier_benchmark_"))
+    os.chdir(directory)
+    notifier.MAIN_PATH = str(directory)
+    notifier.DATA_FILE_PATH = Path(directory, "data.json")
+    notifier.OUTBOX_FILE_PATH = Path(directory, "notification_outbox.jsonl")
+    notifier.SETTINGS_FILE_PATH = Path(directory, "settings.json")
+    notifier.PROFILES_PATH = Path(directory, "Profiles")
+    notifier.MESSAGES_PATH = Path(REPOSITORY_PATH, "Messages")
+
+    notifier.create_data_json()
+    notifier.create_settings_json()
+    settings = notifier.MainWindow.load_settings()
+    # Tasks which are already finished when a benchmark starts have to be measured as well
+    settings["global_settings"]["disable_notifications_during_startup"] = False
+    settings["notification_settings"].update(notification_settings or {})
+    notifier.MainWindow.save_settings(settings)
+    return directory
+
+
+def get_git_commit() -> str | None:
+    """
+    :return: The hash of the checked out commit, None if it can't be determined
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPOSITORY_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def percentile(values: list[float], fraction: float) -> float | None:
+    """
+    :param values: The values to take the percentile of
+    :param fraction: The percentile as a fraction (e.g. 0.99)
+    :return: The percentile using the nearest rank, None if there are no values
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(fraction * len(values)), len(values) - 1)]
+
+
+def emit_results(benchmark: str, results: list[dict], output: str | None) -> None:
+    """
+    Writes the results of a benchmark as one JSON document, to stdout or appended as one line to a file
+
+    :param benchmark: The name of the benchmark
+    :param results: One dictionary per benchmark case
+    :param output: The path of the file to append to, None for stdout
+    """
+    document = {
+        "benchmark": benchmark,
+        "commit": get_git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if output is None:
+        print(json.dumps(document, indent=4))
+    else:
+        with open(output, "a", encoding="utf-8") as file:
+            file.write(json.dumps(document) + "\n")
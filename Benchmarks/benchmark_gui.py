@@ -0,0 +1,278 @@
+"""
+Benchmarks the rendering of the GUI: a full redraw of the main window, redrawing the task boards after a
+single task was added, opening the settings windows and repainting after a color change. Every
+measurement also reports the amount of Tk widgets and the amount of images which were decoded.
+
+The main window is drawn with synthetic task sets on a virtual X server (Xvfb), which is started
+automatically when no display is available, so the benchmark runs headless on Linux.
+
+Usage: python Benchmarks/benchmark_gui.py [--sizes 10 100 500] [--output results.jsonl]
+"""
+
+import argparse
+import atexit
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from benchmark_common import emit_results, load_notifier_module, prepare_environment
+
+notifier = load_notifier_module()
+
+PLANET_IMAGES = [
+    "Planet_blue.png",
+    "Planet_green.png",
+    "Planet_red.png",
+    "Planet_violet.png",
+    "Planet_white.png",
+]
+
+
+def start_virtual_display() -> None:
+    """Starts Xvfb on a free display number and points DISPLAY to it, unless a display is already available"""
+    if os.environ.get("DISPLAY"):
+        return
+    if shutil.which("Xvfb") is None:
+        raise SystemExit("No display available and Xvfb is not installed")
+
+    display_number = next(
+        number
+        for number in range(99, 200)
+        if not os.path.exists(f"/tmp/.X{number}-lock")
+    )
+    xvfb = subprocess.Popen(
+        [
+            "Xvfb",
+            f":{display_number}",
+            "-screen",
+            "0",
+            "1920x1080x24",
+            "-nolisten",
+            "tcp",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    atexit.register(xvfb.terminate)
+
+    # Wait until the X server accepts connections
+    socket_path = Path(f"/tmp/.X11-unix/X{display_number}")
+    deadline = time.monotonic() + 10
+    while not socket_path.exists():
+        if xvfb.poll() is not None or time.monotonic() > deadline:
+            raise SystemExit("Xvfb could not be started")
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = f":{display_number}"
+
+
+class ImageDecodeCounter:
+    """Counts the images which are decoded by the notifier, by wrapping PIL.Image.open"""
+
+    def __init__(self):
+        self.count = 0
+        self.original_open = notifier.Image.open
+        notifier.Image.open = self.open
+
+    def open(self, *args, **kwargs):
+        self.count += 1
+        return self.original_open(*args, **kwargs)
+
+
+def count_widgets(widget) -> int:
+    """
+    :param widget: The Tk widget to start counting from
+    :return: The amount of Tk widgets below widget, including widget itself
+    """
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def create_tasks(amount: int, colonies: int, seed: int) -> dict:
+    """
+    Creates a data.json dictionary with unfinished workers and buildings tasks on the Main Planet and colonies
+
+    :param amount: The amount of workers and buildings tasks
+    :param colonies: The amount of enabled colonies
+    :param seed: The seed of the random generator, so every run uses the same tasks
+    :return: dictionary with the item cooldowns and tasks of data.json
+    """
+    generator = random.Random(seed)
+    planets = ["Main Planet"] + [
+        f"Colony {number}" for number in range(1, colonies + 1)
+    ]
+    data = notifier.MainWindow.load_data()
+    now = time.time()
+
+    for task_number in range(amount):
+        planet = generator.choice(planets)
+        deadline = now + generator.uniform(10, 6000) * 60
+        if task_number % 2:
+            data["workers"][f"task_{task_number}"] = notifier.WorkerTask(
+                planet, deadline
+            )
+        else:
+            data["buildings"][f"task_{task_number}"] = notifier.BuildingTask(
+                planet,
+                generator.choice(["Laboratory", "Factory", "StarPort"]),
+                deadline,
+            )
+    return data
+
+
+def enable_colonies(colonies: int) -> None:
+    """
+    Enables colonies in settings.json, each with a planet image
+
+    :param colonies: The amount of colonies to enable
+    """
+    settings = notifier.MainWindow.load_settings()
+    for number in range(1, colonies + 1):
+        settings["planets_settings"][f"colony_{number}"] = {
+            "enabled": True,
+            "planet_image": PLANET_IMAGES[number % len(PLANET_IMAGES)],
+        }
+    notifier.MainWindow.save_settings(settings)
+
+
+def add_single_task(window) -> None:
+    """Adds one workers task to data.json and redraws the workers board, like MainWindow.add_workers_task"""
+    data = notifier.MainWindow.load_data()
+    new_task = notifier.WorkerTask("Main Planet", window.clock.time() + 12 * 3600)
+    task_id = notifier.MainWindow.next_task_id(
+        "main_planet",
+        [
+            task_id
+            for task_id, task in data["workers"].items()
+            if task.planet == "Main Planet"
+        ],
+    )
+    data["workers"] = notifier.MainWindow.insert_task_sorted(
+        data["workers"], task_id, new_task
+    )
+    notifier.MainWindow.save_data(data)
+    window.workers_tasks_display()
+
+
+def open_window(window_class: type) -> Callable:
+    """
+    :param window_class: The settings window to open
+    :return: A scenario which opens the settings window
+    """
+
+    def scenario(window):
+        settings_window = window_class()
+        settings_window.update()
+        return settings_window
+
+    return scenario
+
+
+def change_color(window) -> None:
+    """Changes the main color and repaints the main window, like ColorSettings.on_closing"""
+    color_palette = notifier.MainWindow.load_color_palette()
+    color_palette["MAIN_FG_COLOR"] = (
+        "#2b6cd6" if color_palette["MAIN_FG_COLOR"] != "#2b6cd6" else "#d66c2b"
+    )
+    notifier.MainWindow.save_color_palette(color_palette)
+    notifier.initialize_colors()
+    window.create_window_elements()
+
+
+SCENARIOS = {
+    "full_redraw": lambda window: window.create_window_elements(),
+    "workers_board_redraw": lambda window: window.workers_tasks_display(),
+    "buildings_board_redraw": lambda window: window.buildings_tasks_display(),
+    "single_task_update": add_single_task,
+    "open_global_settings": open_window(notifier.GlobalSettings),
+    "open_planets_settings": open_window(notifier.PlanetsSettings),
+    "open_color_settings": open_window(notifier.ColorSettings),
+    "color_change_repaint": change_color,
+}
+
+
+def measure_scenario(
+    window, scenario: Callable, image_decode_counter: ImageDecodeCounter, repeats: int
+) -> dict:
+    """
+    Measures a scenario, including the time Tk needs to process the resulting drawing
+
+    :param window: The main window
+    :param scenario: The scenario, called with the main window
+    :param image_decode_counter: The counter of the decoded images
+    :param repeats: The amount of times the scenario is timed
+    :return: The measurements of the scenario
+    """
+    durations = []
+    for _ in range(repeats):
+        image_decodes_before = image_decode_counter.count
+        start_time = time.perf_counter()
+        opened_window = scenario(window)
+        window.update()
+        durations.append(time.perf_counter() - start_time)
+        image_decodes = image_decode_counter.count - image_decodes_before
+
+        widgets = count_widgets(window)
+        if opened_window is not None:
+            opened_window.destroy()
+            window.update()
+
+    return {
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        "widgets": widgets,
+        "image_decodes": image_decodes,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--colonies", type=int, default=11)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", help="append the results as one JSON line to this file"
+    )
+    arguments = parser.parse_args()
+
+    start_virtual_display()
+    image_decode_counter = ImageDecodeCounter()
+
+    results = []
+    for amount in arguments.sizes:
+        prepare_environment(notifier)
+        notifier.create_color_palette_json()
+        notifier.initialize_colors()
+        enable_colonies(arguments.colonies)
+        notifier.MainWindow.save_data(
+            create_tasks(amount, arguments.colonies, arguments.seed)
+        )
+
+        # MainWindow.run() isn't used, because it would start the notification manager
+        window = notifier.MainWindow()
+        window.geometry("1600x1000")
+        # The settings windows redraw the main window through this global
+        notifier.main_window = window
+        window.create_window_elements()
+        window.update()
+
+        for scenario_name, scenario in SCENARIOS.items():
+            results.append(
+                {
+                    "scenario": scenario_name,
+                    "tasks": amount,
+                    **measure_scenario(
+                        window, scenario, image_decode_counter, arguments.repeats
+                    ),
+                }
+            )
+        window.destroy()
+    emit_results("gui", results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
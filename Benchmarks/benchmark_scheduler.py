@@ -0,0 +1,378 @@
+"""
+Benchmarks the scheduling of the notification checker: the latency and jitter between the deadline of a
+task and the moment its notification is sent, the amount of wakeups per hour and the CPU time per wakeup.
+
+The tasks are replayed against a virtual clock which jumps straight to the end of every sleep, and the
+notifications are sent to the in-memory backend, so the benchmark runs headless. The cases with up to
+--full-run-max-tasks tasks run until the deadline of every task has passed. Every wakeup saves data.json,
+which takes over a second at 100,000 tasks, so the larger cases stop after --max-wakeups wakeups; their
+deadlines are so close together that almost every wakeup still notifies a task.
+
+The cases with up to --baseline-max-tasks tasks are also run with the notification checker of the first
+commit of the repository as a baseline. Its 60 second polling loop is taken from git and run unchanged;
+only the clock, the toasts and the GUI updates are replaced. The baseline saves data.json once per
+finished task, so its run time grows with the square of the amount of tasks.
+
+Usage: python Benchmarks/benchmark_scheduler.py [--sizes 10 1000 100000] [--output results.jsonl]
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import textwrap
+import time
+from datetime import datetime
+from math import ceil
+from pathlib import Path
+
+from benchmark_common import (
+    REPOSITORY_PATH,
+    emit_results,
+    load_notifier_module,
+    percentile,
+    prepare_environment,
+)
+
+notifier = load_notifier_module()
+
+
+class BenchmarkNotificationManager(notifier.NotificationManager):
+    """Notification manager which counts its wakeups and optionally stops after a maximum amount of wakeups"""
+
+    def __init__(self, max_wakeups: int | None, **kwargs):
+        super().__init__(**kwargs)
+        self.max_wakeups = max_wakeups
+        self.wakeups = 0
+
+    def process_expired_deadlines(self, current_time: float) -> None:
+        self.wakeups += 1
+        super().process_expired_deadlines(current_time)
+        if self.max_wakeups is not None and self.wakeups >= self.max_wakeups:
+            self.running = False
+
+
+def load_baseline_notification_manager(clock: "notifier.VirtualClock") -> type:
+    """
+    Takes the NotificationManager of the first commit from git, together with the MainWindow methods it
+    uses, and runs their source against the virtual clock
+
+    :param clock: The virtual clock which replaces datetime.now() and asyncio.sleep()
+    :return: The NotificationManager class of the first commit
+    """
+
+    def git(*arguments: str) -> str:
+        return subprocess.run(
+            ["git", *arguments],
+            cwd=REPOSITORY_PATH,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+
+    first_commit = git("rev-list", "--max-parents=0", "HEAD").split()[0]
+    source = git("show", f"{first_commit}:Galaxy Life Notifier.py")
+    lines = source.splitlines(keepends=True)
+    classes = {
+        node.name: node
+        for node in ast.parse(source).body
+        if isinstance(node, ast.ClassDef)
+    }
+
+    def get_source(node: ast.AST) -> str:
+        start = min(
+            [node.lineno] + [decorator.lineno for decorator in node.decorator_list]
+        )
+        return textwrap.dedent("".join(lines[start - 1 : node.end_lineno]))
+
+    main_window_source = "class MainWindow:\n" + textwrap.indent(
+        "".join(
+            get_source(method)
+            for method in classes["MainWindow"].body
+            if isinstance(method, ast.FunctionDef)
+            and method.name
+            in ["load_data", "save_data", "load_settings", "compare_to_current_time"]
+        )
+        # The GUI updates of the baseline
+        + "def set_item_text(self, item): pass\n"
+        + "def workers_tasks_display(self): pass\n"
+        + "def buildings_tasks_display(self): pass\n",
+        "    ",
+    )
+
+    class VirtualDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(clock.time(), tz)
+
+    class VirtualAsyncio:
+        sleep = staticmethod(clock.sleep)
+
+    namespace = {
+        "asyncio": VirtualAsyncio,
+        "datetime": VirtualDatetime,
+        "ceil": ceil,
+        "json": json,
+        "random": random,
+        "Path": Path,
+        "MAIN_PATH": notifier.MAIN_PATH,
+        "MAIN_IMAGES_PATH": notifier.MAIN_IMAGES_PATH,
+        "main_window": None,
+        # The baseline prints before every sleep, which would mix with the results on stdout
+        "print": lambda *args, **kwargs: None,
+    }
+    exec(main_window_source, namespace)
+    exec(get_source(classes["NotificationManager"]), namespace)
+    return namespace["NotificationManager"]
+
+
+def create_tasks(amount: int, start_time: float, horizon: float, seed: int) -> dict:
+    """
+    Creates a data.json dictionary with tasks which finish at random moments
+
+    :param amount: The amount of tasks
+    :param start_time: The POSIX timestamp of the start of the benchmark
+    :param horizon: The amount of seconds over which the deadlines are spread
+    :param seed: The seed of the random generator, so every run uses the same tasks
+    :return: dictionary with the item cooldowns and tasks of data.json
+    """
+    generator = random.Random(seed)
+    data = notifier.MainWindow.load_data()
+    for task_number in range(amount):
+        deadline = start_time + generator.uniform(1, horizon)
+        planet = generator.choice(["Main Planet", "Colony 1", "Colony 2"])
+        if task_number % 2:
+            data["workers"][f"task_{task_number}"] = notifier.WorkerTask(
+                planet, deadline
+            )
+        else:
+            data["buildings"][f"task_{task_number}"] = notifier.BuildingTask(
+                planet,
+                generator.choice(["Laboratory", "Factory", "Refinery"]),
+                deadline,
+            )
+    return data
+
+
+def create_baseline_data(data: dict) -> dict:
+    """
+    :param data: dictionary with the item cooldowns and tasks of data.json, as returned by create_tasks()
+    :return: The same tasks in the data.json format of the first commit, with local times without a timezone
+    """
+    baseline_data = {
+        item: {"cooldown": "", "cooldown_finished": True}
+        for item in ["star_battery", "tool_case", "helmet"]
+    }
+    for section in ["workers", "buildings"]:
+        baseline_data[section] = {}
+        for task_id, task in data[section].items():
+            task_info = {
+                "planet": task.planet,
+                "cooldown": datetime.fromtimestamp(task.deadline).isoformat(),
+                "cooldown_finished": False,
+            }
+            if section == "buildings":
+                task_info["building"] = task.building
+            baseline_data[section][task_id] = task_info
+    return baseline_data
+
+
+def summarize(
+    scheduler: str,
+    amount: int,
+    latencies: list[float],
+    wakeups: int,
+    clock: "notifier.VirtualClock",
+    cpu_duration: float,
+    real_duration: float,
+) -> dict:
+    """
+    :param scheduler: The name of the benchmarked scheduler
+    :param amount: The amount of scheduled tasks
+    :param latencies: The seconds between the deadline and the notification of every notified task
+    :param wakeups: The amount of wakeups
+    :param clock: The virtual clock of the case
+    :param cpu_duration: The CPU time of the case in seconds
+    :param real_duration: The real time of the case in seconds
+    :return: The measurements of the case
+    """
+    simulated_hours = clock.elapsed() / 3600
+    return {
+        "scheduler": scheduler,
+        "tasks": amount,
+        "notified_tasks": len(latencies),
+        "wakeups": wakeups,
+        "simulated_hours": simulated_hours,
+        "wakeups_per_hour": wakeups / simulated_hours if simulated_hours else None,
+        "latency_mean": statistics.fmean(latencies) if latencies else None,
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p99": percentile(latencies, 0.99),
+        "latency_max": max(latencies, default=None),
+        "jitter": statistics.pstdev(latencies) if latencies else None,
+        "cpu_per_wakeup": cpu_duration / wakeups if wakeups else None,
+        "real_duration": real_duration,
+    }
+
+
+def run_case(amount: int, horizon: float, max_wakeups: int | None, seed: int) -> dict:
+    """
+    Runs the notification checker over a set of tasks
+
+    :param amount: The amount of scheduled tasks
+    :param horizon: The amount of seconds over which the deadlines are spread
+    :param max_wakeups: The amount of wakeups after which the benchmark stops, None to run until every deadline has passed
+    :param seed: The seed of the random generator
+    :return: The measurements of the case
+    """
+    prepare_environment(notifier, {"digest_window": 0})
+    clock = notifier.VirtualClock(speed=None)
+    notifier.MainWindow.save_data(create_tasks(amount, clock.time(), horizon, seed))
+
+    memory_backend = notifier.MemoryBackend()
+    notification_manager = BenchmarkNotificationManager(
+        max_wakeups,
+        backends=[memory_backend],
+        clock=clock,
+        stop_when_idle=True,
+    )
+
+    cpu_start_time = time.process_time()
+    real_start_time = time.perf_counter()
+    asyncio.run(notification_manager.notification_checker())
+    real_duration = time.perf_counter() - real_start_time
+    cpu_duration = time.process_time() - cpu_start_time
+    notification_manager.cleanup()
+
+    # The outbox ids of tasks end with the deadline of the task
+    latencies = [
+        notifier.datetime.fromisoformat(notification["created_at"]).timestamp()
+        - notifier.parse_deadline(outbox_id.split(":", 2)[2]).timestamp()
+        for notification in memory_backend.notifications
+        for outbox_id in notification["outbox_ids"]
+    ]
+    return summarize(
+        "deadline_heap",
+        amount,
+        latencies,
+        notification_manager.wakeups,
+        clock,
+        cpu_duration,
+        real_duration,
+    )
+
+
+def run_baseline_case(amount: int, horizon: float, seed: int) -> dict:
+    """
+    Runs the notification checker of the first commit over the same tasks as run_case(), until every task
+    has been notified
+
+    :param amount: The amount of scheduled tasks
+    :param horizon: The amount of seconds over which the deadlines are spread
+    :param seed: The seed of the random generator
+    :return: The measurements of the case
+    """
+    prepare_environment(notifier, {"digest_window": 0})
+    clock = notifier.VirtualClock(speed=None)
+    data = create_tasks(amount, clock.time(), horizon, seed)
+    with open(Path(notifier.MAIN_PATH, "data.json"), "w") as file:
+        json.dump(create_baseline_data(data), file, indent=4)
+    settings = notifier.MainWindow.load_settings()
+    # The first commit only has unique messages and icons for the Laboratory, and fails for other buildings
+    settings["global_settings"]["unique_messages"] = False
+    settings["global_settings"]["unique_icons"] = False
+    notifier.MainWindow.save_settings(settings)
+
+    latencies = []
+    wakeups = 0
+    virtual_sleep = clock.sleep
+
+    async def sleep(seconds: float) -> None:
+        nonlocal wakeups
+        wakeups += 1
+        # The baseline never stops by itself
+        if len(latencies) >= amount:
+            notification_manager.running = False
+        else:
+            await virtual_sleep(seconds)
+
+    clock.sleep = sleep
+
+    class BaselineNotificationManager(load_baseline_notification_manager(clock)):
+        def process_notification(self, *, section=None, task_info=None, **kwargs):
+            if task_info is not None:
+                latencies.append(
+                    clock.time()
+                    - datetime.fromisoformat(task_info["cooldown"]).timestamp()
+                )
+            super().process_notification(section=section, task_info=task_info, **kwargs)
+
+        def send_notification(self, message: str, icon_image: str) -> None:
+            pass
+
+    notification_manager = BaselineNotificationManager()
+
+    cpu_start_time = time.process_time()
+    real_start_time = time.perf_counter()
+    asyncio.run(notification_manager.notification_checker())
+    real_duration = time.perf_counter() - real_start_time
+    cpu_duration = time.process_time() - cpu_start_time
+    return summarize(
+        "baseline_poll",
+        amount,
+        latencies,
+        wakeups,
+        clock,
+        cpu_duration,
+        real_duration,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument(
+        "--horizon",
+        type=float,
+        default=6 * 3600,
+        help="the amount of seconds over which the deadlines are spread (default: 6 hours)",
+    )
+    parser.add_argument(
+        "--max-wakeups",
+        type=int,
+        default=25,
+        help="stop the cases with more than --full-run-max-tasks tasks after this amount of wakeups (default: 25)",
+    )
+    parser.add_argument(
+        "--full-run-max-tasks",
+        type=int,
+        default=1000,
+        help="run the cases with at most this amount of tasks until every deadline has passed (default: 1000)",
+    )
+    parser.add_argument(
+        "--baseline-max-tasks",
+        type=int,
+        default=1000,
+        help="only run the baseline for cases with at most this amount of tasks (default: 1000)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", help="append the results as one JSON line to this file"
+    )
+    arguments = parser.parse_args()
+
+    results = []
+    for amount in arguments.sizes:
+        max_wakeups = (
+            None if amount <= arguments.full_run_max_tasks else arguments.max_wakeups
+        )
+        results.append(run_case(amount, arguments.horizon, max_wakeups, arguments.seed))
+        if amount <= arguments.baseline_max_tasks:
+            results.append(run_baseline_case(amount, arguments.horizon, arguments.seed))
+    emit_results("scheduler", results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
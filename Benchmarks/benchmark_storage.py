@@ -0,0 +1,237 @@
+"""
+Benchmarks the storage of the tasks in data.json: the time of every storage operation, the amount of bytes
+written per change and the peak memory, for synthetic data.json files with many colonies and thousands
+of finished and pending workers and buildings tasks.
+
+Every operation is measured for the current storage format (JSON with an indent of 4) and for compact
+JSON as an alternative. Run it with --output to append the results, together with the commit they were
+measured on, to a file which tracks them across versions.
+
+Usage: python Benchmarks/benchmark_storage.py [--sizes 100 1000 10000] [--output results.jsonl]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+
+from benchmark_common import emit_results, load_notifier_module, prepare_environment
+
+notifier = load_notifier_module()
+
+BUILDINGS = ["Laboratory", "Training Camp", "Factory", "StarPort", "Refinery"]
+
+
+def save_data_compact(data: dict) -> None:
+    """
+    Saves the data to data.json without indentation and whitespace
+
+    :param data: dictionary with the item cooldowns and tasks from data.json
+    """
+    with open(notifier.DATA_FILE_PATH, "w") as file:
+        json.dump(notifier.data_to_json(data), file, separators=(",", ":"))
+
+
+STORAGE_FORMATS = {
+    "json_indent": notifier.MainWindow.save_data,
+    "json_compact": save_data_compact,
+}
+
+
+def convert_to_snake_case(text: str) -> str:
+    """Same as MainWindow.convert_to_snake_case, which needs a window"""
+    return "_".join(word.lower() for word in text.split())
+
+
+def create_synthetic_data(
+    amount: int, colonies: int, finished_fraction: float, seed: int
+) -> dict:
+    """
+    Creates a data.json dictionary with task ids and an order like the ones the GUI creates
+
+    :param amount: The amount of workers and buildings tasks
+    :param colonies: The amount of colonies next to the Main Planet
+    :param finished_fraction: The fraction of the tasks which are finished
+    :param seed: The seed of the random generator, so every run uses the same data
+    :return: dictionary with the item cooldowns and tasks of data.json
+    """
+    generator = random.Random(seed)
+    planets = ["Main Planet"] + [
+        f"Colony {number}" for number in range(1, colonies + 1)
+    ]
+    now = time.time()
+    data = {
+        "star_battery": notifier.ItemCooldown(now, True),
+        "tool_case": notifier.ItemCooldown(now, True),
+        "helmet": notifier.ItemCooldown(),
+        "workers": {},
+        "buildings": {},
+    }
+    # Task ids per base, to generate the ids without going through all tasks every time
+    task_ids = {}
+
+    for task_number in range(amount):
+        planet = generator.choice(planets)
+        finished = generator.random() < finished_fraction
+        deadline = now + generator.uniform(-600, 0 if finished else 6000) * 60
+
+        if task_number % 2:
+            section = "workers"
+            new_task = notifier.WorkerTask(planet, deadline, finished)
+            base = convert_to_snake_case(planet)
+        else:
+            section = "buildings"
+            new_task = notifier.BuildingTask(
+                planet, generator.choice(BUILDINGS), deadline, finished
+            )
+            base = convert_to_snake_case(f"{planet} {new_task.building}")
+        task_id = notifier.MainWindow.next_task_id(base, task_ids.get(base, []))
+        task_ids.setdefault(base, []).append(task_id)
+        data[section][task_id] = new_task
+
+    # The GUI keeps the tasks sorted on their deadline
+    for section in ["workers", "buildings"]:
+        data[section] = dict(
+            sorted(data[section].items(), key=lambda task: task[1].deadline)
+        )
+    return data
+
+
+def add_task(data: dict, save_data: Callable) -> None:
+    """The storage part of MainWindow.add_workers_task"""
+    planet = "Colony 1"
+    task_id = notifier.MainWindow.next_task_id(
+        "colony_1",
+        [task_id for task_id, task in data["workers"].items() if task.planet == planet],
+    )
+    new_task = notifier.WorkerTask(planet, time.time() + 12 * 3600)
+    data["workers"] = notifier.MainWindow.insert_task_sorted(
+        data["workers"], task_id, new_task
+    )
+    save_data(data)
+
+
+def remove_task(data: dict, save_data: Callable) -> None:
+    """The storage part of MainWindow.remove_workers_task"""
+    notifier.MainWindow.remove_task(data, "workers", next(iter(data["workers"])))
+    save_data(data)
+
+
+def close(data: dict, save_data: Callable) -> None:
+    """The storage part of MainWindow.on_closing, with auto_delete_completed_tasks enabled"""
+    notifier.MainWindow.remove_finished_tasks(data)
+    for section in ["workers", "buildings"]:
+        data[section] = notifier.MainWindow.reindex_tasks(data[section])
+    save_data(data)
+
+
+def insert_task_sorted(data: dict, save_data: Callable) -> None:
+    """Only the sorted insert of MainWindow.add_workers_task, without saving"""
+    new_task = notifier.WorkerTask("Colony 1", time.time() + 12 * 3600)
+    notifier.MainWindow.insert_task_sorted(data["workers"], "colony_1_0", new_task)
+
+
+def reindex_tasks(data: dict, save_data: Callable) -> None:
+    """Only the reindexing of MainWindow.on_closing, without saving"""
+    for section in ["workers", "buildings"]:
+        notifier.MainWindow.reindex_tasks(data[section])
+
+
+# Operation name: (operation, whether the operation changes data.json)
+OPERATIONS = {
+    "load": (lambda data, save_data: notifier.MainWindow.load_data(), False),
+    "save": (lambda data, save_data: save_data(data), True),
+    "add_task": (add_task, True),
+    "remove_task": (remove_task, True),
+    "close": (close, True),
+    "insert_task_sorted": (insert_task_sorted, False),
+    "reindex_tasks": (reindex_tasks, False),
+}
+
+
+def measure_operation(
+    operation: Callable,
+    mutates: bool,
+    data: dict,
+    save_data: Callable,
+    repeats: int,
+) -> dict:
+    """
+    Measures a storage operation, starting from the same data.json every time
+
+    :param operation: The operation, called with the loaded data and the save function
+    :param mutates: Whether the operation writes data.json
+    :param data: The data to start from
+    :param save_data: The save function of the storage format
+    :param repeats: The amount of times the operation is timed
+    :return: The measurements of the operation
+    """
+    durations = []
+    for _ in range(repeats):
+        save_data(data)
+        loaded_data = notifier.MainWindow.load_data()
+        start_time = time.perf_counter()
+        operation(loaded_data, save_data)
+        durations.append(time.perf_counter() - start_time)
+
+    # Memory is measured in a separate run, because tracemalloc slows everything down
+    save_data(data)
+    loaded_data = notifier.MainWindow.load_data()
+    tracemalloc.start()
+    operation(loaded_data, save_data)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_seconds": statistics.median(durations),
+        "min_seconds": min(durations),
+        # Every change rewrites the whole file
+        "bytes_written": (os.path.getsize(notifier.DATA_FILE_PATH) if mutates else 0),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--colonies", type=int, default=12)
+    parser.add_argument(
+        "--finished-fraction",
+        type=float,
+        default=0.3,
+        help="the fraction of the tasks which are finished (default: 0.3)",
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", help="append the results as one JSON line to this file"
+    )
+    arguments = parser.parse_args()
+
+    results = []
+    prepare_environment(notifier)
+    for amount in arguments.sizes:
+        data = create_synthetic_data(
+            amount, arguments.colonies, arguments.finished_fraction, arguments.seed
+        )
+        for storage_format, save_data in STORAGE_FORMATS.items():
+            for operation_name, (operation, mutates) in OPERATIONS.items():
+                results.append(
+                    {
+                        "storage_format": storage_format,
+                        "operation": operation_name,
+                        "tasks": amount,
+                        **measure_operation(
+                            operation, mutates, data, save_data, arguments.repeats
+                        ),
+                    }
+                )
+    emit_results("storage", results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmarks the delivery of notifications to a webhook: the time per notification and the amount of
+connections and requests, for a new connection per notification (like urllib), for pooled connections
+with one request per notification, and for pooled connections with batches of up to 10 notifications
+per request (the discord backend).
+
+The notifications are posted to the mock webhook server in Tools, so the benchmark runs on localhost.
+Over the internet, where every new connection also costs a TLS handshake, the differences are larger.
+
+Usage: python Benchmarks/benchmark_webhook.py [--notifications 100 1000] [--output results.jsonl]
+"""
+
+import argparse
+import json
+import sys
+import time
+import urllib.request
+
+from benchmark_common import REPOSITORY_PATH, emit_results, load_notifier_module
+
+sys.path.append(str(REPOSITORY_PATH / "Tools"))
+
+from mock_webhook_server import MockWebhookServer  # noqa: E402
+
+notifier = load_notifier_module()
+
+
+def create_notifications(amount: int) -> list[dict]:
+    """
+    :param amount: The amount of notifications
+    :return: Notifications like the ones the notification manager sends
+    """
+    return [
+        {
+            "title": "Galaxy Life Notifier",
+            "message": f"I'm finished on Colony {number % 11 + 1}, Chief!",
+            "icon_image": "Worker_Happy.ico",
+            "priority": "workers",
+            "created_at": notifier.utc_now().isoformat(),
+            "outbox_ids": [f"workers:colony_{number}"],
+        }
+        for number in range(amount)
+    ]
+
+
+def send_new_connections(url: str, notifications: list[dict]) -> None:
+    """Posts every notification over a new connection, like the webhook backend before the connection pool"""
+    for notification in notifications:
+        request = urllib.request.Request(
+            url,
+            data=json.dumps({"notifications": [notification]}).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+def send_pooled(url: str, notifications: list[dict]) -> None:
+    """Posts every notification as its own request over pooled connections"""
+    backend = notifier.WebhookBackend(url)
+    for notification in notifications:
+        backend.send(notification)
+    backend.close()
+
+
+def send_pooled_batched(url: str, notifications: list[dict]) -> None:
+    """Posts the notifications as one batch with the discord backend, 10 embeds per request"""
+    backend = notifier.DiscordWebhookBackend(url)
+    backend.send_batch(notifications)
+    backend.close()
+
+
+STRATEGIES = {
+    "new_connection": send_new_connections,
+    "pooled": send_pooled,
+    "pooled_batched": send_pooled_batched,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--notifications", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument(
+        "--output", help="append the results as one JSON line to this file"
+    )
+    arguments = parser.parse_args()
+
+    results = []
+    for amount in arguments.notifications:
+        notifications = create_notifications(amount)
+        for strategy_name, strategy in STRATEGIES.items():
+            mock_webhook_server = MockWebhookServer()
+            mock_webhook_server.start()
+            start_time = time.perf_counter()
+            strategy(mock_webhook_server.url, notifications)
+            duration = time.perf_counter() - start_time
+            stats = mock_webhook_server.stats()
+            mock_webhook_server.stop()
+            results.append(
+                {
+                    "strategy": strategy_name,
+                    "notifications": amount,
+                    "seconds_per_notification": duration / amount,
+                    "requests": stats["requests"],
+                    "connections": stats["connections"],
+                }
+            )
+    emit_results("webhook", results, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
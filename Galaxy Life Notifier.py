@@ -1,22 +1,61 @@
+import argparse
 import asyncio
+import atexit
+import bisect
+import concurrent.futures
+import contextlib
+import copy
+import csv
+import cProfile
 import ctypes
+import ctypes.util
+import errno
+import functools
+import gzip
+import heapq
+import io
+import http.client
+import http.server
+import ipaddress
+import itertools
 import json
+import logging
+import logging.handlers
+import math
+import mmap
 import os
+import queue
 import random
 import re
+import select
+import shutil
+import struct
+import subprocess
 import sys
+import tempfile
 import threading
+import time
+import tracemalloc
+import urllib.parse
 import webbrowser
-from datetime import datetime, timedelta
-from math import ceil
+from collections import Counter, deque
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from tkinter import TclError
 from tkinter.colorchooser import askcolor
+from xml.sax.saxutils import escape, quoteattr
 
 import customtkinter as ctk
 import psutil
 from PIL import Image
-from winotify import Notification, audio
+
+try:
+    from winotify import Notification, audio
+except ImportError:
+    # winotify only works on Windows, the other notification backends can still be used
+    Notification = None
+    audio = None
 
 ctk.set_appearance_mode("dark")
 
@@ -33,7 +72,34 @@ MAIN_IMAGES_PATH = Path(MAIN_PATH, "Images")
 
 PLANETS_IMAGES_PATH = Path(MAIN_IMAGES_PATH, "Planets")
 
-LOCK_FILE_PATH = Path(MAIN_PATH, "notification_manager.lock")
+MESSAGES_PATH = Path(MAIN_PATH, "Messages")
+
+DATA_FILE_PATH = Path(MAIN_PATH, "data.json")
+
+OUTBOX_FILE_PATH = Path(MAIN_PATH, "notification_outbox.jsonl")
+
+SETTINGS_FILE_PATH = Path(MAIN_PATH, "settings.json")
+
+PROFILES_PATH = Path(MAIN_PATH, "Profiles")
+
+DEFAULT_PROFILE_NAME = "default"
+
+# The profile shown by the GUI, changed with --profile
+ACTIVE_PROFILE_NAME = DEFAULT_PROFILE_NAME
+
+PROFILING_PATH = Path(MAIN_PATH, "Profiling")
+
+# e.g. "notifier:sampling,ui:cprofile,memory", see ProfilerController.start_from_environment
+PROFILE_ENVIRONMENT_VARIABLE = "GALAXY_LIFE_NOTIFIER_PROFILE"
+
+# Every subsystem has its own logger, so their levels can be set separately in settings.json
+LOGGER_NAME = "galaxy_life_notifier"
+SCHEDULER_LOGGER = logging.getLogger(f"{LOGGER_NAME}.scheduler")
+STORAGE_LOGGER = logging.getLogger(f"{LOGGER_NAME}.storage")
+UI_LOGGER = logging.getLogger(f"{LOGGER_NAME}.ui")
+DELIVERY_LOGGER = logging.getLogger(f"{LOGGER_NAME}.delivery")
+SERVER_LOGGER = logging.getLogger(f"{LOGGER_NAME}.server")
+PROFILING_LOGGER = logging.getLogger(f"{LOGGER_NAME}.profiling")
 
 # Default Colors
 DEFAULT_MAIN_FG_COLOR = "#d66c2b"
@@ -44,331 +110,4797 @@ DEFAULT_REMOVE_TASK_BUTTON_HOVER_COLOR = "#8b0000"
 # TODO: Make a tab for making notes (v1.2)
 # TODO: Make a tab for calculating how many items you need in total to upgrade starbases, unlock workers, etc.(v1.2)
 
-class NotificationManager:
+
+class JsonLogFormatter(logging.Formatter):
+    """Formats every log record as one JSON object, with the structured data from extra={"data": {...}}"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "subsystem": record.name.rsplit(".", 1)[-1],
+            "message": record.getMessage(),
+            **getattr(record, "data", {}),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def setup_logging(
+    logging_settings: dict, console: bool = False
+) -> logging.handlers.QueueListener:
+    """
+    Sends the log records of all subsystems through a queue to a rotating log file and optionally the
+    console. Logging only puts the records in the queue, the writing is done by a separate thread, so a
+    slow or blocked console or disk never holds up the notifier.
+
+    :param logging_settings: The "logging_settings" section of settings.json
+    :param console: Also write the log records to the console
+    :return: The listener which writes the log records, stop it to write the remaining records
+    """
+    handlers = []
+    if logging_settings["file"]:
+        file_handler = logging.handlers.RotatingFileHandler(
+            Path(MAIN_PATH, logging_settings["file"]),
+            maxBytes=logging_settings["max_bytes"],
+            backupCount=logging_settings["backup_count"],
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonLogFormatter())
+        handlers.append(file_handler)
+    if console or logging_settings["console"]:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+        )
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    logger.propagate = False
+    # Records of disabled levels are dropped before they are formatted or queued
+    for subsystem, level in logging_settings["levels"].items():
+        logging.getLogger(f"{LOGGER_NAME}.{subsystem}").setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    return listener
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and histograms of what the notifier and the GUI do at runtime. Recording a value
+    is a dictionary update under a lock, so the metrics can always stay on. The metrics are rendered in
+    the Prometheus text format.
+    """
+
+    DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 60)
+
     def __init__(self):
-        self.running = True
+        # (name, labels): value
+        self.counters = {}
+        # (name, labels): [bucket counts, sum, count]
+        self.histograms = {}
+        self.lock = threading.Lock()
 
-    async def notification_checker(self) -> None:
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
         """
-        Checks the data.json file for scheduled notifications and sends notifications if needed
+        Increases a counter
+
+        :param name: The name of the counter
+        :param amount: The amount to increase the counter with
+        :param labels: The labels of the counter (e.g. backend="webhook")
         """
-        settings = MainWindow.load_settings()
-        self.global_settings = settings["global_settings"]
-        self.first_iteration = settings["global_settings"][
-            "disable_notifications_during_startup"
-        ]
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
 
-        while self.running:
-            self.data = MainWindow.load_data()
-            min_cooldown_time = None
-            run_workers_task_display = False
-            run_buildings_task_display = False
-
-            # Process each item and task, updating GUI and calculating minimum cooldown time
-            for item in ["star_battery", "tool_case", "helmet"]:
-                if not self.data[item]["cooldown_finished"]:
-                    scheduled_time = self.data[item]["cooldown"]
-                    if MainWindow.compare_to_current_time(scheduled_time):
-                        MainWindow.set_item_text(main_window, item)
-                        self.cooldown_finished(item=item)
-                        self.process_notification(item=item)
-                    min_cooldown_time = self.update_min_cooldown_time(
-                        min_cooldown_time, scheduled_time
-                    )
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Adds a value to a histogram
 
-            for section in ["workers", "buildings"]:
-                for task_id, task_info in self.data[section].items():
-                    if not task_info["cooldown_finished"]:
-                        scheduled_time = task_info["cooldown"]
-                        if MainWindow.compare_to_current_time(scheduled_time):
-                            self.cooldown_finished(section=section, task_id=task_id)
-                            self.process_notification(
-                                section=section, task_info=task_info
-                            )
-                            if section == "workers":
-                                run_workers_task_display = True
-                            elif section == "buildings":
-                                run_buildings_task_display = True
-                        min_cooldown_time = self.update_min_cooldown_time(
-                            min_cooldown_time, scheduled_time
-                        )
+        :param name: The name of the histogram
+        :param value: The observed value
+        :param labels: The labels of the histogram (e.g. operation="load")
+        """
+        key = (name, tuple(sorted(labels.items())))
+        bucket_index = bisect.bisect_left(self.DEFAULT_BUCKETS, value)
+        with self.lock:
+            if key not in self.histograms:
+                self.histograms[key] = [[0] * len(self.DEFAULT_BUCKETS), 0.0, 0]
+            histogram = self.histograms[key]
+            if bucket_index < len(self.DEFAULT_BUCKETS):
+                histogram[0][bucket_index] += 1
+            histogram[1] += value
+            histogram[2] += 1
+
+    @staticmethod
+    def format_labels(labels: tuple[tuple[str, str], ...]) -> str:
+        """
+        :param labels: The labels as (name, value) pairs
+        :return: The labels in the Prometheus text format, e.g. '{backend="webhook"}'
+        """
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{name}="{value}"' for name, value in labels) + "}"
+
+    def render(self) -> str:
+        """
+        :return: All metrics in the Prometheus text format
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {
+                key: (list(buckets), total, count)
+                for key, (buckets, total, count) in self.histograms.items()
+            }
+
+        lines = []
+        for (name, labels), value in sorted(counters.items()):
+            lines.append(f"{name}{self.format_labels(labels)} {value}")
+        for (name, labels), (buckets, total, count) in sorted(histograms.items()):
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(self.DEFAULT_BUCKETS, buckets):
+                cumulative_count += bucket_count
+                bucket_labels = labels + (("le", str(upper_bound)),)
+                lines.append(
+                    f"{name}_bucket{self.format_labels(bucket_labels)} {cumulative_count}"
+                )
+            lines.append(
+                f'{name}_bucket{self.format_labels(labels + (("le", "+Inf"),))} {count}'
+            )
+            lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+            lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: Path) -> None:
+        """
+        Writes all metrics to a file, replacing the file at once so readers never see a partial file
+
+        :param path: The path of the metrics file
+        """
+        with open_atomically(path, encoding="utf-8") as file:
+            file.write(self.render())
+
+
+METRICS = MetricsRegistry()
+
+
+class MetricsFileWriter(threading.Thread):
+    """Writes the metrics to a file at a fixed interval, and one last time when it is stopped"""
+
+    def __init__(self, path: Path, interval: float):
+        """
+        :param path: The path of the metrics file
+        :param interval: The amount of seconds between two writes
+        """
+        super().__init__(daemon=True)
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            self.write()
+
+    def write(self) -> None:
+        try:
+            METRICS.write_file(self.path)
+        except OSError:
+            STORAGE_LOGGER.exception("Could not write the metrics file")
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.write()
+
+
+class LocalHttpRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Passes the requests to the handler of the route which is registered for the method and path"""
+
+    def handle_request(self, method: str) -> None:
+        url = urllib.parse.urlsplit(self.path)
+        route_handler = self.server.routes.get((method, url.path))
+        if route_handler is None:
+            status, content_type, body = 404, "text/plain", "Not found\n"
+        else:
+            content_length = int(self.headers.get("Content-Length", 0))
+            request_body = self.rfile.read(content_length) if content_length else b""
+            try:
+                status, content_type, body = route_handler(
+                    request_body, urllib.parse.parse_qs(url.query)
+                )
+            except Exception:
+                SERVER_LOGGER.exception("The %s %s request failed", method, url.path)
+                status, content_type, body = 500, "text/plain", "Internal error\n"
+
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def log_message(self, format: str, *args) -> None:
+        SERVER_LOGGER.debug(format, *args)
 
-            if run_workers_task_display:
-                MainWindow.workers_tasks_display(main_window)
 
-            if run_buildings_task_display:
-                MainWindow.buildings_tasks_display(main_window)
+class LocalHttpServer:
+    """
+    HTTP server which only listens on the loopback interface, so other tools on the same computer can talk
+    to the notifier. The parts of the notifier register their own routes.
+    """
 
-            if self.first_iteration:
-                self.first_iteration = False
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765):
+        """
+        :param host: The address to listen on, which has to be a loopback address
+        :param port: The port to listen on
+        """
+        if not ipaddress.ip_address(host).is_loopback:
+            raise ValueError(
+                f"The local server can only listen on loopback, not {host}"
+            )
+        self.host = host
+        self.port = port
+        self.routes = {}
+        self.http_server = None
+
+    def add_route(
+        self,
+        method: str,
+        path: str,
+        route_handler: Callable[[bytes, dict], tuple[int, str, str | bytes]],
+    ) -> None:
+        """
+        Registers a route
+
+        :param method: The HTTP method of the route (e.g. "GET", "POST")
+        :param path: The path of the route (e.g. "/metrics")
+        :param route_handler: Called with the request body and the query parameters, returns the status, content type and body of the response
+        """
+        self.routes[(method, path)] = route_handler
+
+    def start(self) -> None:
+        """Starts serving requests in a background thread"""
+        self.http_server = http.server.ThreadingHTTPServer(
+            (self.host, self.port), LocalHttpRequestHandler
+        )
+        self.http_server.daemon_threads = True
+        self.http_server.routes = self.routes
+        threading.Thread(target=self.http_server.serve_forever, daemon=True).start()
+        SERVER_LOGGER.info("Listening on http://%s:%d", self.host, self.port)
+
+    def stop(self) -> None:
+        """Stops serving requests"""
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+
+
+class SamplingProfiler(threading.Thread):
+    """
+    Samples the call stack of another thread at a fixed interval. This costs the profiled thread almost
+    nothing, so it can be used while the notifier is running normally. The result is written as collapsed
+    stacks, one line per call stack with the amount of samples, which most flame graph tools can read.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        """
+        :param thread_id: The id of the thread to sample (threading.get_ident() of that thread)
+        :param interval: The amount of seconds between two samples
+        """
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stack_counts = Counter()
+        self.stopped = threading.Event()
 
-            # Calculate sleep duration
-            if min_cooldown_time:
-                sleep_duration = ceil(
-                    max((min_cooldown_time - datetime.now()).total_seconds(), 1)
+    def run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                # The thread has ended
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
                 )
-                sleep_duration = min(sleep_duration, 60)
+                frame = frame.f_back
+            self.stack_counts[";".join(reversed(stack))] += 1
+
+    def stop(self, path: Path) -> None:
+        """
+        Stops sampling and writes the collapsed stacks
+
+        :param path: The path of the file to write the collapsed stacks to
+        """
+        self.stopped.set()
+        self.join()
+        with open(path, "w", encoding="utf-8") as file:
+            for stack, count in self.stack_counts.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+class ProfilerController:
+    """
+    Starts and stops profiling of the notifier thread and the Tk thread separately, while the application
+    keeps running, and takes tracemalloc snapshots. The results are written to timestamped files in the
+    Profiling folder.
+
+    cProfile only profiles the thread which enables it, so it is started and stopped on the profiled thread
+    itself, through the function which that thread registered to run code on it.
+    """
+
+    PROFILING_MODES = ["cprofile", "sampling"]
+    # The maximum amount of seconds to wait for a thread to start cProfile
+    start_timeout = 5
+
+    def __init__(self, directory: Path):
+        """
+        :param directory: The folder to write the results to
+        """
+        self.directory = directory
+        # Thread name: (thread id, function which runs a callable on that thread)
+        self.threads = {}
+        # Thread name: (mode, cProfile.Profile or SamplingProfiler)
+        self.active_profilers = {}
+        # Names of the threads which are starting cProfile on themselves
+        self.starting = set()
+        self.lock = threading.Lock()
+
+    def register_thread(
+        self, name: str, thread_id: int, call_on_thread: Callable[[Callable], object]
+    ) -> None:
+        """
+        Registers a thread which can be profiled
+
+        :param name: The name of the thread (e.g. "notifier", "ui")
+        :param thread_id: The id of the thread (threading.get_ident() of that thread)
+        :param call_on_thread: Runs the given callable on the thread, e.g. loop.call_soon_threadsafe
+        """
+        with self.lock:
+            self.threads[name] = (thread_id, call_on_thread)
+
+    def create_result_path(self, name: str, extension: str) -> Path:
+        """
+        :param name: The first part of the file name (e.g. "notifier_cprofile")
+        :param extension: The extension of the file (e.g. "prof")
+        :return: A new timestamped path in the results folder
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        return Path(
+            self.directory, f"{name}_{datetime.now():%Y%m%d_%H%M%S_%f}.{extension}"
+        )
+
+    def start(self, thread_name: str, mode: str) -> None:
+        """
+        Starts profiling a thread. cProfile is only registered as active once the thread has enabled it.
+
+        :param thread_name: The name of the registered thread
+        :param mode: "cprofile" to record every call, "sampling" to sample the call stack
+        :raises ValueError: When the thread is unknown or already profiled, or cProfile couldn't be started
+        """
+        if mode not in self.PROFILING_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        with self.lock:
+            if thread_name not in self.threads:
+                raise ValueError(f"Unknown thread: {thread_name}")
+            if thread_name in self.active_profilers or thread_name in self.starting:
+                raise ValueError(f"The {thread_name} thread is already being profiled")
+            thread_id, call_on_thread = self.threads[thread_name]
+            if mode == "sampling":
+                profiler = SamplingProfiler(thread_id)
+                profiler.start()
+                self.active_profilers[thread_name] = (mode, profiler)
+            else:
+                self.starting.add(thread_name)
+
+        if mode == "cprofile":
+            try:
+                profiler = self.enable_on_thread(thread_name, thread_id, call_on_thread)
+                with self.lock:
+                    self.active_profilers[thread_name] = (mode, profiler)
+            finally:
+                with self.lock:
+                    self.starting.discard(thread_name)
+        PROFILING_LOGGER.info(
+            "Started %s profiling of the %s thread", mode, thread_name
+        )
+
+    def enable_on_thread(
+        self,
+        thread_name: str,
+        thread_id: int,
+        call_on_thread: Callable[[Callable], object],
+    ) -> cProfile.Profile:
+        """
+        Enables cProfile on a thread and waits until it is enabled
+
+        :param thread_name: The name of the registered thread
+        :param thread_id: The id of the thread
+        :param call_on_thread: The function which runs a callable on the thread
+        :return: The enabled profiler
+        :raises ValueError: When the thread couldn't enable cProfile in time
+        """
+        profiler = cProfile.Profile()
+        enabled = concurrent.futures.Future()
+
+        def enable() -> None:
+            if not enabled.set_running_or_notify_cancel():
+                # start() stopped waiting
+                return
+            try:
+                profiler.enable()
+            except ValueError as e:
+                # Another profiler is already active on Python 3.12 and newer
+                enabled.set_exception(e)
+            else:
+                enabled.set_result(None)
+
+        if threading.get_ident() == thread_id:
+            # Waiting for the thread on the thread itself would never end
+            enable()
+        else:
+            try:
+                call_on_thread(enable)
+            except (RuntimeError, TclError) as e:
+                raise ValueError(
+                    f"The {thread_name} thread isn't running anymore"
+                ) from e
+        try:
+            enabled.result(self.start_timeout)
+        except concurrent.futures.TimeoutError:
+            if not enabled.cancel():
+                # The thread started enabling cProfile right after the timeout
+                enabled.result()
+                return profiler
+            raise ValueError(
+                f"The {thread_name} thread didn't start cProfile within {self.start_timeout} seconds"
+            ) from None
+        except ValueError as e:
+            raise ValueError(f"Couldn't start cProfile: {e}") from e
+        return profiler
+
+    def stop(self, thread_name: str) -> Path:
+        """
+        Stops profiling a thread and writes the result. A cProfile result is written by the profiled thread,
+        so it can appear shortly after this returns.
+
+        :param thread_name: The name of the registered thread
+        :return: The path of the result file
+        """
+        with self.lock:
+            if thread_name not in self.active_profilers:
+                raise ValueError(f"The {thread_name} thread isn't being profiled")
+            mode, profiler = self.active_profilers.pop(thread_name)
+            thread_id, call_on_thread = self.threads[thread_name]
+
+        if mode == "cprofile":
+            path = self.create_result_path(f"{thread_name}_cprofile", "prof")
+
+            def disable_and_dump() -> None:
+                profiler.disable()
+                profiler.dump_stats(path)
+
+            if threading.get_ident() == thread_id:
+                # E.g. when the ui thread stops its own profiling, or when the application exits
+                disable_and_dump()
             else:
-                sleep_duration = 60
+                try:
+                    call_on_thread(disable_and_dump)
+                except (RuntimeError, TclError):
+                    # The thread doesn't run its event loop anymore (e.g. when the application exits)
+                    disable_and_dump()
+        else:
+            path = self.create_result_path(f"{thread_name}_sampling", "txt")
+            profiler.stop(path)
+        PROFILING_LOGGER.info("Writing the %s profile to %s", thread_name, path)
+        return path
+
+    def is_profiling(self, thread_name: str) -> bool:
+        """
+        :param thread_name: The name of the registered thread
+        :return: True if the thread is being profiled
+        """
+        with self.lock:
+            return thread_name in self.active_profilers
+
+    def take_memory_snapshot(self) -> Path:
+        """
+        Writes a tracemalloc snapshot, which can be loaded with tracemalloc.Snapshot.load(). Memory tracing
+        starts with the first snapshot, so only allocations after that are included in later snapshots.
+
+        :return: The path of the snapshot file
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(25)
+        path = self.create_result_path("memory", "snapshot")
+        tracemalloc.take_snapshot().dump(path)
+        PROFILING_LOGGER.info("Wrote a memory snapshot to %s", path)
+        return path
+
+    def status(self) -> dict:
+        """
+        :return: The registered threads, the active profilers and whether memory is being traced
+        """
+        with self.lock:
+            return {
+                "threads": sorted(self.threads),
+                "profiling": {
+                    thread_name: mode
+                    for thread_name, (mode, _) in self.active_profilers.items()
+                },
+                "tracing_memory": tracemalloc.is_tracing(),
+            }
+
+    @staticmethod
+    def read_environment() -> dict[str, str]:
+        """
+        Reads the profiling which is requested through the GALAXY_LIFE_NOTIFIER_PROFILE environment variable,
+        e.g. GALAXY_LIFE_NOTIFIER_PROFILE="notifier:sampling,ui:cprofile,memory"
+
+        :return: dictionary with the thread name as key and the profiling mode as value, "memory" has no mode
+        """
+        requested = {}
+        for entry in os.environ.get(PROFILE_ENVIRONMENT_VARIABLE, "").split(","):
+            name, _, mode = entry.strip().partition(":")
+            if name:
+                requested[name] = mode or "sampling"
+        return requested
+
+    def start_from_environment(self, thread_name: str) -> None:
+        """
+        Starts profiling a thread when the environment variable asks for it. The profile is written when the
+        application exits.
+
+        :param thread_name: The name of the thread which was just registered
+        """
+        mode = self.read_environment().get(thread_name)
+        if mode is None or self.is_profiling(thread_name):
+            return
+        try:
+            self.start(thread_name, mode)
+        except ValueError:
+            PROFILING_LOGGER.exception("Couldn't start the requested profiling")
+            return
+        atexit.register(self.stop_if_profiling, thread_name)
+
+    def stop_if_profiling(self, thread_name: str) -> None:
+        """
+        Stops profiling a thread if it is being profiled
+
+        :param thread_name: The name of the registered thread
+        """
+        if self.is_profiling(thread_name):
+            self.stop(thread_name)
+
+    def add_routes(self, local_server: "LocalHttpServer") -> None:
+        """
+        Lets other programs control the profiling through the local server:
+
+        - GET /profiling: The status of the profiling
+        - POST /profiling/start?thread=notifier&mode=sampling: Starts profiling a thread
+        - POST /profiling/stop?thread=notifier: Stops profiling a thread and writes the result
+        - POST /profiling/memory_snapshot: Writes a tracemalloc snapshot
+
+        :param local_server: The local server to add the routes to
+        """
+
+        def respond(action: Callable[[], object]) -> tuple[int, str, str]:
+            try:
+                result = action()
+            except ValueError as e:
+                return 400, "application/json", json.dumps({"error": str(e)})
+            return 200, "application/json", json.dumps({"result": result}, default=str)
+
+        local_server.add_route(
+            "GET", "/profiling", lambda body, query: respond(self.status)
+        )
+        local_server.add_route(
+            "POST",
+            "/profiling/start",
+            lambda body, query: respond(
+                lambda: self.start(
+                    query.get("thread", [""])[0], query.get("mode", ["sampling"])[0]
+                )
+            ),
+        )
+        local_server.add_route(
+            "POST",
+            "/profiling/stop",
+            lambda body, query: respond(
+                lambda: self.stop(query.get("thread", [""])[0])
+            ),
+        )
+        local_server.add_route(
+            "POST",
+            "/profiling/memory_snapshot",
+            lambda body, query: respond(self.take_memory_snapshot),
+        )
+
+
+PROFILER = ProfilerController(PROFILING_PATH)
+
+
+def open_image(path: Path) -> Image.Image:
+    """
+    Opens an image, and counts it in the image decodes metric
+
+    :param path: The path of the image
+    :return: The opened image
+    """
+    METRICS.increment("image_decodes_total")
+    return Image.open(path)
+
+
+def record_widget_rebuild(view: str) -> Callable:
+    """
+    Decorator which counts and times the calls of a method that rebuilds the widgets of a view
+
+    :param view: The name of the view in the metrics (e.g. "workers_tasks")
+    :return: The decorator
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                METRICS.increment("widget_rebuilds_total", view=view)
+                METRICS.observe(
+                    "widget_rebuild_seconds",
+                    time.perf_counter() - start_time,
+                    view=view,
+                )
+
+        return wrapper
+
+    return decorator
+
+
+def utc_now() -> datetime:
+    """
+    :return: The current datetime in UTC, the timezone in which all deadlines are stored
+    """
+    return datetime.now(timezone.utc)
+
+
+def parse_deadline(deadline: str) -> datetime:
+    """
+    Parses a deadline from data.json
+
+    :param deadline: The deadline in ISO 8601 format, deadlines without a timezone are treated as local time
+    :return: The deadline as a datetime in UTC
+    """
+    # astimezone() interprets a naive datetime as local time
+    return datetime.fromisoformat(deadline).astimezone(timezone.utc)
+
+
+def format_deadline(deadline: float) -> str:
+    """
+    Formats a deadline to store it in data.json
+
+    :param deadline: The deadline as a POSIX timestamp
+    :return: The deadline in ISO 8601 format in UTC
+    """
+    return datetime.fromtimestamp(deadline, timezone.utc).isoformat()
+
+
+def to_local_datetime(deadline: float) -> datetime:
+    """
+    Converts a deadline to the local timezone, to display it
+
+    :param deadline: The deadline as a POSIX timestamp
+    :return: The deadline as a datetime in the local timezone
+    """
+    return datetime.fromtimestamp(deadline, timezone.utc).astimezone()
+
+
+def get_file_signature(path: Path) -> tuple[int, int] | None:
+    """
+    Returns a cheap signature of a file, which changes whenever the file gets written
+
+    :param path: The path of the file
+    :return: The modification time in nanoseconds and the size of the file, None if the file doesn't exist
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Held while data.json is loaded, changed and saved, so the Tk thread and the notifier thread never save over
+# each other's changes
+DATA_LOCK = threading.RLock()
+
+
+@contextlib.contextmanager
+def open_atomically(
+    path: Path, mode: str = "w", encoding: str | None = None
+) -> Iterator:
+    """
+    Opens a new temporary file next to a file, which replaces the file at once when it is closed without an
+    error, so a program which reads the file at the same time never sees it half-written. Every write gets
+    its own temporary file, so two threads which write the same file at the same time don't interfere.
+
+    :param path: The path of the file
+    :param mode: "w" to write text, "wb" to write bytes
+    :param encoding: The encoding of a text file, by default the one of open()
+    :return: The opened temporary file
+    """
+    path = Path(path)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, mode, encoding=encoding) as file:
+            # mkstemp() only lets the owner read the file, keep the permissions of the replaced file instead
+            try:
+                shutil.copymode(path, temporary_path)
+            except FileNotFoundError:
+                os.chmod(temporary_path, 0o644)
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(temporary_path)
+        raise
+
+
+def write_file_atomically(path: Path, text: str) -> None:
+    """
+    Writes a file through a temporary file which replaces it at once, see open_atomically()
+
+    :param path: The path of the file
+    :param text: The new contents of the file
+    """
+    with open_atomically(path) as file:
+        file.write(text)
+
+
+class ItemCooldown:
+    """The cooldown of an item (Star Battery, Tool Case or Helmet), stored in data.json under the name of the item"""
+
+    __slots__ = ("deadline", "cooldown_finished")
+
+    def __init__(self, deadline: float | None = None, cooldown_finished: bool = False):
+        """
+        :param deadline: The POSIX timestamp when the item can be collected again, None if it was never collected
+        :param cooldown_finished: Whether the notification of the item has been sent
+        """
+        self.deadline = deadline
+        self.cooldown_finished = cooldown_finished
+
+    @classmethod
+    def from_dict(cls, item_info: dict) -> "ItemCooldown":
+        """
+        :param item_info: The information of the item in data.json
+        :return: The cooldown of the item
+        """
+        # Items which were never collected have an empty cooldown
+        cooldown = item_info["cooldown"]
+        return cls(
+            parse_deadline(cooldown).timestamp() if cooldown else None,
+            item_info["cooldown_finished"],
+        )
+
+    def to_dict(self) -> dict:
+        """
+        :return: The information of the item in the format of data.json
+        """
+        return {
+            "cooldown": (
+                format_deadline(self.deadline) if self.deadline is not None else ""
+            ),
+            "cooldown_finished": self.cooldown_finished,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            type(other) is ItemCooldown
+            and self.deadline == other.deadline
+            and self.cooldown_finished == other.cooldown_finished
+        )
+
+
+class Task:
+    """
+    A workers or buildings task. Planet names are interned, so all tasks on the same planet share one string,
+    and the deadline is kept as a POSIX timestamp, so it can be compared without parsing.
+    """
+
+    __slots__ = ("planet", "deadline", "cooldown_finished")
+
+    # The section of data.json the task is stored in
+    section = ""
+
+    def __init__(self, planet: str, deadline: float, cooldown_finished: bool = False):
+        """
+        :param planet: The planet of the task (e.g. "Main Planet", "Colony 1")
+        :param deadline: The POSIX timestamp when the task finishes
+        :param cooldown_finished: Whether the notification of the task has been sent
+        """
+        self.planet = sys.intern(planet)
+        self.deadline = deadline
+        self.cooldown_finished = cooldown_finished
+
+    @property
+    def task_type(self) -> str:
+        """The type of the task in the notification messages (e.g. "workers", "Laboratory")"""
+        return self.section
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            type(other) is type(self)
+            and self.planet == other.planet
+            and self.task_type == other.task_type
+            and self.deadline == other.deadline
+            and self.cooldown_finished == other.cooldown_finished
+        )
+
+    @classmethod
+    def from_dict(cls, task_info: dict) -> "Task":
+        """
+        :param task_info: The information of the task in data.json
+        :return: The task
+        """
+        return cls(
+            task_info["planet"],
+            parse_deadline(task_info["cooldown"]).timestamp(),
+            task_info["cooldown_finished"],
+        )
+
+    def to_dict(self) -> dict:
+        """
+        :return: The information of the task in the format of data.json
+        """
+        return {
+            "cooldown": format_deadline(self.deadline),
+            "planet": self.planet,
+            "cooldown_finished": self.cooldown_finished,
+        }
+
+
+class WorkerTask(Task):
+    """A worker which is busy with an upgrade"""
+
+    __slots__ = ()
+
+    section = "workers"
+
+
+class BuildingTask(Task):
+    """A building which is busy, e.g. a Laboratory researching or a Refinery refining"""
+
+    __slots__ = ("building",)
+
+    section = "buildings"
+
+    def __init__(
+        self,
+        planet: str,
+        building: str,
+        deadline: float,
+        cooldown_finished: bool = False,
+    ):
+        """
+        :param planet: The planet of the building (e.g. "Main Planet", "Colony 1")
+        :param building: The name of the building (e.g. "Laboratory", "Refinery")
+        :param deadline: The POSIX timestamp when the task finishes
+        :param cooldown_finished: Whether the notification of the task has been sent
+        """
+        super().__init__(planet, deadline, cooldown_finished)
+        self.building = sys.intern(building)
+
+    @property
+    def task_type(self) -> str:
+        return self.building
+
+    @classmethod
+    def from_dict(cls, task_info: dict) -> "BuildingTask":
+        return cls(
+            task_info["planet"],
+            task_info["building"],
+            parse_deadline(task_info["cooldown"]).timestamp(),
+            task_info["cooldown_finished"],
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "cooldown": format_deadline(self.deadline),
+            "planet": self.planet,
+            "building": self.building,
+            "cooldown_finished": self.cooldown_finished,
+        }
+
+
+ITEMS = ["star_battery", "tool_case", "helmet"]
+
+# The cooldown of every item in hours, after it was collected
+ITEM_COOLDOWN_HOURS = {
+    "star_battery": 11,
+    "tool_case": 23,
+    "helmet": 35,
+}
+
+# Section of data.json: the class of the tasks in that section
+TASK_CLASSES = {"workers": WorkerTask, "buildings": BuildingTask}
+
+PLANETS = ["Main Planet"] + [f"Colony {number}" for number in range(1, 12)]
+
+# The longest upgrade time which can be entered, in hours
+MAX_UPGRADE_HOURS = 999
+
+
+def data_from_json(document: dict) -> dict:
+    """
+    Converts the contents of data.json to item cooldowns and tasks
+
+    :param document: dictionary with the contents of data.json
+    :return: dictionary with an ItemCooldown per item and a dictionary of tasks per section, with the keys of data.json
+    """
+    data = {item: ItemCooldown.from_dict(document[item]) for item in ITEMS}
+    for section, task_class in TASK_CLASSES.items():
+        data[section] = {
+            task_id: task_class.from_dict(task_info)
+            for task_id, task_info in document[section].items()
+        }
+    return data
+
+
+def data_to_json(data: dict) -> dict:
+    """
+    Converts item cooldowns and tasks to the contents of data.json
 
-            # Wait for the sleep duration or until the event is set
-            print(f"Sleeping for {sleep_duration} seconds...")
-            await asyncio.sleep(sleep_duration)
+    :param data: dictionary with an ItemCooldown per item and a dictionary of tasks per section
+    :return: dictionary with the contents of data.json
+    """
+    document = {item: data[item].to_dict() for item in ITEMS}
+    for section in TASK_CLASSES:
+        document[section] = {
+            task_id: task.to_dict() for task_id, task in data[section].items()
+        }
+    document["deadline_timezone"] = "UTC"
+    return document
+
+
+def diff_data(
+    old_data: dict, new_data: dict
+) -> dict[tuple[str, str | None], ItemCooldown | Task | None]:
+    """
+    Finds the items and tasks which differ between two versions of data.json
+
+    :param old_data: dictionary with the item cooldowns and tasks of the old version
+    :param new_data: dictionary with the item cooldowns and tasks of the new version
+    :return: The new value of every changed item and task by key, None for removed tasks. The key is (item, None) for items and (section, task_id) for tasks.
+    """
+    changes = {
+        (item, None): new_data[item]
+        for item in ITEMS
+        if new_data[item] != old_data[item]
+    }
+    for section in TASK_CLASSES:
+        old_tasks = old_data[section]
+        new_tasks = new_data[section]
+        changes.update(
+            ((section, task_id), task)
+            for task_id, task in new_tasks.items()
+            if old_tasks.get(task_id) != task
+        )
+        changes.update(
+            ((section, task_id), None)
+            for task_id in old_tasks.keys() - new_tasks.keys()
+        )
+    return changes
+
+
+class FileWatcher:
+    """
+    Calls the subscribers of a file when another program changes it. On Linux the changes are reported by
+    inotify, so the watcher sleeps until something changes. On other systems the files are checked every
+    poll_interval seconds, by comparing the modification time and size of the files without reading them.
+
+    Writes made by this application are recorded with record_own_write() and not reported, because the
+    parts of the application which make them already update the others.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+
+    def __init__(self, poll_interval: float = 5):
+        """
+        :param poll_interval: The amount of seconds between two checks when inotify isn't available
+        """
+        self.poll_interval = poll_interval
+        # Path: the functions to call with the path when the file changes
+        self.subscribers = {}
+        # Path: the signature of the file after the last change which was reported or made by this application
+        self.signatures = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.inotify_file_descriptor = None
+        self.stop_pipe = None
+        # Directory: inotify watch descriptor
+        self.watched_directories = {}
+
+    def watch(self, path: Path, callback: Callable[[Path], None]) -> None:
+        """
+        Subscribes to the changes of a file. The callback is called on the thread of the watcher.
+
+        :param path: The path of the file
+        :param callback: Called with the path of the file when it was changed by another program
+        """
+        path = Path(path).resolve()
+        with self.lock:
+            self.subscribers.setdefault(path, []).append(callback)
+            self.signatures.setdefault(path, get_file_signature(path))
+        if self.inotify_file_descriptor is not None:
+            self.add_inotify_watch(path.parent)
+
+    def record_own_write(self, path: Path) -> None:
+        """
+        Records that this application has just written a file, so the change isn't reported
+
+        :param path: The path of the file
+        """
+        path = Path(path).resolve()
+        with self.lock:
+            if path in self.subscribers:
+                self.signatures[path] = get_file_signature(path)
+
+    def start(self) -> None:
+        """Starts watching the files in a background thread, with inotify when it is available"""
+        if sys.platform.startswith("linux") and self.start_inotify():
+            target = self.run_inotify
+            STORAGE_LOGGER.info("Watching the files with inotify")
+        else:
+            target = self.run_polling
+            STORAGE_LOGGER.info(
+                "Watching the files every %s seconds", self.poll_interval
+            )
+        threading.Thread(target=target, daemon=True).start()
+
+    def stop(self) -> None:
+        """Stops watching the files"""
+        self.stopped.set()
+        if self.stop_pipe is not None:
+            os.write(self.stop_pipe[1], b"\0")
+
+    def check(self, path: Path) -> None:
+        """
+        Calls the subscribers of a file if it has changed since the last reported or own change
+
+        :param path: The path of the file
+        """
+        signature = get_file_signature(path)
+        with self.lock:
+            if path not in self.subscribers or signature == self.signatures[path]:
+                return
+            self.signatures[path] = signature
+            callbacks = list(self.subscribers.get(path, []))
+
+        STORAGE_LOGGER.info("%s was changed by another program", path.name)
+        for callback in callbacks:
+            try:
+                callback(path)
+            except Exception:
+                STORAGE_LOGGER.exception("Could not handle the change of %s", path.name)
+
+    def run_polling(self) -> None:
+        """Checks the files every poll_interval seconds"""
+        while not self.stopped.wait(self.poll_interval):
+            with self.lock:
+                paths = list(self.subscribers)
+            for path in paths:
+                self.check(path)
+
+    def start_inotify(self) -> bool:
+        """
+        Sets up inotify through the C library
+
+        :return: True if inotify can be used
+        """
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            inotify_file_descriptor = self.libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if inotify_file_descriptor < 0:
+            return False
+
+        self.inotify_file_descriptor = inotify_file_descriptor
+        self.stop_pipe = os.pipe()
+        with self.lock:
+            directories = {path.parent for path in self.subscribers}
+        for directory in directories:
+            self.add_inotify_watch(directory)
+        return True
+
+    def add_inotify_watch(self, directory: Path) -> None:
+        """
+        Watches a directory with inotify, which also reports files which are replaced instead of written
+
+        :param directory: The directory of a watched file
+        """
+        with self.lock:
+            if directory in self.watched_directories:
+                return
+            watch_descriptor = self.libc.inotify_add_watch(
+                self.inotify_file_descriptor,
+                os.fsencode(directory),
+                self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE,
+            )
+            if watch_descriptor < 0:
+                STORAGE_LOGGER.warning(
+                    "Could not watch %s: %s",
+                    directory,
+                    os.strerror(ctypes.get_errno()),
+                )
+                return
+            self.watched_directories[directory] = watch_descriptor
+
+    def run_inotify(self) -> None:
+        """Waits for inotify events and checks the files they are about"""
+        while not self.stopped.is_set():
+            readable, _, _ = select.select(
+                [self.inotify_file_descriptor, self.stop_pipe[0]], [], []
+            )
+            if self.stop_pipe[0] in readable:
+                break
+            # Gives a writer the time to finish, and this application the time to record its own write
+            if self.stopped.wait(0.1):
+                break
+            buffer = os.read(self.inotify_file_descriptor, 64 * 1024)
+
+            with self.lock:
+                directories = {
+                    watch_descriptor: directory
+                    for directory, watch_descriptor in self.watched_directories.items()
+                }
+            changed_paths = set()
+            offset = 0
+            # Every event is a struct inotify_event: wd, mask, cookie, len, followed by len bytes of name
+            while offset < len(buffer):
+                watch_descriptor, _, _, name_length = struct.unpack_from(
+                    "iIII", buffer, offset
+                )
+                name = buffer[offset + 16 : offset + 16 + name_length].rstrip(b"\0")
+                offset += 16 + name_length
+                if watch_descriptor in directories and name:
+                    changed_paths.add(
+                        Path(directories[watch_descriptor], os.fsdecode(name))
+                    )
+
+            for path in changed_paths:
+                self.check(path)
+
+        os.close(self.inotify_file_descriptor)
+        for file_descriptor in self.stop_pipe:
+            os.close(file_descriptor)
+
+
+FILE_WATCHER = FileWatcher()
+
+
+class Clock:
+    """
+    Source of the current time for the notification checker and the GUI, so the scheduling can be run
+    against a virtual clock instead of the real time
+    """
+
+    # How many times faster than the real time the clock runs
+    time_scale = 1
+
+    def now(self) -> datetime:
+        """
+        :return: The current datetime in UTC
+        """
+        return datetime.fromtimestamp(self.time(), timezone.utc)
+
+    def time(self) -> float:
+        """
+        :return: The current POSIX timestamp
+        """
+        raise NotImplementedError
+
+    def monotonic(self) -> float:
+        """
+        :return: The value of a clock which never goes back, in seconds
+        """
+        raise NotImplementedError
+
+    async def sleep(self, seconds: float) -> None:
+        """
+        Sleeps until the clock has advanced by the given amount of seconds
+
+        :param seconds: The amount of seconds to sleep
+        """
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """The real time of the computer"""
+
+    def now(self) -> datetime:
+        return utc_now()
+
+    def time(self) -> float:
+        return time.time()
+
+    def monotonic(self) -> float:
+        return time.monotonic()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """
+    Virtual time which runs a given amount of times faster than the real time, or which jumps straight
+    to the end of every sleep when no speed is given
+    """
+
+    def __init__(self, start_time: float | None = None, speed: float | None = 1000):
+        """
+        :param start_time: The POSIX timestamp the clock starts at, by default the current time
+        :param speed: How many times faster than the real time the clock runs, None to jump to the end of every sleep
+        """
+        self.start_time = time.time() if start_time is None else start_time
+        self.speed = speed
+        if speed is not None:
+            self.time_scale = speed
+        self.real_start_time = time.monotonic()
+        self.jumped_seconds = 0.0
+
+    def elapsed(self) -> float:
+        """
+        :return: The amount of virtual seconds since the clock was started
+        """
+        if self.speed is None:
+            return self.jumped_seconds
+        return (time.monotonic() - self.real_start_time) * self.speed
+
+    def time(self) -> float:
+        return self.start_time + self.elapsed()
+
+    def monotonic(self) -> float:
+        return self.elapsed()
+
+    async def sleep(self, seconds: float) -> None:
+        if self.speed is None:
+            self.jumped_seconds += seconds
+            # Still give the other tasks on the event loop a chance to run
+            await asyncio.sleep(0)
+        else:
+            await asyncio.sleep(seconds / self.speed)
+
+
+class BatchDeliveryError(RuntimeError):
+    """Raised by a notification backend which could only deliver the first part of a batch"""
+
+    def __init__(self, message: str, delivered: list[dict]):
+        """
+        :param message: What went wrong
+        :param delivered: The notifications of the batch which were delivered before the failure
+        """
+        super().__init__(message)
+        self.delivered = delivered
+
+
+class NotificationBackend:
+    """
+    Base class of all notification backends.
+
+    A notification is a dictionary with the keys "title", "message" and "icon_image". Backends always
+    receive notifications in batches, sending a single notification is a batch of one.
+    """
+
+    name = ""
+
+    @classmethod
+    def from_settings(cls, notification_settings: dict) -> "NotificationBackend":
+        """
+        Creates the backend from the "notification_settings" section of settings.json
+
+        :param notification_settings: The "notification_settings" section of settings.json
+        :return: The created backend
+        """
+        return cls()
+
+    @classmethod
+    def settings_key(cls, notification_settings: dict) -> tuple:
+        """
+        :param notification_settings: The "notification_settings" section of settings.json
+        :return: The settings which from_settings() creates the backend with, profiles with the same settings share one backend
+        """
+        return ()
+
+    def send(self, notification: dict) -> None:
+        """
+        Sends a single notification
+
+        :param notification: The notification to send
+        """
+        self.send_batch([notification])
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        """
+        Sends all the given notifications
+
+        :param notifications: The notifications to send, in the order they should be delivered
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Releases the resources held by the backend"""
+
+
+class WinotifyBackend(NotificationBackend):
+    """
+    Shows every notification as a Windows toast.
+
+    winotify starts a new PowerShell process for every toast, which takes about a second each. This
+    backend keeps one PowerShell process running and sends it a line per toast instead, and only falls
+    back to winotify when that process can't be started. The process answers every toast with a line on
+    stdout, so a toast which Windows rejected is sent again. A toast which the process got but didn't answer
+    counts as delivered, as it may have been shown, and only the toasts after it go to a new process.
+    """
+
+    name = "winotify"
+
+    app_id = "Galaxy Life Notifier"
+
+    # The seconds to wait for PowerShell to confirm a toast
+    confirmation_timeout = 10
+
+    # Loads the Windows Runtime types and defines the function which shows a toast from its XML
+    powershell_setup_lines = [
+        "[Console]::InputEncoding = [Text.Encoding]::UTF8",
+        "$null = [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime]",
+        "$null = [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom.XmlDocument, ContentType = WindowsRuntime]",
+        "function Show-Toast([string]$AppId, [string]$Xml) { try { $document = New-Object Windows.Data.Xml.Dom.XmlDocument; $document.LoadXml($Xml); $toast = New-Object Windows.UI.Notifications.ToastNotification $document; [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier($AppId).Show($toast); [Console]::Out.WriteLine('ok') } catch { [Console]::Out.WriteLine('error ' + $_.Exception.Message) }; [Console]::Out.Flush() }",
+    ]
+
+    def __init__(self):
+        if Notification is None:
+            raise RuntimeError(
+                "The winotify backend is only available on Windows with winotify installed"
+            )
+        self.powershell_process = None
+        # The lines which the PowerShell process writes to stdout, read by a separate thread
+        self.confirmations = None
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        delivered = []
+        # Retry once with a new PowerShell process if the previous one has exited
+        for _ in range(2):
+            if len(delivered) == len(notifications):
+                return
+            try:
+                powershell_process = self.get_powershell_process()
+            except OSError:
+                self.close()
+                continue
+            for notification in notifications[len(delivered) :]:
+                try:
+                    powershell_process.stdin.write(self.create_toast_line(notification))
+                    powershell_process.stdin.flush()
+                except OSError:
+                    # PowerShell didn't get the toast, so a new process can show it
+                    self.close()
+                    break
+                try:
+                    self.wait_for_confirmation()
+                except OSError:
+                    # PowerShell got the toast and may have shown it before it exited or stopped answering,
+                    # so it isn't shown again
+                    DELIVERY_LOGGER.warning(
+                        "PowerShell didn't confirm the toast, counting it as delivered"
+                    )
+                    delivered.append(notification)
+                    self.close()
+                    break
+                except RuntimeError as e:
+                    self.close()
+                    raise BatchDeliveryError(str(e), delivered) from e
+                delivered.append(notification)
+            else:
+                return
+        notifications = notifications[len(delivered) :]
+        if not notifications:
+            return
+
+        DELIVERY_LOGGER.warning(
+            "Could not use a persistent PowerShell process, falling back to winotify"
+        )
+        for notification in notifications:
+            toast = Notification(
+                app_id=self.app_id,
+                title=notification["title"],
+                msg=notification["message"],
+                icon=str(Path(MAIN_IMAGES_PATH, notification["icon_image"])),
+                duration="short",
+            )
+            toast.set_audio(audio.Default, loop=False)
+            toast.show()
+
+    def get_powershell_process(self) -> subprocess.Popen:
+        """
+        Returns the running PowerShell process which shows the toasts, starting it if needed
+
+        :return: The PowerShell process, which reads the commands to execute from stdin
+        """
+        if (
+            self.powershell_process is None
+            or self.powershell_process.poll() is not None
+        ):
+            self.powershell_process = subprocess.Popen(
+                [
+                    "powershell.exe",
+                    "-NoLogo",
+                    "-NoProfile",
+                    "-NonInteractive",
+                    "-ExecutionPolicy",
+                    "Bypass",
+                    "-Command",
+                    "-",
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                encoding="utf-8",
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+            # Reading stdout can't time out on Windows pipes, so a thread reads it into a queue
+            self.confirmations = queue.Queue()
+            threading.Thread(
+                target=self.read_confirmations,
+                args=(self.powershell_process.stdout, self.confirmations),
+                daemon=True,
+            ).start()
+            self.powershell_process.stdin.write(
+                "".join(f"{line}\n" for line in self.powershell_setup_lines)
+            )
+        return self.powershell_process
+
+    @staticmethod
+    def read_confirmations(stdout, confirmations: queue.Queue) -> None:
+        """
+        Passes the lines of the PowerShell process to the queue, None when the process has exited
+
+        :param stdout: The stdout of the PowerShell process
+        :param confirmations: The queue of the lines
+        """
+        for line in stdout:
+            confirmations.put(line.strip())
+        confirmations.put(None)
+
+    def wait_for_confirmation(self) -> None:
+        """
+        Waits until PowerShell confirms the toast which was just sent
+
+        :raises OSError: When the process exited before it confirmed the toast, or didn't confirm it in time
+        :raises RuntimeError: When the toast couldn't be shown
+        """
+        deadline = time.monotonic() + self.confirmation_timeout
+        while True:
+            try:
+                confirmation = self.confirmations.get(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+            except queue.Empty:
+                raise TimeoutError("PowerShell didn't confirm the toast")
+            if confirmation is None:
+                raise BrokenPipeError("The PowerShell process has exited")
+            if confirmation == "ok":
+                return
+            if confirmation.startswith("error"):
+                raise RuntimeError(f"The toast couldn't be shown: {confirmation}")
+            # Other output of PowerShell, e.g. a prompt, isn't a confirmation
+
+    def create_toast_line(self, notification: dict) -> str:
+        """
+        Creates the PowerShell command which shows the notification as a toast
+
+        :param notification: The notification to show
+        :return: The command as a single line, PowerShell executes the commands from stdin line by line
+        """
+        icon_path = Path(MAIN_IMAGES_PATH, notification["icon_image"])
+        toast_xml = (
+            '<toast duration="short"><visual><binding template="ToastGeneric">'
+            f'<image placement="appLogoOverride" src={quoteattr(str(icon_path))}/>'
+            f"<text>{escape(notification['title'])}</text>"
+            f"<text>{escape(notification['message'])}</text>"
+            "</binding></visual>"
+            f'<audio src="{audio.Default}" loop="false"/></toast>'
+        )
+        # Single quotes are escaped by doubling them in a single quoted PowerShell string
+        toast_xml = toast_xml.replace("'", "''").replace("\n", " ")
+        return f"Show-Toast -AppId '{self.app_id}' -Xml '{toast_xml}'\n"
+
+    def close(self) -> None:
+        if self.powershell_process is not None:
+            try:
+                self.powershell_process.stdin.close()
+                self.powershell_process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.powershell_process.kill()
+            self.powershell_process = None
+
+
+class JsonlBackend(NotificationBackend):
+    """Writes every notification as one JSON line to a file, or to stdout when the path is "-" """
+
+    name = "jsonl"
+
+    def __init__(self, path: str = "-"):
+        self.path = path
+        if path == "-":
+            self.file = sys.stdout
+        else:
+            self.file = open(Path(MAIN_PATH, path), "a", encoding="utf-8")
+
+    @classmethod
+    def from_settings(cls, notification_settings: dict) -> "JsonlBackend":
+        return cls(notification_settings["jsonl_path"])
+
+    @classmethod
+    def settings_key(cls, notification_settings: dict) -> tuple:
+        return (notification_settings["jsonl_path"],)
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        sent_at = utc_now().isoformat()
+        lines = [
+            json.dumps({"sent_at": sent_at, **notification}) + "\n"
+            for notification in notifications
+        ]
+        self.file.write("".join(lines))
+        self.file.flush()
+
+    def close(self) -> None:
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class WebhookBackend(NotificationBackend):
+    """Posts every batch of notifications as one JSON document to an HTTP webhook, over pooled connections"""
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 5):
+        self.url = url
+        url = urllib.parse.urlsplit(url)
+        self.path = url.path + (f"?{url.query}" if url.query else "")
+        self.pool = HttpConnectionPool(self.url, timeout=timeout)
+
+    @classmethod
+    def from_settings(cls, notification_settings: dict) -> "WebhookBackend":
+        return cls(
+            notification_settings["webhook_url"],
+            notification_settings["webhook_timeout"],
+        )
+
+    @classmethod
+    def settings_key(cls, notification_settings: dict) -> tuple:
+        return (
+            notification_settings["webhook_url"],
+            notification_settings["webhook_timeout"],
+        )
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        status, _, _ = self.pool.request(
+            "POST",
+            self.path,
+            json.dumps({"notifications": notifications}).encode("utf-8"),
+            {"Content-Type": "application/json"},
+        )
+        if not 200 <= status < 300:
+            raise RuntimeError(f"The webhook responded with status {status}")
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class HttpConnectionPool:
+    """
+    Keeps persistent HTTP connections to one server open between requests, so a request only costs a round
+    trip instead of a new TCP (and TLS) connection. Connections which the server closed in the meantime
+    are replaced transparently. Can be used from several threads at once.
+    """
+
+    def __init__(self, url: str, size: int = 2, timeout: float = 5):
+        """
+        :param url: A url on the server, only the scheme, host and port are used
+        :param size: The maximum amount of idle connections which are kept open
+        :param timeout: The timeout of connecting and of every response, in seconds
+        """
+        url = urllib.parse.urlsplit(url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(
+                f"Only http and https urls are supported, not {url.geturl()!r}"
+            )
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.host = url.hostname
+        self.port = url.port
+        self.size = size
+        self.timeout = timeout
+        self.idle_connections = []
+        self.lock = threading.Lock()
+
+    def request(
+        self, method: str, path: str, body: bytes, headers: dict
+    ) -> tuple[int, dict, bytes]:
+        """
+        Sends a request over an idle connection, or over a new connection when there is none
+
+        :param method: The HTTP method (e.g. "POST")
+        :param path: The path and query of the request
+        :param body: The body of the request
+        :param headers: The headers of the request
+        :return: The status, headers (with lowercase names) and body of the response
+        """
+        with self.lock:
+            connection = self.idle_connections.pop() if self.idle_connections else None
+        reused = connection is not None
+        if connection is None:
+            connection = self.create_connection()
+
+        try:
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response_body = response.read()
+        except (http.client.HTTPException, ConnectionError) as e:
+            connection.close()
+            if not reused:
+                raise
+            # The server closed the idle connection, which is only noticed when it is used again
+            DELIVERY_LOGGER.debug("Reconnecting to %s: %s", self.host, e)
+            connection = self.create_connection()
+            connection.request(method, path, body, headers)
+            response = connection.getresponse()
+            response_body = response.read()
+        except OSError:
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self.lock:
+                if len(self.idle_connections) < self.size:
+                    self.idle_connections.append(connection)
+                    connection = None
+            if connection is not None:
+                connection.close()
+        return (
+            response.status,
+            {name.lower(): value for name, value in response.getheaders()},
+            response_body,
+        )
+
+    def create_connection(self) -> http.client.HTTPConnection:
+        METRICS.increment("http_connections_opened_total", host=self.host)
+        return self.connection_class(self.host, self.port, timeout=self.timeout)
+
+    def close(self) -> None:
+        """Closes the idle connections"""
+        with self.lock:
+            idle_connections, self.idle_connections = self.idle_connections, []
+        for connection in idle_connections:
+            connection.close()
+
+
+class DiscordWebhookBackend(NotificationBackend):
+    """
+    Posts the notifications to a Discord webhook (or a chat webhook with the same API), as embeds. A batch
+    is posted with up to 10 embeds per message over pooled connections. Server errors and connection
+    problems are retried with exponential backoff, and rate limit responses are honoured by waiting as
+    long as the server asks for.
+    """
+
+    name = "discord"
+
+    # Discord accepts at most 10 embeds per message
+    max_embeds = 10
+
+    # The color of the embed per priority class
+    colors = {
+        "item": 0xF1C40F,
+        "workers": 0x2ECC71,
+        "buildings": 0x3498DB,
+        "refinery": 0xD66C2B,
+    }
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 5,
+        max_retries: int = 5,
+        backoff: float = 1,
+        username: str = "Galaxy Life Notifier",
+    ):
+        """
+        :param url: The url of the webhook
+        :param timeout: The timeout of every request, in seconds
+        :param max_retries: How many times a failed message is retried before the batch fails
+        :param backoff: The amount of seconds before the first retry, which doubles for every next retry
+        :param username: The name the messages are posted under
+        """
+        self.url = url
+        url = urllib.parse.urlsplit(url)
+        self.path = url.path + (f"?{url.query}" if url.query else "")
+        self.pool = HttpConnectionPool(self.url, timeout=timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.username = username
+        # The monotonic time until which the webhook is rate limited
+        self.rate_limited_until = 0
+
+    @classmethod
+    def from_settings(cls, notification_settings: dict) -> "DiscordWebhookBackend":
+        return cls(
+            notification_settings["discord_webhook_url"],
+            notification_settings["webhook_timeout"],
+            notification_settings["discord_max_retries"],
+            notification_settings["discord_backoff"],
+        )
+
+    @classmethod
+    def settings_key(cls, notification_settings: dict) -> tuple:
+        return (
+            notification_settings["discord_webhook_url"],
+            notification_settings["webhook_timeout"],
+            notification_settings["discord_max_retries"],
+            notification_settings["discord_backoff"],
+        )
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        for start in range(0, len(notifications), self.max_embeds):
+            try:
+                self.post(
+                    {
+                        "username": self.username,
+                        "embeds": [
+                            self.create_embed(notification)
+                            for notification in notifications[
+                                start : start + self.max_embeds
+                            ]
+                        ],
+                    }
+                )
+            except RuntimeError as e:
+                # The earlier messages of the batch were delivered
+                raise BatchDeliveryError(str(e), notifications[:start]) from e
+
+    def create_embed(self, notification: dict) -> dict:
+        """
+        :param notification: The notification
+        :return: The Discord embed of the notification
+        """
+        embed = {
+            "title": notification["title"],
+            "description": notification["message"],
+            "color": self.colors.get(notification.get("priority"), 0xD66C2B),
+        }
+        if "created_at" in notification:
+            embed["timestamp"] = notification["created_at"]
+        return embed
+
+    def post(self, payload: dict) -> None:
+        """
+        Posts one message, retrying until it succeeds or the retries run out
+
+        :param payload: The message as Discord webhook JSON
+        """
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        attempt = 0
+        while True:
+            # Wait for the rate limit of an earlier message to pass
+            time.sleep(max(self.rate_limited_until - time.monotonic(), 0))
+            try:
+                status, response_headers, response_body = self.pool.request(
+                    "POST", self.path, body, headers
+                )
+            except (OSError, http.client.HTTPException) as e:
+                status, response_headers, error = None, {}, e
+            else:
+                error = None
+
+            if status is not None and 200 <= status < 300:
+                # Wait before the next message when this was the last one allowed in the current window
+                if response_headers.get("x-ratelimit-remaining") == "0":
+                    self.rate_limited_until = time.monotonic() + float(
+                        response_headers.get("x-ratelimit-reset-after", 0)
+                    )
+                return
+
+            if status == 429:
+                # Waiting until the rate limit has passed replaces the backoff
+                delay = self.get_retry_after(response_headers, response_body)
+                self.rate_limited_until = time.monotonic() + delay
+                reason = "rate limited"
+                METRICS.increment("webhook_rate_limited_total", backend=self.name)
+            elif status is not None and status < 500:
+                raise RuntimeError(
+                    f"The webhook rejected the message with status {status}: {response_body[:200]!r}"
+                )
+            else:
+                # Exponential backoff with jitter, so many clients don't retry at the same moment
+                delay = self.backoff * 2**attempt * random.uniform(0.5, 1)
+                reason = str(error) if error is not None else f"status {status}"
+
+            if attempt >= self.max_retries:
+                raise RuntimeError(
+                    f"Posting to the webhook failed {attempt + 1} times, the last time: {reason}"
+                )
+            attempt += 1
+            METRICS.increment("webhook_retries_total", backend=self.name)
+            DELIVERY_LOGGER.warning(
+                "Posting to the webhook failed (%s), retry %d in %.1f seconds",
+                reason,
+                attempt,
+                delay,
+            )
+            if status != 429:
+                time.sleep(delay)
+
+    @staticmethod
+    def get_retry_after(response_headers: dict, response_body: bytes) -> float:
+        """
+        :param response_headers: The headers of a 429 response, with lowercase names
+        :param response_body: The body of a 429 response
+        :return: The amount of seconds the server asks to wait
+        """
+        try:
+            return float(json.loads(response_body)["retry_after"])
+        except (ValueError, KeyError, TypeError):
+            return float(response_headers.get("retry-after", 1))
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+class MemoryBackend(NotificationBackend):
+    """Keeps every notification in memory, used for testing and benchmarking"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.notifications = []
+        self.batches = []
+
+    def send_batch(self, notifications: list[dict]) -> None:
+        self.batches.append(list(notifications))
+        self.notifications.extend(notifications)
+
+
+NOTIFICATION_BACKENDS = {
+    backend.name: backend
+    for backend in [
+        WinotifyBackend,
+        JsonlBackend,
+        WebhookBackend,
+        DiscordWebhookBackend,
+        MemoryBackend,
+    ]
+}
+
+
+def get_notification_backend_classes(
+    notification_settings: dict,
+) -> list[type[NotificationBackend]]:
+    """
+    Looks up the notification backends selected in settings.json
+
+    :param notification_settings: The "notification_settings" section of settings.json
+    :return: list with the classes of the selected backends
+    """
+    backend_classes = []
+    for backend_name in notification_settings["backends"]:
+        if backend_name not in NOTIFICATION_BACKENDS:
+            raise ValueError(
+                f"Unknown notification backend '{backend_name}'. Valid options are {list(NOTIFICATION_BACKENDS)}"
+            )
+        backend_classes.append(NOTIFICATION_BACKENDS[backend_name])
+    return backend_classes
+
+
+# Priority classes of the notifications, a lower number gets delivered first
+NOTIFICATION_PRIORITIES = {
+    "item": 0,
+    "workers": 1,
+    "buildings": 2,
+    "refinery": 3,
+}
+
+
+class TokenBucket:
+    """Limits the amount of notifications a backend may send per second, while allowing short bursts"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        :param rate: The amount of tokens added per second
+        :param burst: The maximum amount of tokens, which is the largest burst that can be sent at once
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+
+    def refill(self) -> None:
+        """Adds the tokens which were earned since the last refill"""
+        now = time.monotonic()
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.last_refill) * self.rate
+        )
+        self.last_refill = now
+
+    def take(self, max_amount: int) -> int:
+        """
+        Takes as many whole tokens as available, up to max_amount
+
+        :param max_amount: The maximum amount of tokens to take
+        :return: The amount of tokens taken
+        """
+        self.refill()
+        amount = min(max_amount, int(self.tokens))
+        self.tokens -= amount
+        return amount
+
+    def give_back(self, amount: int) -> None:
+        """
+        Returns tokens which were taken but not used
+
+        :param amount: The amount of tokens to return
+        """
+        self.tokens = min(self.burst, self.tokens + amount)
+
+    def wait_time(self) -> float:
+        """
+        :return: The amount of seconds until a whole token is available
+        """
+        self.refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class NotificationQueue:
+    """
+    A bounded queue which returns notifications by priority class, and in order of arrival within a
+    class. When the queue is full, the overflow policy decides what happens to a new notification:
+
+    - "drop_lowest_priority": The oldest notification of the lowest priority class is dropped to make
+      room, unless the new notification has an even lower priority, then the new one is dropped
+    - "drop_newest": The new notification is dropped
+    - "block": The sender waits until there is room (backpressure), the new notification is dropped if
+      there is still no room after block_timeout seconds. A sender on an asyncio event loop, like the
+      notification checker, never waits, as that would stall every timer of the loop: the new notification
+      is dropped right away, and stays in the outbox until it can be sent again.
+    """
+
+    overflow_policies = ["drop_lowest_priority", "drop_newest", "block"]
+
+    def __init__(
+        self,
+        max_size: int,
+        overflow_policy: str = "drop_lowest_priority",
+        block_timeout: float = 5,
+    ):
+        """
+        :param max_size: The maximum amount of queued notifications, at least 1
+        :param overflow_policy: What to do with a new notification when the queue is full, see the class docstring
+        :param block_timeout: The maximum amount of seconds the "block" overflow policy waits for room
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise ValueError(
+                f"The queue size has to be a whole number of at least 1, not {max_size!r}"
+            )
+        if overflow_policy not in self.overflow_policies:
+            raise ValueError(
+                f"Unknown overflow policy '{overflow_policy}'. Valid options are {self.overflow_policies}"
+            )
+        self.max_size = max_size
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.queues = [deque() for _ in range(len(NOTIFICATION_PRIORITIES))]
+        self.size = 0
+        self.unfinished = 0
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def put(self, notification: dict) -> list[dict]:
+        """
+        Queues a notification, applying the overflow policy when the queue is full
+
+        :param notification: The notification to queue
+        :return: The notifications which the overflow policy dropped, which includes the new notification if it wasn't queued
+        """
+        priority = NOTIFICATION_PRIORITIES[notification["priority"]]
+        dropped_notifications = []
+        with self.condition:
+            if self.size >= self.max_size:
+                if self.overflow_policy == "block" and not self.on_event_loop():
+                    self.condition.wait_for(
+                        lambda: self.size < self.max_size, self.block_timeout
+                    )
+                elif self.overflow_policy == "drop_lowest_priority":
+                    # With nothing queued, only the new notification can be dropped
+                    lowest_priority = max(
+                        (
+                            index
+                            for index, priority_queue in enumerate(self.queues)
+                            if priority_queue
+                        ),
+                        default=-1,
+                    )
+                    if lowest_priority >= priority:
+                        dropped = self.queues[lowest_priority].popleft()
+                        self.size -= 1
+                        self.unfinished -= 1
+                        dropped_notifications.append(dropped)
+                        DELIVERY_LOGGER.warning(
+                            "Notification queue full, dropped: %s", dropped["message"]
+                        )
+
+            if self.size >= self.max_size:
+                DELIVERY_LOGGER.warning(
+                    "Notification queue full, dropped: %s", notification["message"]
+                )
+                dropped_notifications.append(notification)
+                return dropped_notifications
+
+            self.queues[priority].append(notification)
+            self.size += 1
+            self.unfinished += 1
+            self.condition.notify_all()
+            return dropped_notifications
+
+    @staticmethod
+    def on_event_loop() -> bool:
+        """
+        :return: Whether the current thread is running an asyncio event loop
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def wait(self) -> bool:
+        """
+        Waits until there are queued notifications
+
+        :return: True if there are queued notifications, False if the queue is closed and empty
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.size > 0 or self.closed)
+            return self.size > 0
+
+    def get_batch(self, max_amount: int) -> list[dict]:
+        """
+        Takes the notifications with the highest priority from the queue
+
+        :param max_amount: The maximum amount of notifications to take
+        :return: The taken notifications, ordered by priority
+        """
+        batch = []
+        with self.condition:
+            for priority_queue in self.queues:
+                while priority_queue and len(batch) < max_amount:
+                    batch.append(priority_queue.popleft())
+            self.size -= len(batch)
+            self.condition.notify_all()
+        return batch
+
+    def task_done(self, amount: int) -> None:
+        """
+        Marks taken notifications as handled
+
+        :param amount: The amount of handled notifications
+        """
+        with self.condition:
+            self.unfinished -= amount
+            self.condition.notify_all()
+
+    def join(self) -> None:
+        """Waits until every queued notification has been handled"""
+        with self.condition:
+            self.condition.wait_for(lambda: self.unfinished <= 0)
+
+    def close(self) -> None:
+        """Lets wait() return once the queue is empty"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+
+class NotificationDeliveryWorker(threading.Thread):
+    """
+    Delivers notifications to a notification backend from a queue in its own thread, so the notification
+    checker never has to wait for a notification to be shown. Notifications which are queued while the
+    backend is busy are delivered together as one batch, highest priority first. An optional token
+    bucket limits how many notifications are delivered per second.
+    """
+
+    def __init__(
+        self,
+        backend: NotificationBackend,
+        notification_queue: NotificationQueue,
+        token_bucket: TokenBucket | None = None,
+        max_batch_size: int = 25,
+        on_delivered: Callable[[str, list[dict]], None] | None = None,
+        on_failed: Callable[[str, list[dict]], None] | None = None,
+    ):
+        """
+        :param backend: The backend which delivers the notifications
+        :param notification_queue: The queue to deliver the notifications from
+        :param token_bucket: The rate limit of the backend, None to deliver without a rate limit
+        :param max_batch_size: The maximum amount of notifications to send to the backend at once
+        :param on_delivered: Called with the backend name and the notifications which the backend confirmed as sent
+        :param on_failed: Called with the backend name and the notifications which the backend failed to send
+        """
+        super().__init__(name=f"{backend.name} delivery worker", daemon=True)
+        self.backend = backend
+        self.queue = notification_queue
+        self.token_bucket = token_bucket
+        self.max_batch_size = max_batch_size
+        self.on_delivered = on_delivered
+        self.on_failed = on_failed
+
+    @classmethod
+    def from_settings(
+        cls,
+        backend: NotificationBackend,
+        notification_settings: dict,
+        on_delivered: Callable[[str, list[dict]], None] | None = None,
+        on_failed: Callable[[str, list[dict]], None] | None = None,
+    ) -> "NotificationDeliveryWorker":
+        """
+        Creates the delivery worker of a backend with the queue and rate limit from settings.json
+
+        :param backend: The backend which delivers the notifications
+        :param notification_settings: The "notification_settings" section of settings.json
+        :param on_delivered: Called with the backend name and the notifications which the backend confirmed as sent
+        :param on_failed: Called with the backend name and the notifications which the backend failed to send
+        :return: The created delivery worker
+        """
+        rate_limit = notification_settings["rate_limits"].get(backend.name)
+        return cls(
+            backend,
+            NotificationQueue(
+                notification_settings["queue_size"],
+                notification_settings["overflow_policy"],
+            ),
+            (
+                TokenBucket(rate_limit["rate"], rate_limit["burst"])
+                if rate_limit
+                else None
+            ),
+            on_delivered=on_delivered,
+            on_failed=on_failed,
+        )
+
+    def submit(self, notification: dict) -> list[dict]:
+        """
+        Queues a notification for delivery
+
+        :param notification: The notification to deliver
+        :return: The notifications which the overflow policy dropped, which includes the new notification if it wasn't queued
+        """
+        return self.queue.put(notification)
+
+    def run(self) -> None:
+        while self.queue.wait():
+            if self.token_bucket is None:
+                amount = self.max_batch_size
+            else:
+                time.sleep(self.token_bucket.wait_time())
+                amount = self.token_bucket.take(self.max_batch_size)
+
+            batch = self.queue.get_batch(amount)
+            if self.token_bucket is not None:
+                self.token_bucket.give_back(amount - len(batch))
+            if not batch:
+                continue
+
+            delivered, failed = batch, []
+            try:
+                self.backend.send_batch(batch)
+            except Exception as e:
+                # Only what the backend confirmed counts as delivered, the rest is retried later
+                delivered = e.delivered if isinstance(e, BatchDeliveryError) else []
+                failed = [
+                    notification
+                    for notification in batch
+                    if not any(notification is sent for sent in delivered)
+                ]
+                METRICS.increment(
+                    "notification_delivery_failures_total", backend=self.backend.name
+                )
+                DELIVERY_LOGGER.exception(
+                    "Failed to send %d notification(s) with the %s backend",
+                    len(failed),
+                    self.backend.name,
+                )
+            try:
+                if delivered and self.on_delivered is not None:
+                    self.on_delivered(self.backend.name, delivered)
+                if failed and self.on_failed is not None:
+                    self.on_failed(self.backend.name, failed)
+            except Exception:
+                DELIVERY_LOGGER.exception("Failed to record the delivery")
+            self.queue.task_done(len(batch))
+
+    def flush(self) -> None:
+        """Waits until every queued notification has been delivered"""
+        self.queue.join()
+
+    def stop(self, timeout: float = 10) -> None:
+        """
+        Delivers the queued notifications and stops the worker
+
+        :param timeout: The maximum amount of seconds to wait for the delivery to finish
+        """
+        self.queue.close()
+        self.join(timeout)
+
+
+class NotificationCoalescer:
+    """
+    Collects finished workers and buildings tasks, so a burst of them can be sent as one digest.
+
+    The first finished task is released right away and opens a digest window. Every task which finishes
+    during that window is held back and released together when the window ends, after which a new
+    window starts. This keeps the amount of notifications constant during a burst, without delaying
+    the notification of a task which finishes on its own.
+    """
+
+    def __init__(self, digest_window: float):
+        """
+        :param digest_window: The length of the digest window in seconds
+        """
+        self.digest_window = digest_window
+        self.finished_tasks = []
+        self.window_end = None
+
+    def add(self, task: Task, outbox_id: str) -> None:
+        """
+        Adds a finished task
+
+        :param task: The finished task
+        :param outbox_id: The id of the finished task in the notification outbox
+        """
+        self.finished_tasks.append((task, outbox_id))
+
+    def pop_due(self, current_time: float) -> list[tuple[Task, str]]:
+        """
+        Returns the finished tasks which should be notified about now
+
+        :param current_time: The current POSIX timestamp
+        :return: The task and outbox id of every finished task to notify about, empty while the digest window is still open
+        """
+        if not self.finished_tasks or (
+            self.window_end is not None and current_time < self.window_end
+        ):
+            return []
+
+        finished_tasks = self.finished_tasks
+        self.finished_tasks = []
+        self.window_end = current_time + self.digest_window
+        return finished_tasks
+
+    def next_release_time(self) -> float | None:
+        """
+        :return: The POSIX timestamp when the held back tasks get released, None if no tasks are held back
+        """
+        if self.finished_tasks:
+            return self.window_end
+        return None
+
+
+class NotificationOutbox:
+    """
+    Persistent log of the notifications which still have to be delivered, so notifications survive
+    crashes and restarts. A finished task or item is added to the outbox before it is marked as finished
+    in data.json, and every backend marks it as delivered once it has confirmed that it sent it. Entries
+    which weren't delivered by every backend are replayed to the remaining backends, after a failure or a
+    drop with a backoff, and on the next start.
+
+    The outbox is an append-only JSON Lines file, which gets compacted on every start.
+    """
+
+    def __init__(self, path: Path, max_delivered_ids: int = 1000):
+        """
+        :param path: The path of the outbox file
+        :param max_delivered_ids: The amount of delivered ids to remember after compacting, used to ignore duplicates
+        """
+        self.path = path
+        self.max_delivered_ids = max_delivered_ids
+        # outbox_id: {"entry": entry, "backends": names of the backends which still have to deliver the entry}
+        self.pending = {}
+        # Ordered set of the ids of delivered entries
+        self.delivered_ids = {}
+        self.lock = threading.Lock()
+
+        self.load()
+        self.compact()
+        self.file = open(self.path, "a", encoding="utf-8")
+
+    def load(self) -> None:
+        """Replays the outbox file to find the pending entries"""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line is incomplete when the application was killed while writing it
+                    continue
+
+                outbox_id = record["id"]
+                if record["op"] == "add":
+                    self.pending[outbox_id] = {
+                        "entry": record["entry"],
+                        "backends": set(record["backends"]),
+                    }
+                elif outbox_id in self.pending:
+                    self.pending[outbox_id]["backends"].discard(record["backend"])
+                    if not self.pending[outbox_id]["backends"]:
+                        del self.pending[outbox_id]
+                        self.delivered_ids[outbox_id] = None
+                else:
+                    self.delivered_ids[outbox_id] = None
+
+    def compact(self) -> None:
+        """Rewrites the outbox file with only the pending entries and the most recently delivered ids"""
+        delivered_ids = list(self.delivered_ids)[-self.max_delivered_ids :]
+        self.delivered_ids = dict.fromkeys(delivered_ids)
+
+        records = [
+            {
+                "op": "add",
+                "id": outbox_id,
+                "entry": pending["entry"],
+                "backends": sorted(pending["backends"]),
+            }
+            for outbox_id, pending in self.pending.items()
+        ]
+        records += [
+            {"op": "delivered", "id": outbox_id, "backend": None}
+            for outbox_id in delivered_ids
+        ]
+
+        with open_atomically(self.path, encoding="utf-8") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def write(self, records: list[dict]) -> None:
+        """
+        Appends records to the outbox file and makes sure they are on disk
+
+        :param records: The records to append
+        """
+        self.file.write("".join(json.dumps(record) + "\n" for record in records))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def add(self, outbox_id: str, entry: dict, backends: list[str]) -> bool:
+        """
+        Adds an entry which has to be delivered by the given backends
+
+        :param outbox_id: The unique id of the entry, an entry with an id which was added before is ignored
+        :param entry: The finished task or item to notify about
+        :param backends: The names of the backends which have to deliver the entry
+        :return: True if the entry was added, False if it is a duplicate
+        """
+        with self.lock:
+            if outbox_id in self.pending or outbox_id in self.delivered_ids:
+                return False
+            self.write(
+                [{"op": "add", "id": outbox_id, "entry": entry, "backends": backends}]
+            )
+            self.pending[outbox_id] = {"entry": entry, "backends": set(backends)}
+            return True
+
+    def mark_delivered(self, outbox_ids: list[str], backend: str) -> None:
+        """
+        Marks entries as delivered by a backend
+
+        :param outbox_ids: The ids of the delivered entries
+        :param backend: The name of the backend which delivered the entries
+        """
+        with self.lock:
+            outbox_ids = [
+                outbox_id
+                for outbox_id in outbox_ids
+                if outbox_id in self.pending
+                and backend in self.pending[outbox_id]["backends"]
+            ]
+            if not outbox_ids:
+                return
+
+            self.write(
+                [
+                    {"op": "delivered", "id": outbox_id, "backend": backend}
+                    for outbox_id in outbox_ids
+                ]
+            )
+            for outbox_id in outbox_ids:
+                self.pending[outbox_id]["backends"].discard(backend)
+                if not self.pending[outbox_id]["backends"]:
+                    del self.pending[outbox_id]
+                    self.delivered_ids[outbox_id] = None
+
+    def pending_entries(self) -> list[tuple[str, dict, set[str]]]:
+        """
+        :return: The id, the entry and the names of the backends which still have to deliver it, for every pending entry
+        """
+        with self.lock:
+            return [
+                (outbox_id, pending["entry"], set(pending["backends"]))
+                for outbox_id, pending in self.pending.items()
+            ]
+
+    def close(self) -> None:
+        """Closes the outbox file"""
+        self.file.close()
+
+
+# The character who sends the notification of the workers section or a building
+NOTIFICATION_CHARACTERS = {
+    "workers": "Worker",
+    "Laboratory": "Chubi",
+    "Refinery": "Chubi",
+    "Training Camp": "Major Wor",
+    "Factory": "Major Wor",
+    "StarPort": "Major Wor",
+}
+
+# Characters which only appear when the "Unique Notification Icons" setting is enabled
+SPECIAL_NOTIFICATION_CHARACTERS = ["Firebit", "Elderby"]
+
+# The icons of every character for the "Unique Notification Icons" setting
+NOTIFICATION_CHARACTER_ICONS = {
+    "Worker": {"Worker.ico": None, "Worker_Happy.ico": None},
+    "Chubi": {"Chubi.ico": None, "Chubi_Happy.ico": None},
+    "Major Wor": {"Major_Wor.ico": None, "Major_Wor_Happy.ico": None},
+    "Firebit": {"Firebit.ico": None},
+    "Elderby": {"Elderby.ico": None},
+}
+
+DEFAULT_NOTIFICATION_ICON = "Starling_Postman_AI_Upscaled.ico"
+
+
+class AliasSampler:
+    """
+    Randomly chooses an option from a fixed set of weighted options in constant time, using Vose's alias
+    method. The tables are built once, after which every choice costs two random numbers.
+    """
+
+    def __init__(self, options: dict[object, float | None]):
+        """
+        :param options: The options to choose from. An option can be passed with a custom probability of type float. If you don't want a custom probability for that option, pass None
+        """
+        self.options, probabilities = self.resolve_probabilities(options)
+        amount = len(self.options)
+
+        # Scale the probabilities so the average is 1 and pair every small column with a large one
+        scaled = [probability * amount for probability in probabilities]
+        self.probabilities = [1.0] * amount
+        self.aliases = list(range(amount))
+        small = [index for index, value in enumerate(scaled) if value < 1.0]
+        large = [index for index, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            small_index = small.pop()
+            large_index = large.pop()
+            self.probabilities[small_index] = scaled[small_index]
+            self.aliases[small_index] = large_index
+            scaled[large_index] -= 1.0 - scaled[small_index]
+            if scaled[large_index] < 1.0:
+                small.append(large_index)
+            else:
+                large.append(large_index)
+        # Columns which are left over because of rounding errors are full columns
+
+    @staticmethod
+    def resolve_probabilities(
+        options: dict[object, float | None],
+    ) -> tuple[list, list[float]]:
+        """
+        Divides the probability which isn't taken by options with a custom probability over the other options
+
+        :param options: The options with their custom probability, or None
+        :return: The options and their probabilities
+        """
+        total_specified_probability = sum(
+            probability for probability in options.values() if probability is not None
+        )
+        num_unspecified = sum(probability is None for probability in options.values())
+        regular_probability = (
+            (1.0 - total_specified_probability) / num_unspecified
+            if num_unspecified > 0
+            else 0.0
+        )
+        return list(options), [
+            regular_probability if probability is None else probability
+            for probability in options.values()
+        ]
+
+    def choose(self) -> object:
+        """
+        :return: A randomly chosen option
+        """
+        index = random.randrange(len(self.options))
+        if random.random() < self.probabilities[index]:
+            return self.options[index]
+        return self.options[self.aliases[index]]
+
+
+class NotificationCatalog:
+    """
+    Chooses the texts and icons of the notifications, using the message catalog of the selected language
+    in the Messages folder. Texts which are missing in that catalog are taken from the English catalog.
+
+    The catalog files are parsed lazily and the options of every combination of section or building and
+    the "Unique Notification Messages" and "Unique Notification Icons" settings are compiled into
+    samplers once, so choosing a notification doesn't have to build any tables. Only the chosen message
+    gets formatted. The catalogs are only parsed again when one of the files has changed.
+    """
+
+    def __init__(self, language: str = "en"):
+        """
+        :param language: The language of the messages, which is the name of a catalog file in the Messages folder
+        """
+        self.language = language
+        self.catalog_paths = [Path(MESSAGES_PATH, "en.json")]
+        if language != "en":
+            self.catalog_paths.append(Path(MESSAGES_PATH, f"{language}.json"))
+        self.catalog_signatures = None
+        self.messages = None
+        # (task type, unique_messages, unique_icons): AliasSampler of (message template, character)
+        self.message_samplers = {}
+        # character: AliasSampler of icon images
+        self.icon_samplers = {
+            character: AliasSampler(icons)
+            for character, icons in NOTIFICATION_CHARACTER_ICONS.items()
+        }
+
+    def reload_if_changed(self) -> None:
+        """Parses and compiles the catalogs if they weren't loaded yet or when one of the files has changed"""
+        catalog_signatures = []
+        for catalog_path in self.catalog_paths:
+            try:
+                stat = os.stat(catalog_path)
+                catalog_signatures.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                catalog_signatures.append(None)
+
+        if catalog_signatures != self.catalog_signatures:
+            self.compile(self.load_messages())
+            self.catalog_signatures = catalog_signatures
+
+    def load_messages(self) -> dict:
+        """
+        Loads the English catalog, overridden by the catalog of the selected language
+
+        :return: dictionary with all the texts of the catalog
+        """
+        with open(self.catalog_paths[0], "r", encoding="utf-8") as file:
+            messages = json.load(file)
+
+        if len(self.catalog_paths) > 1:
+            try:
+                with open(self.catalog_paths[1], "r", encoding="utf-8") as file:
+                    messages.update(json.load(file))
+            except FileNotFoundError:
+                DELIVERY_LOGGER.warning(
+                    "No messages found for the language '%s', using English",
+                    self.language,
+                )
+        return messages
+
+    def compile(self, messages: dict) -> None:
+        """
+        Compiles the message samplers of every task type and setting combination
+
+        :param messages: dictionary with all the texts of the catalog
+        """
+        message_samplers = {}
+        for task_type, character in NOTIFICATION_CHARACTERS.items():
+            task_messages = messages["task_messages"].get(task_type)
+            default_template = messages["default_task_message"].replace(
+                "{name}", messages["task_names"][task_type]
+            )
+            for unique_messages in [True, False]:
+                for unique_icons in [True, False]:
+                    if unique_messages and task_messages is not None:
+                        options = {
+                            (template, message_character): probability
+                            for message_character, templates in task_messages.items()
+                            if unique_icons
+                            or message_character not in SPECIAL_NOTIFICATION_CHARACTERS
+                            for template, probability in templates.items()
+                        }
+                    else:
+                        options = {(default_template, character): None}
+                    message_samplers[(task_type, unique_messages, unique_icons)] = (
+                        AliasSampler(options)
+                    )
+
+        self.messages = messages
+        self.message_samplers = message_samplers
+
+    def choose(
+        self, task_type: str, planet: str, unique_messages: bool, unique_icons: bool
+    ) -> tuple[str, str]:
+        """
+        Randomly chooses the message and icon of the notification of a finished task
+
+        :param task_type: "workers" or the building of a finished buildings task
+        :param planet: The planet of the finished task
+        :param unique_messages: The value of the "Unique Notification Messages" setting
+        :param unique_icons: The value of the "Unique Notification Icons" setting
+        :return: The message and the icon image of the notification
+        """
+        if self.messages is None:
+            self.reload_if_changed()
+
+        template, character = self.message_samplers[
+            (task_type, unique_messages, unique_icons)
+        ].choose()
+        if unique_icons:
+            icon_image = self.icon_samplers[character].choose()
+        else:
+            icon_image = DEFAULT_NOTIFICATION_ICON
+        if planet == "Main Planet":
+            planet = self.messages["main_planet"]
+        return template.format(planet=planet), icon_image
+
+    def item_message(self, item: str) -> str:
+        """
+        :param item: The item which can be collected again (e.g. "star_battery", "tool_case", "helmet")
+        :return: The message of the notification of the item
+        """
+        if self.messages is None:
+            self.reload_if_changed()
+        return self.messages["item_message"].format(
+            item=self.messages["item_names"][item]
+        )
+
+    def digest_message(self, counts: dict[str, int], planets: list[str]) -> str:
+        """
+        Creates one message for multiple finished tasks, e.g. "3 workers and 2 labs finished on Colony 2 and Main Planet!"
+
+        :param counts: The amount of finished tasks per task type ("workers" or the building)
+        :param planets: The planets of the finished tasks
+        :return: The digest message
+        """
+        if self.messages is None:
+            self.reload_if_changed()
+
+        digest_names = self.messages["digest_names"]
+        finished = [
+            f"{count} {digest_names[task_type][0 if count == 1 else 1]}"
+            for task_type, count in sorted(
+                counts.items(), key=lambda entry: list(digest_names).index(entry[0])
+            )
+        ]
+        return self.messages["digest_message"].format(
+            finished=self.join_words(finished), planets=self.join_words(planets)
+        )
+
+    def join_words(self, words: list[str]) -> str:
+        """
+        Joins words into a readable enumeration, e.g. ["a", "b", "c"] becomes "a, b and c"
+
+        :param words: The words to join
+        :return: The joined words
+        """
+        if len(words) == 1:
+            return words[0]
+        return f"{', '.join(words[:-1])} {self.messages['and']} {words[-1]}"
+
+
+class AccountProfile:
+    """
+    A named account with its own data.json, settings.json and notification outbox. The default profile uses
+    the files next to the application, every other profile has its own directory in Profiles.
+    """
+
+    __slots__ = ("name", "directory")
+
+    def __init__(self, name: str, directory: str | Path):
+        """
+        :param name: The name of the profile, shown in the title of its notifications
+        :param directory: The directory with the files of the profile
+        """
+        self.name = name
+        self.directory = Path(directory)
+
+    @property
+    def data_file_path(self) -> Path:
+        return Path(self.directory, "data.json")
+
+    @property
+    def settings_file_path(self) -> Path:
+        return Path(self.directory, "settings.json")
+
+    @property
+    def outbox_file_path(self) -> Path:
+        return Path(self.directory, "notification_outbox.jsonl")
+
+    @property
+    def lock_file_path(self) -> Path:
+        return Path(self.directory, "notification_manager.lock")
+
+    @classmethod
+    def named(cls, name: str) -> "AccountProfile":
+        """
+        :param name: The name of the profile, "default" for the files next to the application
+        :return: The profile with the given name, which doesn't have to exist yet
+        """
+        if name == DEFAULT_PROFILE_NAME:
+            return cls(name, MAIN_PATH)
+        if not re.fullmatch(r"[\w\- ]+", name):
+            raise ValueError(
+                f"Invalid profile name {name!r}, use letters, digits, spaces, '-' and '_'"
+            )
+        return cls(name, Path(PROFILES_PATH, name))
+
+    @classmethod
+    def load_all(cls) -> list["AccountProfile"]:
+        """
+        :return: The default profile and every profile in the Profiles directory which has a data.json and settings.json
+        """
+        profiles = [cls.named(DEFAULT_PROFILE_NAME)]
+        if os.path.isdir(PROFILES_PATH):
+            for name in sorted(os.listdir(PROFILES_PATH)):
+                profile = cls(name, Path(PROFILES_PATH, name))
+                if (
+                    profile.data_file_path.is_file()
+                    and profile.settings_file_path.is_file()
+                ):
+                    profiles.append(profile)
+        return profiles
+
+
+class DeadlineHeap:
+    """
+    Min-heap of the deadlines of the unfinished items and tasks, so the notification checker can find the
+    expired and the next deadline without going through every task. The heap is shared by all profiles, an
+    entry is identified by its key, which is (profile, item, None) for items and (profile, section, task_id)
+    for tasks.
+
+    Deadlines are kept as POSIX timestamps, so they can be compared as plain numbers. Changed and removed
+    entries stay in the heap until they reach the top, where they are skipped because their deadline no
+    longer matches the current deadline of their key.
+    """
+
+    def __init__(self):
+        self.heap = []
+        # Key: the current deadline of the key
+        self.deadlines = {}
+        # Keeps entries with the same deadline in insertion order
+        self.counter = itertools.count()
+
+    def rebuild(self, data: dict, profile_name: str = DEFAULT_PROFILE_NAME) -> None:
+        """
+        Replaces all entries of a profile with the unfinished items and tasks in data
+
+        :param data: dictionary with the item cooldowns and tasks from the data.json of the profile
+        :param profile_name: The name of the profile
+        """
+        self.deadlines = {
+            key: deadline
+            for key, deadline in self.deadlines.items()
+            if key[0] != profile_name
+        }
+        self.deadlines.update(
+            ((profile_name, item, None), data[item].deadline)
+            for item in ITEMS
+            # Items which were never collected have no deadline
+            if not data[item].cooldown_finished and data[item].deadline is not None
+        )
+        self.deadlines.update(
+            ((profile_name, section, task_id), task.deadline)
+            for section in TASK_CLASSES
+            for task_id, task in data[section].items()
+            if not task.cooldown_finished
+        )
+        self.compact()
+
+    def compact(self) -> None:
+        """Rebuilds the heap from the current deadlines, which drops the skipped entries"""
+        self.heap = [
+            (deadline, next(self.counter), key)
+            for key, deadline in self.deadlines.items()
+        ]
+        heapq.heapify(self.heap)
+
+    def update(self, changes: dict) -> None:
+        """
+        Applies changed items and tasks, without going through the unchanged ones
+
+        :param changes: The changed items and tasks by key, as returned by diff_data() with the profile name in front of every key
+        """
+        for key, value in changes.items():
+            if value is None or value.cooldown_finished or value.deadline is None:
+                self.deadlines.pop(key, None)
+            elif self.deadlines.get(key) != value.deadline:
+                self.deadlines[key] = value.deadline
+                heapq.heappush(self.heap, (value.deadline, next(self.counter), key))
+
+        # Keep the skipped entries from piling up
+        if len(self.heap) > 2 * len(self.deadlines) + 64:
+            self.compact()
+
+    def is_current(self, entry: tuple[float, int, tuple[str, str, str | None]]) -> bool:
+        """
+        :param entry: An entry of the heap
+        :return: True if the entry has the current deadline of its key, False if it has to be skipped
+        """
+        deadline, _, key = entry
+        return self.deadlines.get(key) == deadline
+
+    def drop_skipped_entries(self) -> None:
+        """Removes the entries which have to be skipped from the top of the heap"""
+        while self.heap and not self.is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+
+    def pop_expired(
+        self, current_time: float
+    ) -> list[tuple[float, tuple[str, str, str | None]]]:
+        """
+        Removes and returns the entries with a deadline at or before current_time
+
+        :param current_time: The current POSIX timestamp
+        :return: The deadline and key of the expired entries, earliest deadline first
+        """
+        expired = []
+        self.drop_skipped_entries()
+        while self.heap and self.heap[0][0] <= current_time:
+            deadline, _, key = heapq.heappop(self.heap)
+            del self.deadlines[key]
+            expired.append((deadline, key))
+            self.drop_skipped_entries()
+        return expired
+
+    def next_deadline(self, slack: float = 0) -> float | None:
+        """
+        :param slack: Deadlines up to this amount of seconds after the earliest deadline may share its wakeup
+        :return: The POSIX timestamp of the latest deadline within slack seconds of the earliest deadline, None if there are no entries
+        """
+        self.drop_skipped_entries()
+        if not self.heap:
+            return None
+        limit = self.heap[0][0] + slack
+        latest_deadline = self.heap[0][0]
+        # The children of an entry never have an earlier deadline, so only entries within the limit are visited
+        indexes = [1, 2]
+        while indexes:
+            index = indexes.pop()
+            if index < len(self.heap) and self.heap[index][0] <= limit:
+                if self.is_current(self.heap[index]):
+                    latest_deadline = max(latest_deadline, self.heap[index][0])
+                indexes += [2 * index + 1, 2 * index + 2]
+        return latest_deadline
+
+
+class ClockMonitor:
+    """
+    Detects when the notification checker slept differently than requested, by comparing the wall clock
+    and the monotonic clock over every sleep:
+
+    - "clock jump": The wall clock moved differently than the monotonic clock, because the system time or
+      timezone was changed, or because the monotonic clock stood still while the computer was suspended
+    - "suspend gap": Both clocks moved much further than the requested sleep, because the computer was
+      suspended or the process was paused
+    """
+
+    def __init__(self, tolerance: float, clock: Clock):
+        """
+        :param tolerance: The amount of seconds the clocks may differ before it counts as a jump or gap
+        :param clock: The clock to monitor
+        """
+        self.tolerance = tolerance
+        self.clock = clock
+        self.start()
+
+    def start(self) -> None:
+        """Remembers both clocks at the start of a sleep"""
+        self.start_wall_time = self.clock.time()
+        self.start_monotonic_time = self.clock.monotonic()
+        self.start_utc_offset = datetime.now().astimezone().utcoffset()
+
+    def check(self, requested_sleep: float) -> str | None:
+        """
+        Compares both clocks with the clocks at the start of the sleep
+
+        :param requested_sleep: The amount of seconds the sleep was supposed to take
+        :return: "clock jump" or "suspend gap" if one was detected, otherwise None
+        """
+        wall_time_elapsed = self.clock.time() - self.start_wall_time
+        monotonic_time_elapsed = self.clock.monotonic() - self.start_monotonic_time
+        # A sped up clock also speeds up the delays of the event loop
+        tolerance = self.tolerance * self.clock.time_scale
+
+        if (
+            abs(wall_time_elapsed - monotonic_time_elapsed) > tolerance
+            or datetime.now().astimezone().utcoffset() != self.start_utc_offset
+        ):
+            return "clock jump"
+        if monotonic_time_elapsed > requested_sleep + tolerance:
+            return "suspend gap"
+        return None
+
+
+class ClockChangeWatcher:
+    """
+    Calls a function as soon as the system clock is set or the computer resumes from suspend, through a Linux
+    timerfd which the kernel cancels when the wall clock changes discontinuously. This lets the notification
+    checker sleep until the next deadline without checking the clocks in between. On other systems start()
+    returns False, and the clocks are only checked after every sleep.
+    """
+
+    CLOCK_REALTIME = 0
+    TFD_TIMER_ABSTIME = 1
+    TFD_TIMER_CANCEL_ON_SET = 2
+
+    class ITimerSpec(ctypes.Structure):
+        # struct itimerspec, with every struct timespec as tv_sec, tv_nsec
+        _fields_ = [
+            ("it_interval", ctypes.c_long * 2),
+            ("it_value", ctypes.c_long * 2),
+        ]
+
+    def __init__(self, on_change: Callable[[], None]):
+        """
+        :param on_change: Called on the event loop when the clock was set or the computer resumed
+        """
+        self.on_change = on_change
+        self.libc = None
+        self.timer_file_descriptor = None
+        self.loop = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> bool:
+        """
+        Creates the timerfd and watches it on the event loop
+
+        :param loop: The event loop of the notification checker
+        :return: True if the clock changes are watched
+        """
+        if not sys.platform.startswith("linux"):
+            return False
+        try:
+            self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            timer_file_descriptor = self.libc.timerfd_create(
+                self.CLOCK_REALTIME, os.O_NONBLOCK | os.O_CLOEXEC
+            )
+        except (OSError, AttributeError):
+            return False
+        if timer_file_descriptor < 0:
+            return False
+        self.timer_file_descriptor = timer_file_descriptor
+        if not self.arm():
+            self.close()
+            return False
+        self.loop = loop
+        loop.add_reader(self.timer_file_descriptor, self.on_readable)
+        return True
+
+    def arm(self) -> bool:
+        """
+        Sets the timer to a moment which is never reached, with TFD_TIMER_CANCEL_ON_SET so that the kernel
+        cancels it when the clock changes
+
+        :return: True if the timer was set
+        """
+        timer_spec = self.ITimerSpec()
+        # Year 36812, only the cancellation matters
+        timer_spec.it_value[0] = 2**40
+        result = self.libc.timerfd_settime(
+            self.timer_file_descriptor,
+            self.TFD_TIMER_ABSTIME | self.TFD_TIMER_CANCEL_ON_SET,
+            ctypes.byref(timer_spec),
+            None,
+        )
+        if result < 0:
+            SCHEDULER_LOGGER.warning(
+                "Could not watch the system clock: %s",
+                os.strerror(ctypes.get_errno()),
+            )
+            return False
+        return True
+
+    def on_readable(self) -> None:
+        """Reads the cancellation of the timer, sets it again and reports the clock change"""
+        try:
+            os.read(self.timer_file_descriptor, 8)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if e.errno != errno.ECANCELED:
+                raise
+        self.arm()
+        self.on_change()
+
+    def close(self) -> None:
+        if self.timer_file_descriptor is None:
+            return
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.remove_reader(self.timer_file_descriptor)
+        os.close(self.timer_file_descriptor)
+        self.timer_file_descriptor = None
+
+
+class ProfileNotifier:
+    """
+    The notifications of one profile: its settings, outbox and digest window. The deadlines of its items and
+    tasks are kept in the deadline heap of the notification manager, and its notifications are delivered by the
+    backends of the notification manager, which are both shared by all profiles.
+    """
+
+    # The seconds before the first retry of notifications which weren't delivered, doubling for every next retry
+    retry_backoff = 5
+    max_retry_delay = 300
+
+    def __init__(self, profile: AccountProfile, manager: "NotificationManager"):
+        """
+        :param profile: The profile to send the notifications of
+        :param manager: The notification manager which schedules the profile
+        """
+        self.profile = profile
+        self.manager = manager
+        self.backends = []
+        self.delivery_workers = []
+        self.outbox = None
+        self.data = None
+        self.data_signature = None
+        # (outbox id, backend name) of the entries which are queued or being sent, so a retry doesn't send them twice
+        self.in_flight = set()
+        self.retry_at = None
+        self.retry_attempt = 0
+        self.retry_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Loads the settings of the profile, gets its delivery workers and sends its undelivered notifications"""
+        settings = MainWindow.load_settings(self.profile.settings_file_path)
+        self.settings_signature = get_file_signature(self.profile.settings_file_path)
+        self.global_settings = settings["global_settings"]
+        self.notification_settings = settings["notification_settings"]
+        self.delivery_workers = self.manager.get_delivery_workers(
+            self.notification_settings
+        )
+        self.backends = [
+            delivery_worker.backend for delivery_worker in self.delivery_workers
+        ]
+        self.catalog = NotificationCatalog(self.notification_settings["language"])
+        self.coalescer = NotificationCoalescer(
+            self.notification_settings["digest_window"]
+        )
+        self.outbox = NotificationOutbox(self.profile.outbox_file_path)
+        self.replay_outbox()
+        # Changes made by other programs wake the notification checker up
+        FILE_WATCHER.watch(
+            self.profile.data_file_path,
+            lambda path: self.manager.wake("data_changed"),
+        )
+        FILE_WATCHER.watch(
+            self.profile.settings_file_path,
+            lambda path: self.manager.wake("settings_changed"),
+        )
+        self.first_iteration = self.global_settings[
+            "disable_notifications_during_startup"
+        ]
+
+    def reload_settings_if_changed(self) -> None:
+        """Loads the global settings again, only when settings.json has changed since it was last loaded"""
+        settings_signature = get_file_signature(self.profile.settings_file_path)
+        if settings_signature != self.settings_signature:
+            try:
+                settings = MainWindow.load_settings(self.profile.settings_file_path)
+            except (ValueError, KeyError):
+                # Another program is still writing it, the change is reported again once it is done
+                STORAGE_LOGGER.warning(
+                    "Couldn't read %s, keeping the previous settings",
+                    self.profile.settings_file_path,
+                    exc_info=True,
+                )
+                return
+            self.settings_signature = settings_signature
+            self.global_settings = settings["global_settings"]
+
+    def reload_data_if_changed(self) -> None:
+        """
+        Loads data.json only when it has changed since it was last loaded, and updates the deadline heap
+        with the items and tasks which were changed
+        """
+        data_signature = get_file_signature(self.profile.data_file_path)
+        if data_signature != self.data_signature:
+            try:
+                data = MainWindow.load_data(self.profile.data_file_path)
+            except (ValueError, KeyError):
+                # Another program is still writing it, the change is reported again once it is done
+                STORAGE_LOGGER.warning(
+                    "Couldn't read %s, keeping the previous data",
+                    self.profile.data_file_path,
+                    exc_info=True,
+                )
+                return
+            self.update_data(data)
+            self.data_signature = data_signature
+
+    def update_data(self, data: dict) -> None:
+        """
+        Continues with a new version of data.json, which only updates the deadline heap for the changed items
+        and tasks
+
+        :param data: dictionary with the item cooldowns and tasks from data.json
+        """
+        if self.data is None:
+            self.manager.deadline_heap.rebuild(data, self.profile.name)
+        else:
+            changes = diff_data(self.data, data)
+            if changes:
+                SCHEDULER_LOGGER.debug(
+                    "%d item(s) and task(s) changed in data.json",
+                    len(changes),
+                    extra={"data": {"profile": self.profile.name}},
+                )
+            self.manager.deadline_heap.update(
+                {(self.profile.name, *key): value for key, value in changes.items()}
+            )
+        self.data = data
+
+    def process_expired(self, expired: list[tuple[str, str | None]]) -> None:
+        """
+        Notifies about the expired items and tasks of the profile, and marks them as finished
+
+        :param expired: The keys of the expired items and tasks, (item, None) for items and (section, task_id) for tasks
+        """
+        # The notifications have to be in the outbox before the tasks are marked as finished
+        for section, task_id in expired:
+            if task_id is None:
+                self.process_notification(item=section)
+            else:
+                self.process_notification(
+                    section=section,
+                    task_id=task_id,
+                    task=self.data[section][task_id],
+                )
+        self.cooldowns_finished(expired)
+
+    def process_notification(
+        self,
+        *,
+        item: str | None = None,
+        section: str | None = None,
+        task_id: str | None = None,
+        task: Task | None = None,
+    ) -> None:
+        """
+        Checks if the notification is send before and sends it if it isn't.
+
+        :param item: The item to check (e.g. "star_battery", "tool_case", "helmet")
+        :param section: The section of the task to check (e.g. "workers", "buildings")
+        :param task_id: The id of the task to check
+        :param task: The task with the id task_id
+        """
+        backend_names = [backend.name for backend in self.backends]
+
+        if (
+            section is not None
+            and task is not None
+            and self.global_settings[section]
+            and not self.first_iteration
+            and not task.cooldown_finished
+        ):
+            outbox_id = f"{section}:{task_id}:{format_deadline(task.deadline)}"
+            entry = {"section": section, "task_info": task.to_dict()}
+            if self.outbox.add(outbox_id, entry, backend_names):
+                # Finished tasks are collected first, so a burst of them can be sent as one digest
+                self.coalescer.add(task, outbox_id)
+
+        if (
+            item is not None
+            and self.global_settings[item]
+            and not self.first_iteration
+            and not self.data[item].cooldown_finished
+        ):
+            outbox_id = f"{item}:{format_deadline(self.data[item].deadline)}"
+            if self.outbox.add(outbox_id, {"item": item}, backend_names):
+                self.send_item_notification(item, [outbox_id])
+
+    def send_item_notification(
+        self, item: str, outbox_ids: list[str], backend_names: set[str] | None = None
+    ) -> None:
+        """
+        Sends the notification of an item which can be collected again
+
+        :param item: The item which can be collected again (e.g. "star_battery", "tool_case", "helmet")
+        :param outbox_ids: The ids of the notification outbox entries of the item
+        :param backend_names: The names of the backends which have to send the notification, None for all backends
+        """
+        self.send_notification(
+            self.catalog.item_message(item),
+            f"{item.title()}.png",
+            "item",
+            outbox_ids,
+            backend_names,
+        )
+
+    def send_task_notifications(self, current_time: float) -> None:
+        """
+        Sends the notifications of the collected finished tasks once their digest window has passed.
+
+        :param current_time: The current POSIX timestamp
+        """
+        self.send_finished_tasks(self.coalescer.pop_due(current_time))
+
+    def send_finished_tasks(
+        self,
+        finished_tasks: list[tuple[Task, str]],
+        backend_names: set[str] | None = None,
+    ) -> None:
+        """
+        Sends the notifications of finished tasks. A single finished task gets its own notification,
+        multiple finished tasks get one digest.
+
+        :param finished_tasks: The task and outbox id of every finished task
+        :param backend_names: The names of the backends which have to send the notifications, None for all backends
+        """
+        outbox_ids = [outbox_id for _, outbox_id in finished_tasks]
+        finished_tasks = [task for task, _ in finished_tasks]
+
+        if len(finished_tasks) == 1:
+            task = finished_tasks[0]
+            self.send_notification(
+                *self.create_task_notification(task),
+                self.get_task_priority(task),
+                outbox_ids,
+                backend_names,
+            )
+        elif len(finished_tasks) > 1:
+            # A digest gets the highest priority of the tasks in it
+            self.send_notification(
+                self.create_digest_message(finished_tasks),
+                DEFAULT_NOTIFICATION_ICON,
+                min(
+                    (self.get_task_priority(task) for task in finished_tasks),
+                    key=NOTIFICATION_PRIORITIES.get,
+                ),
+                outbox_ids,
+                backend_names,
+            )
+
+    def replay_outbox(self) -> None:
+        """
+        Sends the notifications from the outbox which weren't delivered by every backend, before the last
+        shutdown or because a backend failed or dropped them. Entries which are still queued are skipped.
+        """
+        # Entries which still have to be sent by the same backends are replayed together
+        replay_groups = {}
+        with self.retry_lock:
+            in_flight = set(self.in_flight)
+        for outbox_id, entry, backend_names in self.outbox.pending_entries():
+            backend_names = {
+                backend_name
+                for backend_name in backend_names
+                if (outbox_id, backend_name) not in in_flight
+            }
+            if not backend_names:
+                continue
+            replay_groups.setdefault(frozenset(backend_names), []).append(
+                (outbox_id, entry)
+            )
+
+        for backend_names, entries in replay_groups.items():
+            DELIVERY_LOGGER.info(
+                "Replaying %d undelivered notification(s)",
+                len(entries),
+                extra={"data": {"backends": sorted(backend_names)}},
+            )
+            finished_tasks = []
+            for outbox_id, entry in entries:
+                if "item" in entry:
+                    self.send_item_notification(
+                        entry["item"], [outbox_id], backend_names
+                    )
+                else:
+                    task_class = TASK_CLASSES[entry["section"]]
+                    finished_tasks.append(
+                        (task_class.from_dict(entry["task_info"]), outbox_id)
+                    )
+            self.send_finished_tasks(finished_tasks, backend_names)
+
+    def schedule_retry(self) -> None:
+        """
+        Replays the undelivered entries of the outbox after the backoff, which doubles with every retry until a
+        notification is delivered again. Can be called from any thread.
+        """
+        with self.retry_lock:
+            if self.retry_at is not None:
+                return
+            delay = min(
+                self.retry_backoff * 2**self.retry_attempt, self.max_retry_delay
+            ) * random.uniform(0.5, 1)
+            self.retry_at = self.manager.clock.time() + delay
+            self.retry_attempt += 1
+        DELIVERY_LOGGER.info(
+            "Retrying the undelivered notifications in %.0f seconds", delay
+        )
+        # The notification checker has to wake up for the retry
+        self.manager.wake("delivery_retry")
+
+    def next_retry_time(self) -> float | None:
+        """
+        :return: The POSIX timestamp of the next retry of undelivered notifications, None if none is scheduled
+        """
+        return self.retry_at
+
+    def retry_undelivered(self, current_time: float) -> None:
+        """
+        Replays the undelivered entries of the outbox when their retry is due
+
+        :param current_time: The current POSIX timestamp
+        """
+        with self.retry_lock:
+            if self.retry_at is None or current_time < self.retry_at:
+                return
+            self.retry_at = None
+        self.replay_outbox()
+
+    @staticmethod
+    def get_task_priority(task: Task) -> str:
+        """
+        Returns the priority class of the notification of a finished task
+
+        :param task: The finished task
+        :return: The priority class (e.g. "workers", "buildings", "refinery")
+        """
+        if task.task_type == "Refinery":
+            return "refinery"
+        return task.section
+
+    def create_digest_message(self, finished_tasks: list[Task]) -> str:
+        """
+        Creates one message for multiple finished tasks, e.g. "3 workers and 2 labs finished on Colony 2 and Main Planet!"
+
+        :param finished_tasks: The finished tasks
+        :return: The digest message
+        """
+        counts = {}
+        planets = []
+        for task in finished_tasks:
+            counts[task.task_type] = counts.get(task.task_type, 0) + 1
+            if task.planet not in planets:
+                planets.append(task.planet)
+        return self.catalog.digest_message(counts, planets)
+
+    def create_task_notification(self, task: Task) -> tuple[str, str]:
+        """
+        Creates the message and icon of the notification of a finished task
+
+        :param task: The finished task
+        :return: The message and the icon image of the notification
+        """
+        return self.catalog.choose(
+            task.task_type,
+            task.planet,
+            self.global_settings["unique_messages"],
+            self.global_settings["unique_icons"],
+        )
+
+    def send_notification(
+        self,
+        message: str,
+        icon_image: str,
+        priority: str,
+        outbox_ids: list[str] | None = None,
+        backend_names: set[str] | None = None,
+    ) -> None:
+        """
+        Queues the notification for delivery by the notification backends.
+
+        :param message: The message to be displayed in the notification
+        :param icon_image: The icon to be displayed in the notification
+        :param priority: The priority class of the notification (e.g. "item", "workers", "buildings", "refinery")
+        :param outbox_ids: The ids of the notification outbox entries the notification is about
+        :param backend_names: The names of the backends which have to send the notification, None for all backends
+        """
+        notification = {
+            "profile": self.profile.name,
+            "title": self.title,
+            "message": message,
+            "icon_image": icon_image,
+            "priority": priority,
+            "created_at": self.manager.clock.now().isoformat(),
+            "outbox_ids": outbox_ids or [],
+        }
+        for delivery_worker in self.delivery_workers:
+            backend_name = delivery_worker.backend.name
+            if backend_names is not None and backend_name not in backend_names:
+                continue
+            with self.retry_lock:
+                self.in_flight.update(
+                    (outbox_id, backend_name)
+                    for outbox_id in notification["outbox_ids"]
+                )
+            dropped_notifications = delivery_worker.submit(notification)
+            if not any(dropped is notification for dropped in dropped_notifications):
+                METRICS.increment(
+                    "notifications_queued_total",
+                    backend=backend_name,
+                    priority=priority,
+                )
+            if dropped_notifications:
+                METRICS.increment(
+                    "notifications_dropped_total",
+                    len(dropped_notifications),
+                    backend=backend_name,
+                )
+                # Dropped by the overflow policy, so they stay in the outbox and are retried later. The
+                # queue is shared, so the dropped notifications can belong to other profiles
+                self.manager.notifications_failed(backend_name, dropped_notifications)
+
+    def notifications_delivered(
+        self, backend_name: str, notifications: list[dict]
+    ) -> None:
+        """
+        Marks the outbox entries of delivered notifications as delivered by the backend
+
+        :param backend_name: The name of the backend which delivered the notifications
+        :param notifications: The delivered notifications
+        """
+        METRICS.increment(
+            "notifications_delivered_total", len(notifications), backend=backend_name
+        )
+        outbox_ids = [
+            outbox_id
+            for notification in notifications
+            for outbox_id in notification["outbox_ids"]
+        ]
+        self.outbox.mark_delivered(outbox_ids, backend_name)
+        with self.retry_lock:
+            self.in_flight.difference_update(
+                (outbox_id, backend_name) for outbox_id in outbox_ids
+            )
+            self.retry_attempt = 0
+
+    def notifications_failed(
+        self, backend_name: str, notifications: list[dict]
+    ) -> None:
+        """
+        Leaves the outbox entries of notifications which weren't delivered pending, and schedules their retry
+
+        :param backend_name: The name of the backend which failed to deliver or dropped the notifications
+        :param notifications: The notifications which weren't delivered
+        """
+        with self.retry_lock:
+            self.in_flight.difference_update(
+                (outbox_id, backend_name)
+                for notification in notifications
+                for outbox_id in notification["outbox_ids"]
+            )
+        if any(notification["outbox_ids"] for notification in notifications):
+            self.schedule_retry()
+
+    @property
+    def title(self) -> str:
+        """The title of the notifications, which names the profile unless it is the default profile"""
+        if self.profile.name == DEFAULT_PROFILE_NAME:
+            return "Galaxy Life Notifier"
+        return f"Galaxy Life Notifier ({self.profile.name})"
+
+    def cooldowns_finished(self, finished: list[tuple[str, str | None]]) -> None:
+        """
+        Changes the cooldown_finished parameter to true in data.json for the given items and tasks, with a
+        single save for all of them
+
+        :param finished: The keys of the finished items and tasks, (item, None) for items and (section, task_id) for tasks
+        """
+        with DATA_LOCK:
+            try:
+                data = MainWindow.load_data(self.profile.data_file_path)
+            except (ValueError, KeyError):
+                STORAGE_LOGGER.warning(
+                    "Couldn't read %s, continuing with the previous data",
+                    self.profile.data_file_path,
+                    exc_info=True,
+                )
+                data = copy.deepcopy(self.data)
+
+            for section, task_id in finished:
+                if task_id is None:
+                    data[section].cooldown_finished = True
+                elif (
+                    task_id in data[section]
+                ):  # The task might have been removed in the meantime
+                    data[section][task_id].cooldown_finished = True
+
+            MainWindow.save_data(data, self.profile.data_file_path)
+
+        # Continue with the saved data, which includes changes made by the GUI since the last load
+        self.update_data(data)
+        self.data_signature = get_file_signature(self.profile.data_file_path)
+
+    def close(self) -> None:
+        """Closes the outbox, after the notification manager delivered the queued notifications"""
+        if self.outbox is not None:
+            self.outbox.close()
+
+
+class NotificationManager:
+    """
+    Schedules the notifications of every profile with one event loop, one clock and one deadline heap, and
+    delivers them with one set of backends, so more profiles don't add more timers, wakeups or backends
+    """
+
+    profile_notifier_class = ProfileNotifier
+
+    def __init__(
+        self,
+        main_window: "MainWindow | None" = None,
+        backends: list[NotificationBackend] | None = None,
+        clock: Clock | None = None,
+        stop_when_idle: bool = False,
+        profiles: list[AccountProfile] | None = None,
+    ):
+        """
+        :param main_window: The window to update when tasks of its profile finish, None when running without a GUI
+        :param backends: The notification backends to use for every profile, by default the backends selected in the settings.json of each profile, shared by the profiles which select them with the same settings
+        :param clock: The clock to schedule the notifications with, by default the real time
+        :param stop_when_idle: Stop the notification checker once there are no more deadlines to wait for
+        :param profiles: The profiles to schedule, by default the default profile and every profile in the Profiles directory
+        """
+        self.running = True
+        self.main_window = main_window
+        self.backends = backends
+        self.clock = clock or SystemClock()
+        self.stop_when_idle = stop_when_idle
+        self.profiles = profiles
+        self.profile_notifiers = {}
+        # The profiles which another running notification manager schedules, see claim_profiles()
+        self.unclaimed_profiles = []
+        # (backend name, backend settings): the delivery worker shared by the profiles with these settings
+        self.delivery_workers = {}
+        self.loop = None
+        self.clock_change_watcher = None
+        self.wake_event = None
+        self.wake_reason = None
+
+    def start_profile(self, profile: AccountProfile) -> None:
+        """
+        Starts scheduling the notifications of a profile
+
+        :param profile: The profile to schedule
+        """
+        profile_notifier = self.profile_notifier_class(profile, self)
+        self.profile_notifiers[profile.name] = profile_notifier
+        profile_notifier.start()
+
+    def get_delivery_workers(
+        self, notification_settings: dict
+    ) -> list[NotificationDeliveryWorker]:
+        """
+        Gets the delivery workers of the backends selected in the settings of a profile, and creates the ones
+        which no other profile uses yet. A backend selected with the same settings by several profiles is
+        created once, so ten accounts share one PowerShell host, connection pool and delivery thread. The
+        queue and rate limit of a shared delivery worker come from the first profile which selected it.
+
+        :param notification_settings: The "notification_settings" section of the settings.json of the profile
+        :return: The started delivery worker of every backend of the profile
+        """
+        if self.backends is not None:
+            backend_factories = [
+                ((backend.name, id(backend)), lambda backend=backend: backend)
+                for backend in self.backends
+            ]
+        else:
+            backend_factories = [
+                (
+                    (
+                        backend_class.name,
+                        backend_class.settings_key(notification_settings),
+                    ),
+                    lambda backend_class=backend_class: backend_class.from_settings(
+                        notification_settings
+                    ),
+                )
+                for backend_class in get_notification_backend_classes(
+                    notification_settings
+                )
+            ]
+
+        delivery_workers = []
+        for key, create_backend in backend_factories:
+            if key not in self.delivery_workers:
+                delivery_worker = NotificationDeliveryWorker.from_settings(
+                    create_backend(),
+                    notification_settings,
+                    self.notifications_delivered,
+                    self.notifications_failed,
+                )
+                delivery_worker.start()
+                self.delivery_workers[key] = delivery_worker
+            delivery_workers.append(self.delivery_workers[key])
+        return delivery_workers
+
+    def group_by_profile(
+        self, notifications: list[dict]
+    ) -> list[tuple[ProfileNotifier, list[dict]]]:
+        """
+        :param notifications: Notifications of one or more profiles
+        :return: The notifier of every profile with its notifications, in the order of their first notification
+        """
+        groups = {}
+        for notification in notifications:
+            groups.setdefault(notification["profile"], []).append(notification)
+        return [
+            (self.profile_notifiers[profile_name], profile_notifications)
+            for profile_name, profile_notifications in groups.items()
+        ]
+
+    def notifications_delivered(
+        self, backend_name: str, notifications: list[dict]
+    ) -> None:
+        """
+        Passes the notifications which a shared backend delivered on to their profiles
+
+        :param backend_name: The name of the backend which delivered the notifications
+        :param notifications: The delivered notifications
+        """
+        for profile_notifier, profile_notifications in self.group_by_profile(
+            notifications
+        ):
+            profile_notifier.notifications_delivered(
+                backend_name, profile_notifications
+            )
+
+    def notifications_failed(
+        self, backend_name: str, notifications: list[dict]
+    ) -> None:
+        """
+        Passes the notifications which a shared backend failed to deliver or dropped on to their profiles
+
+        :param backend_name: The name of the backend which failed to deliver or dropped the notifications
+        :param notifications: The notifications which weren't delivered
+        """
+        for profile_notifier, profile_notifications in self.group_by_profile(
+            notifications
+        ):
+            profile_notifier.notifications_failed(backend_name, profile_notifications)
+
+    async def notification_checker(self) -> None:
+        """
+        Checks the data.json files of all profiles for scheduled notifications and sends notifications if needed
+        """
+        self.loop = asyncio.get_running_loop()
+        self.wake_event = asyncio.Event()
+        # The scheduler settings apply to the whole process, so they come from the profile it was started with
+        self.settings_signature = get_file_signature(SETTINGS_FILE_PATH)
+        self.scheduler_settings = MainWindow.load_settings()["scheduler_settings"]
+        self.deadline_heap = DeadlineHeap()
+        if self.profiles is None:
+            self.profiles = AccountProfile.load_all()
+        for profile in self.profiles:
+            self.start_profile(profile)
+        SCHEDULER_LOGGER.info(
+            "Scheduling %d profile(s)",
+            len(self.profile_notifiers),
+            extra={"data": {"profiles": list(self.profile_notifiers)}},
+        )
+        self.clock_monitor = ClockMonitor(
+            self.scheduler_settings["clock_jump_tolerance"], self.clock
+        )
+        # A virtual clock is never set, so only the real clock is watched
+        if isinstance(self.clock, SystemClock):
+            self.clock_change_watcher = ClockChangeWatcher(
+                lambda: self.wake("clock_jump")
+            )
+            if not self.clock_change_watcher.start(self.loop):
+                self.clock_change_watcher = None
+        # The profiling controls run cProfile on this thread through the event loop
+        PROFILER.register_thread(
+            "notifier",
+            threading.get_ident(),
+            self.loop.call_soon_threadsafe,
+        )
+        PROFILER.start_from_environment("notifier")
+
+        wakeup_cause = "startup"
+        while self.running:
+            METRICS.increment("scheduler_wakeups_total", cause=wakeup_cause)
+            self.reload_settings_if_changed()
+            self.claim_released_profiles()
+            for profile_notifier in self.profile_notifiers.values():
+                profile_notifier.reload_settings_if_changed()
+                profile_notifier.reload_data_if_changed()
+                profile_notifier.catalog.reload_if_changed()
+            self.process_expired_deadlines(self.clock.time())
+
+            for profile_notifier in self.profile_notifiers.values():
+                profile_notifier.first_iteration = False
+
+            # Wake up for the next deadline, when the held back tasks have to be sent as a digest, or for
+            # the retry of undelivered notifications
+            next_wakeups = [
+                wakeup
+                for wakeup in [
+                    self.deadline_heap.next_deadline(
+                        self.scheduler_settings["timer_slack"]
+                    ),
+                    *(
+                        profile_notifier.coalescer.next_release_time()
+                        for profile_notifier in self.profile_notifiers.values()
+                    ),
+                    *(
+                        profile_notifier.next_retry_time()
+                        for profile_notifier in self.profile_notifiers.values()
+                    ),
+                ]
+                if wakeup is not None
+            ]
+            if not next_wakeups and self.stop_when_idle:
+                break
+            wakeup_cause = await self.sleep_until(min(next_wakeups, default=None))
+
+    def reload_settings_if_changed(self) -> None:
+        """Loads the scheduler settings again, only when settings.json has changed since it was last loaded"""
+        settings_signature = get_file_signature(SETTINGS_FILE_PATH)
+        if settings_signature != self.settings_signature:
+            try:
+                self.scheduler_settings = MainWindow.load_settings()[
+                    "scheduler_settings"
+                ]
+            except (ValueError, KeyError):
+                STORAGE_LOGGER.warning(
+                    "Couldn't read settings.json, keeping the previous scheduler settings",
+                    exc_info=True,
+                )
+                return
+            self.settings_signature = settings_signature
+            self.clock_monitor.tolerance = self.scheduler_settings[
+                "clock_jump_tolerance"
+            ]
+
+    def wake(self, reason: str) -> None:
+        """
+        Ends the current sleep of the notification checker, so a change (e.g. a new task which finishes
+        before the next wakeup) is handled right away. Can be called from any thread.
+
+        :param reason: Why the notification checker is woken up (e.g. "data_changed", "settings_changed")
+        """
+        if self.loop is None:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.set_wake_event, reason)
+        except RuntimeError:
+            # The event loop has already been closed
+            pass
+
+    def set_wake_event(self, reason: str) -> None:
+        """
+        Wakes the notification checker up, on the thread of the event loop
+
+        :param reason: Why the notification checker is woken up
+        """
+        self.wake_reason = reason
+        self.wake_event.set()
+
+    async def sleep_or_wake(self, seconds: float) -> str | None:
+        """
+        Sleeps for the given amount of seconds, or until wake() is called
+
+        :param seconds: The amount of seconds to sleep
+        :return: The reason given to wake(), None if the whole amount of seconds was slept
+        """
+        sleep_task = asyncio.ensure_future(self.clock.sleep(seconds))
+        wake_task = asyncio.ensure_future(self.wake_event.wait())
+        await asyncio.wait([sleep_task, wake_task], return_when=asyncio.FIRST_COMPLETED)
+        sleep_task.cancel()
+        wake_task.cancel()
+
+        if not self.wake_event.is_set():
+            return None
+        self.wake_event.clear()
+        return self.wake_reason
+
+    def process_expired_deadlines(self, current_time: float) -> None:
+        """
+        Notifies about every item and task whose deadline has passed, and marks them as finished.
+        All deadlines which expired while the notification checker was asleep are handled as one batch
+        per profile.
+
+        :param current_time: The current POSIX timestamp
+        """
+        expired = {}
+        for deadline, (profile_name, *key) in self.deadline_heap.pop_expired(
+            current_time
+        ):
+            METRICS.observe("deadline_latency_seconds", current_time - deadline)
+            expired.setdefault(profile_name, []).append(tuple(key))
+
+        for profile_name, keys in expired.items():
+            self.profile_notifiers[profile_name].process_expired(keys)
+
+        # The main window only shows the tasks of its own profile
+        keys = expired.get(ACTIVE_PROFILE_NAME, [])
+        if self.main_window is not None and keys:
+            main_window = self.main_window
+
+            def update_window() -> None:
+                try:
+                    for section, task_id in keys:
+                        if task_id is None:
+                            main_window.set_item_text(section)
+                    if any(section == "workers" for section, _ in keys):
+                        main_window.workers_tasks_display()
+                    if any(section == "buildings" for section, _ in keys):
+                        main_window.buildings_tasks_display()
+                except Exception:
+                    UI_LOGGER.exception("Couldn't show the finished tasks")
+
+            # The widgets and the displayed tasks may only be touched on the Tk thread
+            self.main_window.call_in_ui_thread(update_window)
+
+        for profile_notifier in self.profile_notifiers.values():
+            profile_notifier.send_task_notifications(current_time)
+            profile_notifier.retry_undelivered(current_time)
+
+    def calculate_sleep_duration(
+        self, next_wakeup: float | None, current_time: float
+    ) -> float:
+        """
+        Calculates how long the notification checker can sleep
+
+        :param next_wakeup: The POSIX timestamp of the next deadline, None if there is nothing scheduled
+        :param current_time: The current POSIX timestamp
+        :return: The amount of seconds to sleep
+        """
+        if self.scheduler_settings["low_power_mode"]:
+            # Sleep until the next deadline however far away it is, wake() ends the sleep early for changes
+            if next_wakeup is None:
+                return math.inf
+            return max(next_wakeup - current_time, 0)
+
+        max_sleep = self.scheduler_settings["max_sleep"]
+        if next_wakeup is None:
+            return max_sleep
+        return min(max(next_wakeup - current_time, 0), max_sleep)
+
+    async def sleep_until(self, next_wakeup: float | None) -> str:
+        """
+        Sleeps until next_wakeup, in steps of at most clock_check_interval seconds. After every step the
+        clocks are checked, and the sleep ends early when a clock jump or suspend gap is detected, so the
+        expired deadlines get handled right away instead of at the end of the sleep. The sleep also ends
+        early when wake() is called.
+
+        :param next_wakeup: The POSIX timestamp of the next deadline, None if there is nothing scheduled
+        :return: Why the sleep ended: "deadline", "max_sleep", "clock_jump", "suspend_gap" or the reason given to wake()
+        """
+        low_power_mode = self.scheduler_settings["low_power_mode"]
+        sleep_duration = self.calculate_sleep_duration(next_wakeup, self.clock.time())
+        SCHEDULER_LOGGER.debug("Sleeping for %.1f seconds", sleep_duration)
+        if next_wakeup is not None and (
+            low_power_mode or sleep_duration < self.scheduler_settings["max_sleep"]
+        ):
+            wakeup_cause = "deadline"
+        else:
+            wakeup_cause = "max_sleep"
+        clock_check_interval = self.scheduler_settings[
+            (
+                "low_power_clock_check_interval"
+                if low_power_mode
+                else "clock_check_interval"
+            )
+        ]
+        if not clock_check_interval:
+            # Only the end of the sleep, wake() and the ClockChangeWatcher end the sleep
+            clock_check_interval = math.inf
+
+        sleep_end = self.clock.monotonic() + sleep_duration
+        while (remaining := sleep_end - self.clock.monotonic()) > 0:
+            step = min(remaining, clock_check_interval)
+            self.clock_monitor.start()
+            wake_reason = await self.sleep_or_wake(step)
+            clock_event = self.clock_monitor.check(step)
+            if clock_event is not None:
+                SCHEDULER_LOGGER.info(
+                    "Detected a %s, checking the deadlines again",
+                    clock_event,
+                    extra={"data": {"clock_event": clock_event}},
+                )
+                return clock_event.replace(" ", "_")
+            if wake_reason is not None:
+                SCHEDULER_LOGGER.debug("Woken up because of %s", wake_reason)
+                return wake_reason
+        return wakeup_cause
+
+    def run(self) -> None:
+        """Runs the notification checker for the profiles which no other running notification manager schedules"""
+        if self.profiles is None:
+            self.profiles = AccountProfile.load_all()
+        self.check_and_handle_existing_instance()
+        self.profiles = self.claim_profiles(self.profiles)
+        try:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            loop.run_until_complete(self.notification_checker())
+        finally:
+            self.cleanup()
+
+    def check_and_handle_existing_instance(self) -> None:
+        """
+        Checks if a notification manager was already started for the profile of the window, e.g. one which kept
+        running in the background, and kills it if it is. A notification manager started for another profile
+        is left running, it keeps scheduling the profiles it claimed.
+        """
+        lock = self.read_lock_file(AccountProfile.named(ACTIVE_PROFILE_NAME))
+        if lock is None:
+            return
+        old_pid, old_profile_name = lock
+        if old_profile_name != ACTIVE_PROFILE_NAME or old_pid == os.getpid():
+            return
+        if self.is_process_running(old_pid):
+            self.terminate_process(old_pid)
+        else:
+            SCHEDULER_LOGGER.info("No existing process with PID %d found", old_pid)
+
+    @staticmethod
+    def read_lock_file(profile: AccountProfile) -> tuple[int, str] | None:
+        """
+        :param profile: The profile to read the lock file of
+        :return: The PID of the process which schedules the profile and the profile it was started for, None if the profile isn't locked
+        """
+        try:
+            with open(profile.lock_file_path, "r") as file:
+                lock = json.loads(file.read())
+            # Older versions only wrote the PID, and only ran for the default profile
+            if isinstance(lock, int):
+                return lock, DEFAULT_PROFILE_NAME
+            return int(lock["pid"]), str(lock["profile"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError):
+            SCHEDULER_LOGGER.warning(
+                "Lock file %s does not contain a valid PID. It may be corrupted or manually edited.",
+                profile.lock_file_path,
+            )
+            return None
+        except OSError as e:
+            SCHEDULER_LOGGER.error(
+                "An error occurred while handling the lock file: %s", e
+            )
+            return None
+
+    def claim_profiles(self, profiles: list[AccountProfile]) -> list[AccountProfile]:
+        """
+        Writes the PID of this process to the lock files of the profiles which no other running notification
+        manager schedules. The other profiles stay with the process which claimed them, so opening the window
+        of a second profile doesn't close the first one or send its notifications twice, and they are claimed
+        once that process releases them.
+
+        :param profiles: The profiles to claim
+        :return: The claimed profiles
+        """
+        claimed = []
+        self.unclaimed_profiles = []
+        for profile in profiles:
+            lock = self.read_lock_file(profile)
+            if (
+                lock is not None
+                and lock[0] != os.getpid()
+                and self.is_process_running(lock[0])
+            ):
+                SCHEDULER_LOGGER.info(
+                    "Profile %s is scheduled by the process with PID %d",
+                    profile.name,
+                    lock[0],
+                )
+                self.unclaimed_profiles.append(profile)
+                continue
+            self.create_lock_file(profile)
+            claimed.append(profile)
+        return claimed
+
+    def claim_released_profiles(self) -> None:
+        """Starts scheduling the profiles which the process that scheduled them released since the last check"""
+        if not self.unclaimed_profiles:
+            return
+        for profile in self.claim_profiles(self.unclaimed_profiles):
+            SCHEDULER_LOGGER.info("Taking over profile %s", profile.name)
+            self.profiles.append(profile)
+            self.start_profile(profile)
+
+    def is_process_running(self, pid):
+        """Check if a process with the given PID is still running."""
+        try:
+            p = psutil.Process(pid)
+            return p.is_running()
+        except psutil.NoSuchProcess:
+            return False
+
+    def terminate_process(self, pid):
+        """Terminate the process with the given PID."""
+        try:
+            p = psutil.Process(pid)
+            p.terminate()  # Sends a SIGTERM
+            p.wait()  # Wait for the process to terminate
+            SCHEDULER_LOGGER.info(
+                "Successfully terminated the process with PID %d", pid
+            )
+        except psutil.NoSuchProcess:
+            SCHEDULER_LOGGER.info("No process found with PID %d", pid)
+        except psutil.AccessDenied:
+            SCHEDULER_LOGGER.warning(
+                "Access denied when trying to terminate the process with PID %d", pid
+            )
+        except Exception as e:
+            SCHEDULER_LOGGER.error(
+                "Failed to terminate the process with PID %d: %s", pid, e
+            )
+
+    def create_lock_file(self, profile: AccountProfile) -> None:
+        """
+        Creates the lock file of a profile, which prevents other notification managers from scheduling it
+
+        :param profile: The profile to lock
+        """
+        write_file_atomically(
+            profile.lock_file_path,
+            json.dumps({"pid": os.getpid(), "profile": ACTIVE_PROFILE_NAME}),
+        )
+
+    def remove_lock_files(self) -> None:
+        """Removes the lock files of the profiles this process scheduled, so another notification manager can claim them"""
+        for profile in self.profiles or []:
+            lock = self.read_lock_file(profile)
+            if lock is not None and lock[0] == os.getpid():
+                try:
+                    os.remove(profile.lock_file_path)
+                except FileNotFoundError:
+                    pass
+
+    def cleanup(self) -> None:
+        """Cleans up the lock files and the notification backends, and sets the self.running flag to False"""
+        self.remove_lock_files()
+        self.close_profiles()
+        self.running = False
+
+    def close_profiles(self) -> None:
+        """Delivers the queued notifications of every profile before the backends and the outboxes get closed"""
+        if self.clock_change_watcher is not None:
+            self.clock_change_watcher.close()
+            self.clock_change_watcher = None
+        for delivery_worker in self.delivery_workers.values():
+            delivery_worker.stop()
+        for delivery_worker in self.delivery_workers.values():
+            delivery_worker.backend.close()
+        for profile_notifier in self.profile_notifiers.values():
+            profile_notifier.close()
+
+
+class AllianceStore:
+    """
+    Persistent store of the alliance timer server. Every change is appended to a JSON lines file and synced
+    to the disk before the server answers, so a crash loses nothing, and the file is rewritten with one
+    snapshot of every player when the server starts, so it doesn't keep growing.
+    """
+
+    def __init__(self, path: Path):
+        """
+        :param path: The path of the store file
+        """
+        self.path = Path(path)
+        self.file = None
+
+    def load(self) -> dict[str, dict]:
+        """
+        Replays the store file
+
+        :return: The state of every player: its webhook url, tasks and last notifications
+        """
+        players = {}
+        if not self.path.exists():
+            return players
+        with open(self.path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Only the last line can be cut off by a crash
+                    STORAGE_LOGGER.warning(
+                        "Skipping line %d of the alliance store, which isn't valid JSON",
+                        line_number,
+                    )
+                    continue
+                self.apply(players, record)
+        return players
+
+    @staticmethod
+    def apply(players: dict[str, dict], record: dict) -> None:
+        """
+        Applies one record of the store file to the state of the players
 
-    def process_notification(
-        self,
-        *,
-        item: str | None = None,
-        section: str | None = None,
-        task_info: str | None = None,
-    ) -> None:
+        :param players: The state of every player, as returned by load()
+        :param record: The record
         """
-        Checks if the notification is send before and sends it if it isn't.
+        player = players.setdefault(
+            record["player"],
+            {
+                "webhook_url": None,
+                "tasks": {section: {} for section in TASK_CLASSES},
+                "notifications": [],
+            },
+        )
+        operation = record["operation"]
+        if operation == "player":
+            player["webhook_url"] = record["webhook_url"]
+        elif operation == "add":
+            player["tasks"][record["section"]][record["task_id"]] = TASK_CLASSES[
+                record["section"]
+            ].from_dict(record["task_info"])
+        elif operation == "finish":
+            task = player["tasks"][record["section"]].get(record["task_id"])
+            if task is not None:
+                task.cooldown_finished = True
+        elif operation == "remove":
+            player["tasks"][record["section"]].pop(record["task_id"], None)
+        elif operation == "notification":
+            player["notifications"].append(record["notification"])
+
+    def compact(self, players: dict[str, dict], kept_notifications: int) -> None:
+        """
+        Replaces the store file with one snapshot of every player, and opens it for appending
 
-        :param item: The item to check (e.g. "star_battery", "tool_case", "helmet")
-        :param section: The section of the task to check (e.g. "workers", "buildings")
-        :param task_info: The information of a task_id
+        :param players: The state of every player
+        :param kept_notifications: The amount of notifications which are kept per player
         """
-        if (
-            section is not None
-            and task_info is not None
-            and self.global_settings[section]
-            and not self.first_iteration
-            and not task_info["cooldown_finished"]
-        ):
-            planet = (
-                "your Main Planet"
-                if task_info["planet"] == "Main Planet"
-                else task_info["planet"]
-            )
-            building = task_info["building"] if section == "buildings" else None
-
-            if self.global_settings["unique_messages"]:
-                if section == "workers":
-                    messages = {
-                        f"I'm finished on {planet}, Chief!": None,
-                        f"I'm done. Check out my beautiful work on {planet}!": None,
-                        f"I'm finished on {planet}, I hope you like it!": None,
-                        f"I'm done, {planet} looks even better now!": None,
-                        f"I've completed my task on {planet}, Chief!": None,
-                        f"I finished my task on {planet}. I'm ready for the next one!": None,
-                        f"I've worked tirelessly on {planet}, Chief. I don't need any sleep!": None,
-                        f"I worked for so long on {planet}, I wonder how I'm still not buffed!": None,
+        with open_atomically(self.path, encoding="utf-8") as file:
+            for player_name, player in players.items():
+                records = [
+                    {
+                        "operation": "player",
+                        "player": player_name,
+                        "webhook_url": player["webhook_url"],
                     }
-                    if self.global_settings["unique_icons"]:
-                        message_firebit = f"I see your worker has finished upgrading on {planet}. I can't wait to see my army lay that building in ruin!"
-                        message_elderby = f"Your worker on {planet} is done, young Starling. Your base has matured greatly since I've last seen it!"
-                        messages.update(
-                            {
-                                message_firebit: 0.01,
-                                message_elderby: 0.01,
-                            }
-                        )
-
-                elif section == "buildings" and building == "Laboratory":
-                    messages = {
-                        f"Your upgraded unit on {planet} is done!": None,
-                        f"I've finished upgrading your unit on {planet}, Chief!": None,
-                        f"I've made a unit on {planet} even stronger, and you can use him now!": None,
+                ]
+                records += [
+                    {
+                        "operation": "add",
+                        "player": player_name,
+                        "section": section,
+                        "task_id": task_id,
+                        "task_info": task.to_dict(),
                     }
-                    if self.global_settings["unique_icons"]:
-                        message_firebit = f"I see you upgraded a unit on {planet}. Don't be happy about it, you still won't stand a chance against me!"
-                        message_elderby = f"Your unit on {planet} has been upgraded, young Starling. Its power looks even more terrific than before!"
-                        messages.update(
-                            {
-                                message_firebit: 0.02,
-                                message_elderby: 0.02,
-                            }
-                        )
+                    for section, tasks in player["tasks"].items()
+                    for task_id, task in tasks.items()
+                ]
+                records += [
+                    {
+                        "operation": "notification",
+                        "player": player_name,
+                        "notification": notification,
+                    }
+                    for notification in player["notifications"][-kept_notifications:]
+                ]
+                file.write("".join(json.dumps(record) + "\n" for record in records))
+        self.file = open(self.path, "a", encoding="utf-8")
 
-                message = self.randomly_choose_option(messages)
+    def append(self, *records: dict) -> None:
+        """
+        Appends changes to the store file, and waits until they are on the disk. The changes of one request or
+        one wakeup of the scheduler are appended together, so they share one sync.
 
-            else:
-                message = f"Your {building if section == 'buildings' else 'Worker'} on {planet} is done!"
+        :param records: The changes, with at least the "operation" and "player" keys
+        """
+        self.file.write("".join(json.dumps(record) + "\n" for record in records))
+        self.file.flush()
+        os.fsync(self.file.fileno())
 
-            if self.global_settings["unique_icons"]:
-                if section == "workers":
-                    icon_images = {
-                        "Worker.ico": None,
-                        "Worker_Happy.ico": None,
-                    }
-                elif section == "buildings":
-                    if building == "Laboratory" or building == "Refinery":
-                        icon_images = {
-                            "Chubi.ico": None,
-                            "Chubi_Happy.ico": None,
-                        }
-                    elif building in ["Training Camp", "Factory", "StarPort"]:
-                        icon_images = {
-                            "Major_Wor.ico": None,
-                            "Major_Wor_Happy.ico": None,
-                        }
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
 
-                # Check if the message matches special cases and assign directly
-                if message == message_firebit:
-                    icon_image = "Firebit.ico"
-                elif message == message_elderby:
-                    icon_image = "Elderby.ico"
-                else:
-                    # Only choose randomly if icon_images is set and not in special message cases
-                    if icon_images is not None:
-                        icon_image = self.randomly_choose_option(icon_images)
-                    else:
-                        raise ValueError(
-                            "No values were assigned to the icon_images dictionary"
-                        )
-            else:
-                icon_image = "Starling_Postman_AI_Upscaled.ico"
 
-            self.send_notification(message, icon_image)
+class ShardedDeadlineScheduler:
+    """
+    The deadlines of all players, split over several deadline heaps by player. A change of a player only
+    touches the heap of its shard, and the skipped entries are compacted per shard, so the cost of a
+    change doesn't grow with the size of the whole alliance.
+    """
 
-        if (
-            item is not None
-            and self.global_settings[item]
-            and not self.first_iteration
-            and not self.data[item]["cooldown_finished"]
-        ):
-            message = f"You can collect your {item.replace('_', ' ').title()} again!"
-            self.send_notification(message, icon_image)
+    def __init__(self, shards: int = 16):
+        """
+        :param shards: The amount of deadline heaps
+        """
+        self.shards = [DeadlineHeap() for _ in range(shards)]
 
-    def randomly_choose_option(self, options: dict[str, float | None]) -> str:
+    def get_shard(self, player: str) -> DeadlineHeap:
         """
-        Randomly chooses an option. Probabilities get automatically calculated.
+        :param player: The name of the player
+        :return: The deadline heap of the player
+        """
+        return self.shards[hash(player) % len(self.shards)]
 
-        :param options: The list of options. An option can be passed with a custom probability of type float. If you don't want a custom probability for that option, pass None
-        :return: The chosen option
+    def update(
+        self, player: str, section: str, task_id: str, task: Task | None
+    ) -> None:
         """
-        total_specified_prob = sum(
-            prob for prob in options.values() if prob is not None
-        )
-        unspecified_options = [msg for msg, prob in options.items() if prob is None]
-        num_unspecified = len(unspecified_options)
-        if num_unspecified > 0:
-            regular_probability = (1.0 - total_specified_prob) / num_unspecified
-            for msg in unspecified_options:
-                options[msg] = regular_probability
+        Schedules, reschedules or unschedules a task
 
-        options, probabilities = zip(*options.items())
-        return random.choices(options, probabilities)[0]
+        :param player: The name of the player
+        :param section: The section of the task (e.g. "workers", "buildings")
+        :param task_id: The id of the task
+        :param task: The task, None when it was removed
+        """
+        self.get_shard(player).update({(player, section, task_id): task})
 
-    def send_notification(self, message: str, icon_image: str) -> None:
+    def next_deadline(self) -> float | None:
+        """
+        :return: The POSIX timestamp of the earliest deadline of all shards, None if nothing is scheduled
         """
-        Sends the notification using winotify.
+        return min(
+            (
+                deadline
+                for deadline in (shard.next_deadline() for shard in self.shards)
+                if deadline is not None
+            ),
+            default=None,
+        )
 
-        :param message: The message to be displayed in the notification
-        :param icon_image: The icon to be displayed in the notification
+    def pop_expired(
+        self, current_time: float
+    ) -> list[tuple[float, tuple[str, str, str]]]:
         """
-        title = "Galaxy Life Notifier"
-        icon_path = str(Path(MAIN_IMAGES_PATH, icon_image))
+        Removes and returns the deadlines at or before current_time of every shard
 
-        # Create a notification
-        toast = Notification(
-            app_id="Galaxy Life Notifier",
-            title=title,
-            msg=message,
-            icon=icon_path,
-            duration="short",
+        :param current_time: The current POSIX timestamp
+        :return: The deadline and (player, section, task_id) key of the expired tasks, earliest deadline first
+        """
+        return list(
+            heapq.merge(*(shard.pop_expired(current_time) for shard in self.shards))
         )
 
-        # Optionally, you can add sound to the notification
-        toast.set_audio(audio.Default, loop=False)
+    def __len__(self) -> int:
+        return sum(len(shard.deadlines) for shard in self.shards)
 
-        # Show the notification
-        toast.show()
 
-    def update_min_cooldown_time(
-        self, current_min: datetime | None, new_time: str
-    ) -> datetime:
-        new_time_datetime = datetime.fromisoformat(new_time)
-        if new_time_datetime and (
-            current_min is None or new_time_datetime < current_min
-        ):
-            return new_time_datetime
-        return current_min
+class AllianceTimerServer:
+    """
+    Schedules the tasks of a whole alliance in one process, with the same tasks and notification messages
+    as the notifier. Players add and remove tasks through an HTTP/JSON API, and receive the notifications of
+    their finished tasks through their webhook, by long-polling, or both.
+
+    Everything runs on one asyncio event loop: the connections, one timer for all deadlines and the
+    webhook deliveries, which run on worker threads.
+    """
 
-    def cooldown_finished(
+    MAX_BODY_SIZE = 64 * 1024
+    PLAYER_NAME_PATTERN = re.compile(r"[\w\- ]{1,64}")
+
+    def __init__(
         self,
-        *,
-        item: str | None = None,
-        section: str | None = None,
-        task_id: str | None = None,
-    ) -> None:
+        server_settings: dict,
+        global_settings: dict,
+        language: str,
+        clock: Clock | None = None,
+    ):
         """
-        Changes the cooldown_finished parameter to true in data.json for the given section and task_id
+        :param server_settings: The "alliance_server_settings" section of settings.json
+        :param global_settings: The "global_settings" section of settings.json, for the message settings
+        :param language: The language of the notification messages
+        :param clock: The clock to schedule the tasks with, by default the real time
+        """
+        self.clock = clock or SystemClock()
+        self.server_settings = server_settings
+        self.global_settings = global_settings
+        self.catalog = NotificationCatalog(language)
+        self.store = AllianceStore(Path(MAIN_PATH, server_settings["store_file"]))
+        self.scheduler = ShardedDeadlineScheduler(server_settings["shards"])
+        self.players = {}
+        # player: the sequence number of the next notification of the player
+        self.next_sequences = {}
+        # player: asyncio.Event which is set when the player gets a new notification
+        self.notification_events = {}
+        self.wake_event = None
+        self.server = None
+        self.scheduler_task = None
+        self.delivery_semaphore = None
+        # webhook url: WebhookBackend, so the connections to a webhook are reused
+        self.webhook_backends = {}
+        self.routes = [
+            ("GET", ("health",), self.get_health),
+            ("GET", ("metrics",), self.get_metrics),
+            ("GET", ("players", None, "tasks"), self.get_tasks),
+            ("POST", ("players", None, "workers"), self.add_task),
+            ("POST", ("players", None, "buildings"), self.add_task),
+            ("DELETE", ("players", None, "workers", None), self.remove_task),
+            ("DELETE", ("players", None, "buildings", None), self.remove_task),
+            ("PUT", ("players", None, "webhook"), self.set_webhook),
+            ("GET", ("players", None, "notifications"), self.get_notifications),
+        ]
+
+    async def start(self) -> None:
+        """Loads the store, schedules the unfinished tasks and starts listening"""
+        self.players = self.store.load()
+        if self.server_settings["auto_delete_completed_tasks"]:
+            for player in self.players.values():
+                MainWindow.remove_finished_tasks(player["tasks"])
+        self.store.compact(self.players, self.server_settings["kept_notifications"])
+        for player_name, player in self.players.items():
+            for section, tasks in player["tasks"].items():
+                for task_id, task in tasks.items():
+                    self.scheduler.update(player_name, section, task_id, task)
+            self.next_sequences[player_name] = 1 + max(
+                (notification["sequence"] for notification in player["notifications"]),
+                default=0,
+            )
+        self.catalog.reload_if_changed()
+
+        self.wake_event = asyncio.Event()
+        self.delivery_semaphore = asyncio.Semaphore(
+            self.server_settings["delivery_concurrency"]
+        )
+        self.server = await asyncio.start_server(
+            self.handle_connection,
+            self.server_settings["host"],
+            self.server_settings["port"],
+        )
+        self.scheduler_task = asyncio.create_task(self.run_scheduler())
+        SERVER_LOGGER.info(
+            "Alliance timer server listening on http://%s:%d with %d player(s) and %d timer(s)",
+            self.server_settings["host"],
+            self.port,
+            len(self.players),
+            len(self.scheduler),
+        )
+
+    @property
+    def port(self) -> int:
+        """The port the server listens on, which is chosen by the system when port 0 was configured"""
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stops listening and scheduling, and closes the store"""
+        if self.scheduler_task is not None:
+            self.scheduler_task.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        for backend in self.webhook_backends.values():
+            backend.close()
+        self.store.close()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def run_scheduler(self) -> None:
+        """Sleeps until the next deadline of any player, and notifies about the finished tasks"""
+        while True:
+            current_time = self.clock.time()
+            finished = {}
+            for deadline, (player, section, task_id) in self.scheduler.pop_expired(
+                current_time
+            ):
+                METRICS.observe("deadline_latency_seconds", current_time - deadline)
+                finished.setdefault(player, []).append((section, task_id))
+            for player, keys in finished.items():
+                self.tasks_finished(player, keys)
+
+            next_deadline = self.scheduler.next_deadline()
+            # Never sleep longer than a minute, so a changed system clock is noticed
+            timeout = 60
+            if next_deadline is not None:
+                timeout = min(max(next_deadline - self.clock.time(), 0), timeout)
+            sleep_task = asyncio.ensure_future(self.clock.sleep(timeout))
+            wake_task = asyncio.ensure_future(self.wake_event.wait())
+            await asyncio.wait(
+                [sleep_task, wake_task], return_when=asyncio.FIRST_COMPLETED
+            )
+            sleep_task.cancel()
+            wake_task.cancel()
+            self.wake_event.clear()
+            METRICS.increment("alliance_scheduler_wakeups_total")
 
-        :param item: The item to mark as finished (e.g. "star_battery", "tool_case", "helmet")
-        :param section: The section of the task to mark as finished (e.g. "workers", "buildings")
-        :param task_id: The ID of the task to mark as finished
+    def tasks_finished(self, player_name: str, keys: list[tuple[str, str]]) -> None:
         """
-        data = MainWindow.load_data()
+        Marks the tasks of a player as finished and sends their notifications
 
-        if item is not None:
-            data[item]["cooldown_finished"] = True
-        if section is not None and task_id is not None:
-            data[section][task_id]["cooldown_finished"] = True
+        :param player_name: The name of the player
+        :param keys: The section and task id of every finished task
+        """
+        player = self.players[player_name]
+        notifications = []
+        records = []
+        for section, task_id in keys:
+            task = player["tasks"][section][task_id]
+            task.cooldown_finished = True
+            records.append(
+                {
+                    "operation": "finish",
+                    "player": player_name,
+                    "section": section,
+                    "task_id": task_id,
+                }
+            )
+            message, icon_image = self.catalog.choose(
+                task.task_type,
+                task.planet,
+                self.global_settings["unique_messages"],
+                self.global_settings["unique_icons"],
+            )
+            notification = {
+                "title": "Galaxy Life Notifier",
+                "message": message,
+                "icon_image": icon_image,
+                "priority": ProfileNotifier.get_task_priority(task),
+                "created_at": self.clock.now().isoformat(),
+                "sequence": self.next_sequences[player_name],
+                "section": section,
+                "task_id": task_id,
+            }
+            self.next_sequences[player_name] += 1
+            player["notifications"].append(notification)
+            records.append(
+                {
+                    "operation": "notification",
+                    "player": player_name,
+                    "notification": notification,
+                }
+            )
+            notifications.append(notification)
+        self.store.append(*records)
+        del player["notifications"][: -self.server_settings["kept_notifications"]]
+        METRICS.increment("alliance_notifications_total", len(notifications))
+
+        # Wake up the long-polls of the player
+        notification_event = self.notification_events.pop(player_name, None)
+        if notification_event is not None:
+            notification_event.set()
+        if player["webhook_url"]:
+            asyncio.create_task(
+                self.deliver_webhook(player_name, player["webhook_url"], notifications)
+            )
 
-        MainWindow.save_data(data)
+    async def deliver_webhook(
+        self, player_name: str, webhook_url: str, notifications: list[dict]
+    ) -> None:
+        """
+        Posts the notifications of a player to its webhook, on a worker thread
 
-    def run(self) -> None:
-        """Runs the notification checker"""
-        self.check_and_handle_existing_instance()
-        self.create_lock_file()
+        :param player_name: The name of the player
+        :param webhook_url: The url of the webhook of the player
+        :param notifications: The notifications to post
+        """
+        if webhook_url not in self.webhook_backends:
+            self.webhook_backends[webhook_url] = WebhookBackend(
+                webhook_url, self.server_settings["webhook_timeout"]
+            )
+        backend = self.webhook_backends[webhook_url]
+        async with self.delivery_semaphore:
+            try:
+                await asyncio.to_thread(backend.send_batch, notifications)
+                METRICS.increment(
+                    "notifications_delivered_total",
+                    len(notifications),
+                    backend="alliance_webhook",
+                )
+            except Exception as e:
+                # The notifications can still be fetched by long-polling
+                METRICS.increment(
+                    "notifications_dropped_total", backend="alliance_webhook"
+                )
+                DELIVERY_LOGGER.warning(
+                    "Failed to deliver %d notification(s) to the webhook of %s: %s",
+                    len(notifications),
+                    player_name,
+                    e,
+                )
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Handles the HTTP/1.1 requests of one connection, which is kept open between requests unless the
+        client asks to close it
+
+        :param reader: The stream to read the requests from
+        :param writer: The stream to write the responses to
+        """
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(self.notification_checker())
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                content_length = int(headers.get("content-length", 0))
+
+                if content_length > self.MAX_BODY_SIZE:
+                    status, content_type, body = (
+                        413,
+                        "application/json",
+                        {"error": "Request body too large"},
+                    )
+                    keep_alive = False
+                else:
+                    request_body = await reader.readexactly(content_length)
+                    status, content_type, body = await self.handle_request(
+                        method, target, headers, request_body
+                    )
+                    keep_alive = (
+                        version == "HTTP/1.1"
+                        and headers.get("connection", "").lower() != "close"
+                    )
+
+                if content_type == "application/json":
+                    body = json.dumps(body)
+                body = body.encode("utf-8")
+                writer.write(
+                    (
+                        f"HTTP/1.1 {status} {http.HTTPStatus(status).phrase}\r\n"
+                        f"Content-Type: {content_type}; charset=utf-8\r\n"
+                        f"Content-Length: {len(body)}\r\n"
+                        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                    ).encode("latin-1")
+                    + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            # The client disconnected or didn't speak HTTP
+            pass
         finally:
-            self.cleanup()
+            writer.close()
 
-    def check_and_handle_existing_instance(self) -> None:
-        """Checks if an instance of the notification manager is already running and kills it if it is"""
-        if os.path.exists(LOCK_FILE_PATH):
+    async def handle_request(
+        self, method: str, target: str, headers: dict, request_body: bytes
+    ) -> tuple[int, str, dict | str]:
+        """
+        Passes a request to the handler of its route
+
+        :param method: The HTTP method of the request
+        :param target: The path and query of the request
+        :param headers: The headers of the request, with lowercase names
+        :param request_body: The body of the request
+        :return: The status, content type and body of the response
+        """
+        url = urllib.parse.urlsplit(target)
+        segments = tuple(
+            urllib.parse.unquote(segment) for segment in url.path.strip("/").split("/")
+        )
+        api_token = self.server_settings["api_token"]
+        if api_token and headers.get("authorization") != f"Bearer {api_token}":
+            return 401, "application/json", {"error": "Missing or wrong API token"}
+
+        path_found = False
+        for route_method, pattern, route_handler in self.routes:
+            if len(pattern) != len(segments) or any(
+                part is not None and part != segment
+                for part, segment in zip(pattern, segments)
+            ):
+                continue
+            path_found = True
+            if route_method != method:
+                continue
+            if len(segments) > 1 and not self.PLAYER_NAME_PATTERN.fullmatch(
+                segments[1]
+            ):
+                return 400, "application/json", {"error": "Invalid player name"}
             try:
-                with open(LOCK_FILE_PATH, "r") as file:
-                    old_pid = int(file.read().strip())
-                if self.is_process_running(old_pid):
-                    self.terminate_process(old_pid)
-                else:
-                    print(f"No existing process with PID {old_pid} found.")
-            except ValueError:
-                print(
-                    "Lock file does not contain a valid PID. It may be corrupted or manually edited."
+                document = json.loads(request_body) if request_body else {}
+                if not isinstance(document, dict):
+                    raise ValueError("The request body has to be a JSON object")
+                return await route_handler(
+                    segments, urllib.parse.parse_qs(url.query), document
                 )
-            except Exception as e:
-                print(f"An error occurred while handling the lock file: {e}")
+            except (ValueError, TypeError, KeyError) as e:
+                return 400, "application/json", {"error": str(e)}
+            except Exception:
+                SERVER_LOGGER.exception("The %s %s request failed", method, url.path)
+                return 500, "application/json", {"error": "Internal error"}
+        if path_found:
+            return 405, "application/json", {"error": "Method not allowed"}
+        return 404, "application/json", {"error": "Not found"}
+
+    def get_player(self, player_name: str, create: bool = True) -> dict:
+        """
+        :param player_name: The name of the player
+        :param create: Whether to create the player when it doesn't exist yet, otherwise an empty state is returned
+        :return: The state of the player
+        """
+        if player_name not in self.players:
+            if not create:
+                return {
+                    "webhook_url": None,
+                    "tasks": {section: {} for section in TASK_CLASSES},
+                    "notifications": [],
+                }
+            self.players[player_name] = {
+                "webhook_url": None,
+                "tasks": {section: {} for section in TASK_CLASSES},
+                "notifications": [],
+            }
+            self.next_sequences[player_name] = 1
+        return self.players[player_name]
 
-    def is_process_running(self, pid):
-        """Check if a process with the given PID is still running."""
-        try:
-            p = psutil.Process(pid)
-            return p.is_running()
-        except psutil.NoSuchProcess:
-            return False
+    async def get_health(self, segments, query, document) -> tuple[int, str, dict]:
+        return (
+            200,
+            "application/json",
+            {"players": len(self.players), "timers": len(self.scheduler)},
+        )
 
-    def terminate_process(self, pid):
-        """Terminate the process with the given PID."""
-        try:
-            p = psutil.Process(pid)
-            p.terminate()  # Sends a SIGTERM
-            p.wait()  # Wait for the process to terminate
-            print(f"Successfully terminated the process with PID {pid}.")
-        except psutil.NoSuchProcess:
-            print(f"No process found with PID {pid}.")
-        except psutil.AccessDenied:
-            print(f"Access denied when trying to terminate the process with PID {pid}.")
-        except Exception as e:
-            print(f"Failed to terminate the process with PID {pid}: {e}")
+    async def get_metrics(self, segments, query, document) -> tuple[int, str, str]:
+        return 200, "text/plain", METRICS.render()
+
+    async def get_tasks(self, segments, query, document) -> tuple[int, str, dict]:
+        """GET /players/{player}/tasks: the tasks of the player, per section"""
+        player = self.get_player(segments[1], create=False)
+        return (
+            200,
+            "application/json",
+            {
+                section: {task_id: task.to_dict() for task_id, task in tasks.items()}
+                for section, tasks in player["tasks"].items()
+            },
+        )
+
+    async def add_task(self, segments, query, document) -> tuple[int, str, dict]:
+        """
+        POST /players/{player}/workers or /players/{player}/buildings: adds a task, with the same checks and
+        task ids as the main window. The body has the "planet", "hours" and "minutes" of the task, the
+        "building" of a buildings task and optionally "instant_build_time" for a workers task.
+        """
+        player_name, section = segments[1], segments[2]
+        new_task = MainWindow.create_task(section, document, self.clock.now())
+        player = self.get_player(player_name)
+        task_id = MainWindow.add_task(player["tasks"], new_task)
+        self.store.append(
+            {
+                "operation": "add",
+                "player": player_name,
+                "section": section,
+                "task_id": task_id,
+                "task_info": new_task.to_dict(),
+            }
+        )
+        self.scheduler.update(player_name, section, task_id, new_task)
+        self.wake_event.set()
+        METRICS.increment("alliance_tasks_added_total", section=section)
+        return 201, "application/json", {"task_id": task_id, **new_task.to_dict()}
+
+    async def remove_task(self, segments, query, document) -> tuple[int, str, dict]:
+        """DELETE /players/{player}/{section}/{task_id}: removes a task"""
+        player_name, section, task_id = segments[1], segments[2], segments[3]
+        player = self.get_player(player_name, create=False)
+        if not MainWindow.remove_task(player["tasks"], section, task_id):
+            return 404, "application/json", {"error": f"No {section} task {task_id}"}
+        self.store.append(
+            {
+                "operation": "remove",
+                "player": player_name,
+                "section": section,
+                "task_id": task_id,
+            }
+        )
+        self.scheduler.update(player_name, section, task_id, None)
+        return 200, "application/json", {"removed": task_id}
+
+    async def set_webhook(self, segments, query, document) -> tuple[int, str, dict]:
+        """PUT /players/{player}/webhook: sets the "url" the notifications of the player are posted to, null to stop posting"""
+        player_name = segments[1]
+        webhook_url = document["url"]
+        if webhook_url is not None and urllib.parse.urlsplit(
+            webhook_url
+        ).scheme not in ("http", "https"):
+            raise ValueError("The webhook url has to be an http or https url")
+        self.get_player(player_name)["webhook_url"] = webhook_url
+        self.store.append(
+            {"operation": "player", "player": player_name, "webhook_url": webhook_url}
+        )
+        return 200, "application/json", {"url": webhook_url}
+
+    async def get_notifications(
+        self, segments, query, document
+    ) -> tuple[int, str, dict]:
+        """
+        GET /players/{player}/notifications?after=SEQUENCE&timeout=SECONDS: the notifications of the player
+        after the given sequence number. When there are none yet, the request waits up to timeout seconds
+        for the next one.
+        """
+        player_name = segments[1]
+        after = int(query.get("after", ["0"])[0])
+        timeout = min(
+            float(query.get("timeout", [self.server_settings["long_poll_timeout"]])[0]),
+            self.server_settings["long_poll_timeout"],
+        )
+        player = self.get_player(player_name, create=False)
+        if (
+            not any(
+                notification["sequence"] > after
+                for notification in player["notifications"]
+            )
+            and timeout > 0
+        ):
+            notification_event = self.notification_events.setdefault(
+                player_name, asyncio.Event()
+            )
+            try:
+                await asyncio.wait_for(notification_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        # The player may have been created while waiting
+        player = self.get_player(player_name, create=False)
+        notifications = [
+            notification
+            for notification in player["notifications"]
+            if notification["sequence"] > after
+        ]
+        return (
+            200,
+            "application/json",
+            {
+                "notifications": notifications,
+                "next": max(
+                    (notification["sequence"] for notification in notifications),
+                    default=after,
+                ),
+            },
+        )
 
-    def create_lock_file(self) -> None:
-        """Creates a lock file to prevent multiple instances of the notification manager from running"""
-        with open(LOCK_FILE_PATH, "w") as lock_file:
-            lock_file.write(str(os.getpid()))  # Write the current PID
 
-    def cleanup(self) -> None:
-        """Cleans up the lock file and sets the self.running flag to False"""
-        if os.path.exists(LOCK_FILE_PATH):
-            os.remove(LOCK_FILE_PATH)
-        self.running = False
+def run_alliance_server(settings: dict, clock: Clock | None = None) -> None:
+    """
+    Runs the alliance timer server until the process is stopped
+
+    :param settings: All the settings from settings.json
+    :param clock: The clock to schedule the tasks with, by default the real time
+    """
+    alliance_server = AllianceTimerServer(
+        settings["alliance_server_settings"],
+        settings["global_settings"],
+        settings["notification_settings"]["language"],
+        clock,
+    )
+    try:
+        asyncio.run(alliance_server.serve_forever())
+    except KeyboardInterrupt:
+        SERVER_LOGGER.info("Alliance timer server stopped")
 
 
 class ColorSettings(ctk.CTkToplevel):
@@ -409,7 +4941,7 @@ class ColorSettings(ctk.CTkToplevel):
         color_palette = MainWindow.load_color_palette()
 
         image_color_picker = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "color_palette.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "color_palette.png")),
             size=(25, 25),
         )
 
@@ -777,7 +5309,7 @@ class ColorSettings(ctk.CTkToplevel):
             color_palette[color_name] = hex_color_value
             MainWindow.save_color_palette(color_palette)
 
-            print(f"Color '{color_name}' set to '{hex_color_value}'")
+            UI_LOGGER.debug("Color '%s' set to '%s'", color_name, hex_color_value)
             self.color_changed = True
 
             self.color_entries[color_name].configure(border_color="#28e326")
@@ -792,7 +5324,9 @@ class ColorSettings(ctk.CTkToplevel):
         :return: True if the color value is valid hex color code, False otherwise
         """
         if not re.match(r"^#([A-Fa-f0-9]{3}){1,2}$", color_value):
-            print("Invalid color value. Color must be a hex code of 3 or 6 characters.")
+            UI_LOGGER.warning(
+                "Invalid color value. Color must be a hex code of 3 or 6 characters."
+            )
             return False
         else:
             return True
@@ -831,7 +5365,7 @@ class GlobalSettings(ctk.CTkToplevel):
         super().__init__()
 
         self.title("Global Settings")
-        self.geometry("700x700")
+        self.geometry("700x820")
         self.attributes("-topmost", True)
 
         self.create_window_elements()
@@ -846,7 +5380,7 @@ class GlobalSettings(ctk.CTkToplevel):
         self.checkboxes = {}
 
         frame_global_settings = ctk.CTkFrame(self)
-        frame_global_settings.place(relx=0.25, rely=0.1, relwidth=0.5, relheight=0.3)
+        frame_global_settings.place(relx=0.25, rely=0.1, relwidth=0.5, relheight=0.28)
 
         frame_global_settings.columnconfigure(1, weight=3)
         frame_global_settings.columnconfigure(2, weight=1)
@@ -947,7 +5481,7 @@ class GlobalSettings(ctk.CTkToplevel):
         # Miscellaneous settings
         frame_miscellaneous_settings = ctk.CTkFrame(self)
         frame_miscellaneous_settings.place(
-            relx=0.05, rely=0.45, relwidth=0.9, relheight=0.5
+            relx=0.05, rely=0.41, relwidth=0.9, relheight=0.43
         )
 
         frame_miscellaneous_settings.columnconfigure(1, weight=5)
@@ -1110,6 +5644,58 @@ class GlobalSettings(ctk.CTkToplevel):
 
         self.checkboxes["show_command_window"] = checkbox_show_command_window
 
+        # Profiling (debug), which isn't saved in settings.json
+        frame_profiling = ctk.CTkFrame(self)
+        frame_profiling.place(relx=0.05, rely=0.86, relwidth=0.9, relheight=0.12)
+
+        for i in range(1, 5):
+            frame_profiling.columnconfigure(i, weight=1)
+        for i in range(1, 3):
+            frame_profiling.rowconfigure(i, weight=1)
+
+        profiling_title = ctk.CTkLabel(
+            frame_profiling, text="Profiling (Debug)", font=("Arial", 16)
+        )
+        profiling_title.grid(row=1, column=1)
+
+        self.combobox_profiling_mode = ctk.CTkComboBox(
+            frame_profiling,
+            width=110,
+            state="readonly",
+            values=ProfilerController.PROFILING_MODES,
+        )
+        self.combobox_profiling_mode.set(ProfilerController.PROFILING_MODES[0])
+        self.combobox_profiling_mode.grid(row=2, column=1)
+
+        self.profiling_buttons = {}
+        for column, (thread_name, thread_label) in enumerate(
+            [("notifier", "Notifier"), ("ui", "UI")], start=2
+        ):
+            button_profiling = ctk.CTkButton(
+                frame_profiling,
+                text="",
+                font=("Arial", 14),
+                fg_color=MAIN_FG_COLOR,
+                hover_color=MAIN_HOVER_COLOR,
+                command=lambda thread_name=thread_name: self.toggle_profiling(
+                    thread_name
+                ),
+            )
+            button_profiling.grid(row=2, column=column)
+            self.profiling_buttons[thread_name] = (button_profiling, thread_label)
+
+        button_memory_snapshot = ctk.CTkButton(
+            frame_profiling,
+            text="Memory Snapshot",
+            font=("Arial", 14),
+            fg_color=MAIN_FG_COLOR,
+            hover_color=MAIN_HOVER_COLOR,
+            command=PROFILER.take_memory_snapshot,
+        )
+        button_memory_snapshot.grid(row=2, column=4)
+
+        self.update_profiling_buttons()
+
     def set_checkbox_states(self):
         """Sets the state of the checkboxes to its corresponding value in settings.json without triggering commands."""
         settings = MainWindow.load_settings()
@@ -1128,6 +5714,7 @@ class GlobalSettings(ctk.CTkToplevel):
             settings["global_settings"][setting_key] = not current_value
             # Save the settings
             MainWindow.save_settings(settings)
+            main_window.wake_notification_manager("settings_changed")
 
             # Shows or hides the command window when that setting is changed
             if setting_key == "show_command_window":
@@ -1135,6 +5722,27 @@ class GlobalSettings(ctk.CTkToplevel):
                     "show" if settings["global_settings"][setting_key] else "hide"
                 )
 
+    def toggle_profiling(self, thread_name: str) -> None:
+        """
+        Starts or stops profiling a thread, the result is written to the Profiling folder
+
+        :param thread_name: The name of the thread to profile (e.g. "notifier", "ui")
+        """
+        try:
+            if PROFILER.is_profiling(thread_name):
+                PROFILER.stop(thread_name)
+            else:
+                PROFILER.start(thread_name, self.combobox_profiling_mode.get())
+        except ValueError:
+            UI_LOGGER.exception("Couldn't toggle the profiling of %s", thread_name)
+        self.update_profiling_buttons()
+
+    def update_profiling_buttons(self) -> None:
+        """Shows on the profiling buttons whether they start or stop profiling"""
+        for thread_name, (button, thread_label) in self.profiling_buttons.items():
+            action = "Stop" if PROFILER.is_profiling(thread_name) else "Profile"
+            button.configure(text=f"{action} {thread_label}")
+
 
 class PlanetsSettings(ctk.CTkToplevel):
     def __init__(self):
@@ -1196,7 +5804,7 @@ class PlanetsSettings(ctk.CTkToplevel):
                     self.planet = self.planet.replace(".png", "_greyscale.png")
 
                 image_planet = ctk.CTkImage(
-                    Image.open(
+                    open_image(
                         Path(
                             PLANETS_IMAGES_PATH,
                             self.planet,
@@ -1269,7 +5877,7 @@ class PlanetsSettings(ctk.CTkToplevel):
             if planet_image:
                 image_path = Path(PLANETS_IMAGES_PATH, planet_image)
                 if image_path.is_file():  # Check if the path points to a file
-                    image_planet = ctk.CTkImage(Image.open(image_path), size=(40, 40))
+                    image_planet = ctk.CTkImage(open_image(image_path), size=(40, 40))
                     label_image_planet.configure(image=image_planet)
         else:
             # Switch is off
@@ -1281,7 +5889,7 @@ class PlanetsSettings(ctk.CTkToplevel):
                 grey_image_path = Path(PLANETS_IMAGES_PATH, planet_image_grey)
                 if grey_image_path.is_file():  # Check if the path points to a file
                     grey_image_planet = ctk.CTkImage(
-                        Image.open(grey_image_path), size=(40, 40)
+                        open_image(grey_image_path), size=(40, 40)
                     )
                     label_image_planet.configure(image=grey_image_planet)
 
@@ -1303,17 +5911,36 @@ class PlanetsSettings(ctk.CTkToplevel):
 
         # Display the image
         image_planet = ctk.CTkImage(
-            Image.open(Path(PLANETS_IMAGES_PATH, planet)), size=(40, 40)
+            open_image(Path(PLANETS_IMAGES_PATH, planet)), size=(40, 40)
         )
         self.switches_and_comboboxes[colony][1].configure(image=image_planet)
 
 
 class MainWindow(ctk.CTk):
-    def __init__(self):
+    # How often the Tk thread runs the calls which other threads queued, in milliseconds
+    ui_call_interval = 50
+
+    def __init__(self, clock: Clock | None = None):
+        """
+        :param clock: The clock to set and display the cooldowns with, by default the real time
+        """
         super().__init__()
+        self.clock = clock or SystemClock()
+        self.notification_manager = None
+        # What is shown, so a change in data.json only updates the items and rows which changed
+        self.displayed_items = {}
+        self.displayed_tasks = {}
+        self.task_cooldown_labels = {}
+        self.planets_settings = None
+        # Calls from other threads, which may not use Tk themselves
+        self.ui_calls = queue.Queue()
 
     def run(self):
-        self.title("Galaxy Life Notifier")
+        self.title(
+            "Galaxy Life Notifier"
+            if ACTIVE_PROFILE_NAME == DEFAULT_PROFILE_NAME
+            else f"Galaxy Life Notifier ({ACTIVE_PROFILE_NAME})"
+        )
         self.geometry("1600x1000")
 
         # Check if the command window needs to be shown or hidden
@@ -1323,10 +5950,86 @@ class MainWindow(ctk.CTk):
         )
 
         self.create_window_elements()
+        self.process_ui_calls()
+        # The profiling controls run cProfile on the Tk thread through the queue of call_in_ui_thread(),
+        # as Tk can't be called from the thread of the local server
+        PROFILER.register_thread("ui", threading.get_ident(), self.call_in_ui_thread)
+        PROFILER.start_from_environment("ui")
+
+        # Changes made by other programs are shown right away, on the Tk thread
+        self.planets_settings = settings["planets_settings"]
+        FILE_WATCHER.watch(
+            DATA_FILE_PATH,
+            lambda path: self.call_in_ui_thread(self.on_data_file_changed),
+        )
+        FILE_WATCHER.watch(
+            SETTINGS_FILE_PATH,
+            lambda path: self.call_in_ui_thread(self.on_settings_file_changed),
+        )
         self.start_notification_manager()
 
+    def call_in_ui_thread(
+        self, function: Callable[[], object]
+    ) -> concurrent.futures.Future:
+        """
+        Runs a function on the Tk thread. Can be called from any thread.
+
+        :param function: The function to run
+        :return: A future with the result or exception of the function
+        """
+        future = concurrent.futures.Future()
+        self.ui_calls.put((function, future))
+        return future
+
+    def process_ui_calls(self) -> None:
+        """Runs the calls which other threads queued with call_in_ui_thread(), and checks again later"""
+        while True:
+            try:
+                function, future = self.ui_calls.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(function())
+            except Exception as e:
+                future.set_exception(e)
+        self.after(self.ui_call_interval, self.process_ui_calls)
+
+    def tasks_route(self, request_body: bytes, query: dict) -> tuple[int, str, str]:
+        """
+        POST /tasks?format=json|csv of the local server: adds a batch of tasks and items through the main window,
+        so the window is redrawn once for the whole batch
+
+        :param request_body: The batch, see parse_task_batch()
+        :param query: The query parameters of the request
+        :return: The status, content type and body of the response
+        """
+        try:
+            entries = parse_task_batch(
+                request_body.decode("utf-8"), query.get("format", ["json"])[0]
+            )
+        except ValueError as e:
+            return 400, "application/json", json.dumps({"error": str(e)})
+
+        future = self.call_in_ui_thread(lambda: self.add_tasks_batch(entries))
+        try:
+            ids = future.result(timeout=10)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            return (
+                503,
+                "application/json",
+                json.dumps({"error": "The window didn't respond"}),
+            )
+        except ValueError as e:
+            return 400, "application/json", json.dumps({"error": str(e)})
+        return 200, "application/json", json.dumps({"added": ids})
+
     def start_notification_manager(self):
-        self.notification_manager = NotificationManager()
+        self.notification_manager = NotificationManager(
+            main_window=self, clock=self.clock
+        )
 
         def run_notifier():
             asyncio.run(self.notification_manager.run())
@@ -1338,6 +6041,91 @@ class MainWindow(ctk.CTk):
         ]
         notifier_thread.start()
 
+    def on_data_file_changed(self) -> None:
+        """Updates the items and the rows of the tasks which were changed in data.json by another program"""
+        try:
+            data = self.load_data()
+        except (ValueError, KeyError):
+            UI_LOGGER.warning(
+                "Couldn't read data.json, keeping the displayed tasks", exc_info=True
+            )
+            return
+        for item in ITEMS:
+            if data[item] != self.displayed_items.get(item):
+                self.set_item_text(item)
+        self.update_task_rows(
+            "workers",
+            data["workers"],
+            self.workers_tasks_display,
+            self.set_workers_cooldown_text,
+        )
+        self.update_task_rows(
+            "buildings",
+            data["buildings"],
+            self.buildings_tasks_display,
+            self.set_buildings_cooldown_text,
+        )
+
+    def update_task_rows(
+        self,
+        section: str,
+        tasks: dict,
+        tasks_display: Callable[[], None],
+        cooldown_text: Callable[[Task], str],
+    ) -> None:
+        """
+        Updates the cooldowns of the changed tasks in their rows. The board is only redrawn when tasks were
+        added, removed, reordered or moved to another planet or building.
+
+        :param section: The section of the tasks (e.g. "workers", "buildings")
+        :param tasks: The tasks of the section in data.json
+        :param tasks_display: Redraws the board of the section
+        :param cooldown_text: Creates the cooldown text of a task
+        """
+        displayed_tasks = self.displayed_tasks.get(section, {})
+        if tasks == displayed_tasks:
+            return
+        if list(tasks) != list(displayed_tasks) or any(
+            task.planet != displayed_tasks[task_id].planet
+            or task.task_type != displayed_tasks[task_id].task_type
+            for task_id, task in tasks.items()
+        ):
+            tasks_display()
+            return
+
+        for task_id, task in tasks.items():
+            if task != displayed_tasks[task_id]:
+                self.task_cooldown_labels[section][task_id].configure(
+                    text=cooldown_text(task)
+                )
+        self.displayed_tasks[section] = tasks
+
+    def on_settings_file_changed(self) -> None:
+        """Redraws the task boards when the planets were changed in settings.json by another program"""
+        try:
+            settings = self.load_settings()
+        except (ValueError, KeyError):
+            UI_LOGGER.warning(
+                "Couldn't read settings.json, keeping the displayed planets",
+                exc_info=True,
+            )
+            return
+        if settings["planets_settings"] != self.planets_settings:
+            self.planets_settings = settings["planets_settings"]
+            self.available_planets()
+            self.workers_tasks_display()
+            self.buildings_tasks_display()
+
+    def wake_notification_manager(self, reason: str) -> None:
+        """
+        Lets the notification manager handle a change right away, instead of at the end of its sleep
+
+        :param reason: What has changed (e.g. "data_changed", "settings_changed")
+        """
+        if self.notification_manager is not None:
+            self.notification_manager.wake(reason)
+
+    @record_widget_rebuild("main_window")
     def create_window_elements(self):
         """Creates customtkinter window elements for the main window"""
         # Clear existing widgets when create_window_elements is called to redraw all elements
@@ -1357,7 +6145,7 @@ class MainWindow(ctk.CTk):
         button_issues.place(relx=0.04, rely=0.02, relwidth=0.08, relheight=0.02)
 
         main_title_image = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "Starling_Postman_AI_Upscaled.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "Starling_Postman_AI_Upscaled.png")),
             size=(75, 75),
         )
         main_title = ctk.CTkLabel(
@@ -1371,7 +6159,7 @@ class MainWindow(ctk.CTk):
 
         ## Color Settings Button
         image_button_settings_color = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "color_palette.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "color_palette.png")),
             size=(25, 25),
         )
         button_settings_color = ctk.CTkButton(
@@ -1386,7 +6174,7 @@ class MainWindow(ctk.CTk):
 
         ## Global Settings Button
         image_button_settings_global = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
             size=(25, 25),
         )
         button_settings_global = ctk.CTkButton(
@@ -1414,7 +6202,7 @@ class MainWindow(ctk.CTk):
 
         ## Items Frame Title
         image_label_items_title = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "Starlings_with_Star_Battery.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "Starlings_with_Star_Battery.png")),
             size=(90, 60),
         )
         label_items_title = ctk.CTkLabel(
@@ -1428,7 +6216,7 @@ class MainWindow(ctk.CTk):
 
         ## Star Battery
         image_star_battery = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "star_battery.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "star_battery.png")),
             size=(40, 40),
         )
         label_star_battery = ctk.CTkLabel(
@@ -1456,7 +6244,7 @@ class MainWindow(ctk.CTk):
 
         ## Tool Case
         image_tool_case = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "tool_case.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "tool_case.png")),
             size=(40, 40),
         )
         label_tool_case = ctk.CTkLabel(
@@ -1484,7 +6272,7 @@ class MainWindow(ctk.CTk):
 
         ## Helmet
         image_helmet = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "helmet.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "helmet.png")),
             size=(40, 40),
         )
         label_helmet = ctk.CTkLabel(
@@ -1528,7 +6316,7 @@ class MainWindow(ctk.CTk):
 
         ## Workers Frame Title
         image_workers_title = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "Worker.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "Worker.png")),
             size=(60, 60),
         )
         label_workers_title = ctk.CTkLabel(
@@ -1542,7 +6330,7 @@ class MainWindow(ctk.CTk):
 
         ## Planets Settings Button
         image_button_settings_planets = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
             size=(20, 20),
         )
         button_settings_planets = ctk.CTkButton(
@@ -1657,7 +6445,7 @@ class MainWindow(ctk.CTk):
 
         ## Buildings Frame Title
         image_buildings_title = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "Warp_Gate.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "Warp_Gate.png")),
             size=(60, 60),
         )
         label_buildings_title = ctk.CTkLabel(
@@ -1671,7 +6459,7 @@ class MainWindow(ctk.CTk):
 
         ## Planets Settings Button
         image_button_settings_planets = ctk.CTkImage(
-            Image.open(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
+            open_image(Path(MAIN_IMAGES_PATH, "dark_mode_options_icon.png")),
             size=(20, 20),
         )
         button_settings_planets = ctk.CTkButton(
@@ -1814,23 +6602,23 @@ class MainWindow(ctk.CTk):
         """
         try:
             data = self.load_data()
-            cooldown_date = data[item_type].get("cooldown")
-            if cooldown_date is None:
-                text = "Cooldown date not available."
-            elif self.compare_to_current_time(cooldown_date):
+            self.displayed_items[item_type] = data[item_type]
+            deadline = data[item_type].deadline
+            if deadline is None:
+                text = "Click the button when you collected this item"
+            elif self.compare_to_current_time(deadline, self.clock.time()):
                 text = (
                     "Ready to collect! (Compact Houses)"
                     if item_type == "helmet"
                     else "Ready to collect! (Help Friends)"
                 )
             else:
-                cooldown_date_datetime = datetime.fromisoformat(cooldown_date)
-                text = f"Ready on {cooldown_date_datetime:%d-%m-%Y %H:%M}"
+                text = f"Ready on {to_local_datetime(deadline):%d-%m-%Y %H:%M}"
 
             self.update_item_label(item_type, text)
 
-        except Exception as e:
-            print(f"An error occurred: {str(e)}")
+        except Exception:
+            UI_LOGGER.exception("Could not set the text of the %s", item_type)
             self.update_item_label(
                 item_type, "Click the button when you collected this item"
             )
@@ -1841,23 +6629,46 @@ class MainWindow(ctk.CTk):
 
         :param item_type: The type of the item (e.g., "star_battery", "tool_case", "helmet")
         """
-        cooldown_hours = {
-            "star_battery": 11,
-            "tool_case": 23,
-            "helmet": 35,
-        }
-        data = self.load_data()
-        if item_type in cooldown_hours:
-            hours = cooldown_hours[item_type]
-            new_time = (datetime.now() + timedelta(hours=hours)).isoformat()
+        if item_type in ITEM_COOLDOWN_HOURS:
+            hours = ITEM_COOLDOWN_HOURS[item_type]
+            with DATA_LOCK:
+                data = self.load_data()
+                data[item_type] = ItemCooldown(self.clock.time() + hours * 3600)
+                self.save_data(data)
+            self.wake_notification_manager("data_changed")
+            self.update_item_label(item_type, self.set_item_text(item_type))
+        else:
+            UI_LOGGER.warning("Cooldown hours not defined for %s", item_type)
 
-            data[item_type]["cooldown"] = new_time
-            data[item_type]["cooldown_finished"] = False
+    def add_tasks_batch(self, entries: list[dict]) -> list[str]:
+        """
+        Adds a batch of tasks and item cooldowns with one save of data.json and one redraw of every changed
+        part of the window
 
+        :param entries: The tasks and items, as returned by parse_task_batch()
+        :return: The task id of every entry, the item for item entries
+        :raises ValueError: When an entry is invalid, in which case nothing is added
+        """
+        with DATA_LOCK:
+            data = self.load_data()
+            ids = apply_task_batch(
+                data,
+                entries,
+                self.clock.now(),
+                self.load_settings()["planets_settings"],
+            )
             self.save_data(data)
-            self.update_item_label(item_type, self.set_item_text(item_type))
-        else:
-            print(f"Cooldown hours not defined for {item_type}.")
+        self.wake_notification_manager("data_changed")
+
+        sections = {entry["type"] for entry in entries}
+        for item in ITEMS:
+            if item in ids:
+                self.set_item_text(item)
+        if "workers" in sections:
+            self.workers_tasks_display()
+        if "buildings" in sections:
+            self.buildings_tasks_display()
+        return ids
 
     def available_planets(self) -> list[str]:
         """
@@ -1906,82 +6717,26 @@ class MainWindow(ctk.CTk):
             self.textbox_minutes_workers.configure(border_color="red")
         elif minutes >= 60:
             self.textbox_minutes_workers.configure(border_color="red")
-        else:
-            data = self.load_data()
-
-            # Generate the task ID based on the planet and existing tasks
-            planet_snake_case = self.convert_to_snake_case(planet)
-            existing_ids = [
-                int(task_id.split("_")[-1])
-                for task_id, task_info in data["workers"].items()
-                if task_info["planet"] == planet
-            ]
-            next_id = max(existing_ids) + 1 if existing_ids else 1
-            task_id = f"{planet_snake_case}_{next_id}"
-
-            if self.checkbox_instant_build_time.get() == 1:
-                input_time = timedelta(hours=hours, minutes=minutes)
-                if input_time >= timedelta(minutes=10):
-                    new_time = (
-                        datetime.now() + input_time - timedelta(minutes=5)
-                    ).isoformat()
-                else:
-                    instant_build_time = (
-                        input_time - timedelta(minutes=5)
-                        if input_time > timedelta(minutes=5)
-                        else timedelta(minutes=0)
-                    )
-                    new_time = (datetime.now() + instant_build_time).isoformat()
-            else:
-                new_time = (
-                    datetime.now() + timedelta(hours=hours, minutes=minutes)
-                ).isoformat()
-
-            new_entry = {
-                "cooldown": new_time,
-                "planet": planet,
-                "cooldown_finished": False,
-            }
-
-            # Convert workers data to a list of tuples for sorting
-            workers_list = [
-                (task_id, task_info) for task_id, task_info in data["workers"].items()
-            ]
-            # Add the new task's cooldown_datetime for comparison
-            new_entry["cooldown_datetime"] = datetime.fromisoformat(
-                new_entry["cooldown"]
-            )
-            # Find the correct position to insert the new task
-            insert_index = 0
-            for i, (_, task_info) in enumerate(workers_list):
-                task_info["cooldown_datetime"] = datetime.fromisoformat(
-                    task_info["cooldown"]
-                )
-                if new_entry["cooldown_datetime"] < task_info["cooldown_datetime"]:
-                    insert_index = i
-                    break
-                insert_index = (
-                    i + 1
-                )  # Update insert_index to insert at the end if no earlier cooldown is found
-
-            # Insert the new task into the list
-            workers_list.insert(insert_index, (task_id, new_entry))
-
-            # Convert the list back to a dictionary and update the data
-            data["workers"] = {
-                task_id: task_info for task_id, task_info in workers_list
-            }
-
-            # Clean up temporary keys
-            for task_info in data["workers"].values():
-                task_info.pop("cooldown_datetime", None)
+        elif hours > MAX_UPGRADE_HOURS:
+            self.textbox_hours_workers.configure(border_color="red")
+        else:
+            new_time = self.calculate_workers_deadline(
+                self.clock.now(),
+                hours,
+                minutes,
+                self.checkbox_instant_build_time.get() == 1,
+            )
+            with DATA_LOCK:
+                data = self.load_data()
+                self.add_task(data, WorkerTask(planet, new_time.timestamp()))
+                self.save_data(data)
 
             if self.textbox_hours_workers.get() != "":
                 self.textbox_hours_workers.delete(0, 100)
             if self.textbox_minutes_workers.get() != "":
                 self.textbox_minutes_workers.delete(0, 2)
 
-            self.save_data(data)
+            self.wake_notification_manager("data_changed")
             self.workers_tasks_display()
 
     def remove_workers_task(self, task_id: str) -> None:
@@ -1990,19 +6745,22 @@ class MainWindow(ctk.CTk):
 
         :param task_id: The id of the entry which needs to be removed
         """
-        data = self.load_data()
+        with DATA_LOCK:
+            data = self.load_data()
+            removed = self.remove_task(data, "workers", task_id)
+            self.save_data(data)
 
-        # Check if the task ID exists in the dictionary
-        if task_id in data["workers"]:
-            # Delete the specified worker's task
-            del data["workers"][task_id]
-            print(f"Removed task {task_id} from data.json")
+        if removed:
+            STORAGE_LOGGER.info(
+                "Removed task %s from data.json",
+                task_id,
+                extra={"data": {"section": "workers", "task_id": task_id}},
+            )
         else:
-            print(
-                f"Workers Task with the following id not found in data.json: {task_id}"
+            STORAGE_LOGGER.warning(
+                "Workers Task with the following id not found in data.json: %s",
+                task_id,
             )
-
-        self.save_data(data)
         self.workers_tasks_display()
 
     def select_planet_image(self, planet: str, label_image: ctk.CTkLabel) -> None:
@@ -2015,7 +6773,7 @@ class MainWindow(ctk.CTk):
 
         planet_snake_case = self.convert_to_snake_case(planet)
         image_planet = ctk.CTkImage(
-            Image.open(
+            open_image(
                 Path(
                     PLANETS_IMAGES_PATH,
                     settings["planets_settings"][planet_snake_case]["planet_image"],
@@ -2029,6 +6787,7 @@ class MainWindow(ctk.CTk):
         if label_image == self.label_image_planet_buildings:
             self.update_buildings_options()
 
+    @record_widget_rebuild("workers_tasks")
     def workers_tasks_display(self) -> None:
         """
         Display workers' tasks based on the loaded data and settings.
@@ -2039,19 +6798,21 @@ class MainWindow(ctk.CTk):
         # Clear existing widgets in frame_workers_tasks
         for widget in self.frame_workers_tasks.winfo_children():
             widget.destroy()
+        self.displayed_tasks["workers"] = data["workers"]
+        self.task_cooldown_labels["workers"] = {}
 
         # Now recreate the widgets based on the current data
-        for i, (task_id, task_info) in enumerate(data["workers"].items(), start=1):
+        for i, (task_id, task) in enumerate(data["workers"].items(), start=1):
             self.frame_workers_tasks.rowconfigure(i, weight=1)
 
-            planet_name = task_info["planet"]
+            planet_name = task.planet
             planet = self.convert_to_snake_case(planet_name)
             image_path = Path(
                 PLANETS_IMAGES_PATH,
                 settings["planets_settings"][planet]["planet_image"],
             )
             image_planet = ctk.CTkImage(
-                Image.open(image_path),
+                open_image(image_path),
                 size=(40, 40),
             )
             label_planet = ctk.CTkLabel(
@@ -2065,14 +6826,15 @@ class MainWindow(ctk.CTk):
 
             label_cooldown = ctk.CTkLabel(
                 self.frame_workers_tasks,
-                text=self.set_workers_cooldown_text(task_id),
+                text=self.set_workers_cooldown_text(task),
                 font=("Arial", 16),
             )
             label_cooldown.grid(row=i, column=2)
+            self.task_cooldown_labels["workers"][task_id] = label_cooldown
 
             image_trashcan_path = Path(MAIN_IMAGES_PATH, "dark_mode_trash_can.png")
             image_trashcan = ctk.CTkImage(
-                Image.open(image_trashcan_path),
+                open_image(image_trashcan_path),
                 size=(20, 20),
             )
 
@@ -2087,22 +6849,18 @@ class MainWindow(ctk.CTk):
             )
             button_remove_task.grid(row=i, column=3)
 
-    def set_workers_cooldown_text(self, task_id: str) -> str:
+    def set_workers_cooldown_text(self, task: WorkerTask) -> str:
         """
         Sets the cooldown text of the label corresponding to the workers task
-        :param task_id: The id of the task
+        :param task: The workers task
         """
-        data = self.load_data()
-
-        cooldown_date = data["workers"][task_id]["cooldown"]
-
-        if self.compare_to_current_time(cooldown_date):
+        if self.compare_to_current_time(task.deadline, self.clock.time()):
             return "Upgrade Finished!"
         else:
-            cooldown_date_datetime = datetime.fromisoformat(cooldown_date)
-            return f"Working until {cooldown_date_datetime:%d-%m-%Y %H:%M}"
+            return f"Working until {to_local_datetime(task.deadline):%d-%m-%Y %H:%M}"
 
-    def convert_to_snake_case(self, text: str) -> str:
+    @staticmethod
+    def convert_to_snake_case(text: str) -> str:
         """
         Converts given text to snake case
 
@@ -2114,14 +6872,148 @@ class MainWindow(ctk.CTk):
         snake_case_text = "_".join(snake_case_words)
         return snake_case_text
 
-    def update_buildings_options(self) -> None:
-        """Updates the options which can be selected in the combobox self.combobox_buildings"""
-        selected_planet = self.combobox_planet_buildings.get()
+    @staticmethod
+    def get_buildings_options(planet: str) -> list[str]:
+        """
+        :param planet: The name of the planet (e.g. "Main Planet", "Colony 1")
+        :return: The buildings which can be upgraded on the planet
+        """
         buildings_values = ["Laboratory", "Training Camp", "Factory", "StarPort"]
 
         # Adds the option "Refinery" when the selected planet is "Main Planet"
-        if selected_planet == "Main Planet":
+        if planet == "Main Planet":
             buildings_values.insert(1, "Refinery")
+        return buildings_values
+
+    @staticmethod
+    def calculate_workers_deadline(
+        now: datetime, hours: int, minutes: int, instant_build_time: bool
+    ) -> datetime:
+        """
+        Calculates when a workers task finishes
+
+        :param now: The current time
+        :param hours: The hours of the upgrade time
+        :param minutes: The minutes of the upgrade time
+        :param instant_build_time: Whether the last 5 minutes are finished instantly
+        :return: The deadline of the task
+        """
+        input_time = timedelta(hours=hours, minutes=minutes)
+        if not instant_build_time:
+            return now + input_time
+        if input_time >= timedelta(minutes=10):
+            return now + input_time - timedelta(minutes=5)
+        instant_build_time = (
+            input_time - timedelta(minutes=5)
+            if input_time > timedelta(minutes=5)
+            else timedelta(minutes=0)
+        )
+        return now + instant_build_time
+
+    @staticmethod
+    def create_task(section: str, fields: dict, now: datetime) -> Task:
+        """
+        Creates a task with the same checks as the add buttons of the main window
+
+        :param section: The section of the task ("workers" or "buildings")
+        :param fields: The "planet", "hours" and "minutes" of the task, the "building" of a buildings task and optionally "instant_build_time" for a workers task
+        :param now: The current time
+        :return: The new task
+        :raises ValueError: When a field is missing or invalid
+        """
+        planet = fields.get("planet")
+        instant_build_time = fields.get("instant_build_time", False)
+        if not isinstance(instant_build_time, bool):
+            raise ValueError(
+                f"instant_build_time has to be true or false, not {instant_build_time!r}"
+            )
+        hours = MainWindow.parse_time_field(fields, "hours")
+        minutes = MainWindow.parse_time_field(fields, "minutes")
+        if planet not in PLANETS:
+            raise ValueError(f"Unknown planet {planet!r}")
+        if (
+            not 0 <= hours <= MAX_UPGRADE_HOURS
+            or not 0 <= minutes < 60
+            or hours == minutes == 0
+        ):
+            raise ValueError(
+                f"The upgrade time has to be at least one minute and at most {MAX_UPGRADE_HOURS} hours, "
+                "with less than 60 minutes"
+            )
+
+        try:
+            if section == "workers":
+                deadline = MainWindow.calculate_workers_deadline(
+                    now, hours, minutes, instant_build_time
+                )
+                return WorkerTask(planet, deadline.timestamp())
+            if section == "buildings":
+                building = fields.get("building")
+                if building not in MainWindow.get_buildings_options(planet):
+                    raise ValueError(f"{building!r} can't be upgraded on {planet}")
+                deadline = now + timedelta(hours=hours, minutes=minutes)
+                return BuildingTask(planet, building, deadline.timestamp())
+        except OverflowError:
+            raise ValueError("The deadline is too far in the future")
+        raise ValueError(f"Unknown section {section!r}")
+
+    @staticmethod
+    def parse_time_field(fields: dict, name: str) -> int:
+        """
+        :param fields: The fields of a new task
+        :param name: The name of the field ("hours" or "minutes")
+        :return: The value of the field, 0 when it is missing or empty
+        :raises ValueError: When the value isn't a whole number, e.g. 2.9 or true
+        """
+        value = fields.get(name)
+        if value is None or value == "":
+            return 0
+        # bool is a subclass of int, but true isn't a number of hours
+        if type(value) is int:
+            return value
+        if isinstance(value, str) and re.fullmatch(r"\s*\d{1,9}\s*", value):
+            return int(value)
+        raise ValueError(f"The {name} have to be a whole number, not {value!r}")
+
+    @staticmethod
+    def add_task(data: dict, new_task: Task) -> str:
+        """
+        Adds a task to its section of data, with the next task id of its planet (and building)
+
+        :param data: dictionary with the item cooldowns and tasks from data.json
+        :param new_task: The new task
+        :return: The id of the new task
+        """
+        section = new_task.section
+        if section == "workers":
+            # Generate the task ID based on the planet and existing tasks
+            task_id = MainWindow.next_task_id(
+                MainWindow.convert_to_snake_case(new_task.planet),
+                [
+                    task_id
+                    for task_id, task in data["workers"].items()
+                    if task.planet == new_task.planet
+                ],
+            )
+        else:
+            # Generate the task ID based on the planet, building, and existing tasks
+            planet_building_snake_case = f"{MainWindow.convert_to_snake_case(new_task.planet)}_{MainWindow.convert_to_snake_case(new_task.building)}"
+            task_id = MainWindow.next_task_id(
+                planet_building_snake_case,
+                [
+                    task_id
+                    for task_id in data["buildings"].keys()
+                    if task_id.startswith(planet_building_snake_case)
+                ],
+            )
+
+        data[section] = MainWindow.insert_task_sorted(data[section], task_id, new_task)
+        return task_id
+
+    def update_buildings_options(self) -> None:
+        """Updates the options which can be selected in the combobox self.combobox_buildings"""
+        selected_planet = self.combobox_planet_buildings.get()
+        buildings_values = self.get_buildings_options(selected_planet)
 
         # Prevents "Refinery" from being selected when switching from "Main Planet" to a different planet
         if (
@@ -2168,69 +7060,23 @@ class MainWindow(ctk.CTk):
             self.textbox_minutes_buildings.configure(border_color="red")
         elif minutes >= 60:
             self.textbox_minutes_buildings.configure(border_color="red")
+        elif hours > MAX_UPGRADE_HOURS:
+            self.textbox_hours_buildings.configure(border_color="red")
         else:
-            data = self.load_data()
-
-            new_time = (
-                datetime.now() + timedelta(hours=hours, minutes=minutes)
-            ).isoformat()
-
-            # Generate the task ID based on the planet, building, and existing tasks
-            planet_building_snake_case = f"{self.convert_to_snake_case(planet)}_{self.convert_to_snake_case(building)}"
-            existing_ids = [
-                int(task_id.split("_")[-1])
-                for task_id in data["buildings"].keys()
-                if task_id.startswith(planet_building_snake_case)
-            ]
-            next_id = max(existing_ids) + 1 if existing_ids else 1
-            task_id = f"{planet_building_snake_case}_{next_id}"
-
-            new_entry = {
-                "cooldown": new_time,
-                "planet": planet,
-                "building": building,
-                "cooldown_finished": False,
-            }
-
-            # Convert buildings data to a list of tuples for sorting
-            buildings_list = [
-                (task_id, task_info) for task_id, task_info in data["buildings"].items()
-            ]
-            # Add the new task's cooldown_datetime for comparison
-            new_entry["cooldown_datetime"] = datetime.fromisoformat(
-                new_entry["cooldown"]
-            )
-            # Find the correct position to insert the new task
-            insert_index = 0
-            for i, (_, task_info) in enumerate(buildings_list):
-                task_info["cooldown_datetime"] = datetime.fromisoformat(
-                    task_info["cooldown"]
+            new_time = self.clock.now() + timedelta(hours=hours, minutes=minutes)
+            with DATA_LOCK:
+                data = self.load_data()
+                self.add_task(
+                    data, BuildingTask(planet, building, new_time.timestamp())
                 )
-                if new_entry["cooldown_datetime"] < task_info["cooldown_datetime"]:
-                    insert_index = i
-                    break
-                insert_index = (
-                    i + 1
-                )  # Update insert_index to insert at the end if no earlier cooldown is found
-
-            # Insert the new task into the list
-            buildings_list.insert(insert_index, (task_id, new_entry))
-
-            # Convert the list back to a dictionary and update the data
-            data["buildings"] = {
-                task_id: task_info for task_id, task_info in buildings_list
-            }
-
-            # Clean up temporary keys
-            for task_info in data["buildings"].values():
-                task_info.pop("cooldown_datetime", None)
+                self.save_data(data)
 
             if self.textbox_hours_buildings.get() != "":
                 self.textbox_hours_buildings.delete(0, 100)
             if self.textbox_minutes_buildings.get() != "":
                 self.textbox_minutes_buildings.delete(0, 2)
 
-            self.save_data(data)
+            self.wake_notification_manager("data_changed")
             self.buildings_tasks_display()
 
     def remove_buildings_task(self, task_id):
@@ -2239,21 +7085,25 @@ class MainWindow(ctk.CTk):
 
         :param task_id: The id of the entry which needs to be removed
         """
-        data = self.load_data()
+        with DATA_LOCK:
+            data = self.load_data()
+            removed = self.remove_task(data, "buildings", task_id)
+            self.save_data(data)
 
-        # Check if the task ID exists in the dictionary
-        if task_id in data["buildings"]:
-            # Delete the specified building task
-            del data["buildings"][task_id]
-            print(f"Removed task {task_id} from data.json")
+        if removed:
+            STORAGE_LOGGER.info(
+                "Removed task %s from data.json",
+                task_id,
+                extra={"data": {"section": "buildings", "task_id": task_id}},
+            )
         else:
-            print(
-                f"Buildings Task with the following id not found in data.json: {task_id}"
+            STORAGE_LOGGER.warning(
+                "Buildings Task with the following id not found in data.json: %s",
+                task_id,
             )
-
-        self.save_data(data)
         self.buildings_tasks_display()
 
+    @record_widget_rebuild("buildings_tasks")
     def buildings_tasks_display(self):
         """
         Display buildings' tasks based on the loaded data and settings.
@@ -2264,15 +7114,17 @@ class MainWindow(ctk.CTk):
         # Clear existing widgets in frame_buildings_tasks
         for widget in self.frame_buildings_tasks.winfo_children():
             widget.destroy()
+        self.displayed_tasks["buildings"] = data["buildings"]
+        self.task_cooldown_labels["buildings"] = {}
 
         # Now recreate the widgets based on the current data
-        for i, (task_id, task_info) in enumerate(data["buildings"].items(), start=1):
+        for i, (task_id, task) in enumerate(data["buildings"].items(), start=1):
             self.frame_buildings_tasks.rowconfigure(i, weight=1)
 
-            planet_name = task_info["planet"]
+            planet_name = task.planet
             planet = self.convert_to_snake_case(planet_name)
             image_planet = ctk.CTkImage(
-                Image.open(
+                open_image(
                     Path(
                         PLANETS_IMAGES_PATH,
                         settings["planets_settings"][planet]["planet_image"],
@@ -2289,11 +7141,11 @@ class MainWindow(ctk.CTk):
             )
             label_planet.grid(row=i, column=1)
 
-            building = task_info["building"]
+            building = task.building
             building_image_name = building.replace(" ", "_")
             building_image = f"{building_image_name}.png"
             image_building = ctk.CTkImage(
-                Image.open(Path(MAIN_IMAGES_PATH, building_image)), size=(40, 40)
+                open_image(Path(MAIN_IMAGES_PATH, building_image)), size=(40, 40)
             )
 
             label_image_building = ctk.CTkLabel(
@@ -2307,13 +7159,14 @@ class MainWindow(ctk.CTk):
 
             label_cooldown = ctk.CTkLabel(
                 self.frame_buildings_tasks,
-                text=self.set_buildings_cooldown_text(task_id),
+                text=self.set_buildings_cooldown_text(task),
                 font=("Arial", 16),
             )
             label_cooldown.grid(row=i, column=3)
+            self.task_cooldown_labels["buildings"][task_id] = label_cooldown
 
             image_trashcan = ctk.CTkImage(
-                Image.open(Path(MAIN_IMAGES_PATH, "dark_mode_trash_can.png")),
+                open_image(Path(MAIN_IMAGES_PATH, "dark_mode_trash_can.png")),
                 size=(20, 20),
             )
 
@@ -2328,67 +7181,182 @@ class MainWindow(ctk.CTk):
             )
             button_remove_task.grid(row=i, column=4)
 
-    def set_buildings_cooldown_text(self, task_id: str) -> str:
-        data = self.load_data()
-
-        cooldown_date = data["buildings"][task_id]["cooldown"]
-
-        if self.compare_to_current_time(cooldown_date):
-            if "refinery" in task_id:
+    def set_buildings_cooldown_text(self, task: BuildingTask) -> str:
+        if self.compare_to_current_time(task.deadline, self.clock.time()):
+            if task.building == "Refinery":
                 return "Cube Refined!"
             else:
                 return "Upgrade Finished!"
         else:
-            cooldown_date_datetime = datetime.fromisoformat(cooldown_date)
-            return f"Ready on {cooldown_date_datetime: %d-%m-%Y %H:%M}"
+            return f"Ready on {to_local_datetime(task.deadline): %d-%m-%Y %H:%M}"
+
+    @staticmethod
+    def load_data(path: Path | None = None) -> dict:
+        """
+        Loads the item cooldowns and tasks from data.json
+
+        :param path: The path of the data.json file, by default the one of the active profile
+        :return: dictionary with an ItemCooldown per item and a dictionary of tasks per section
+        """
+        return data_from_json(MainWindow.load_data_json(path))
+
+    @staticmethod
+    def save_data(data: dict, path: Path | None = None):
+        """
+        Saves the item cooldowns and tasks to data.json
+
+        :param data: dictionary with an ItemCooldown per item and a dictionary of tasks per section
+        :param path: The path of the data.json file, by default the one of the active profile
+        """
+        MainWindow.save_data_json(data_to_json(data), path)
 
     @staticmethod
-    def load_data() -> dict:
+    def load_data_json(path: Path | None = None) -> dict:
         """
         Loads the data from data.json
 
+        :param path: The path of the data.json file, by default the one of the active profile
         :return: dictionary with all the data from data.json
         """
-        json_data_file = Path(MAIN_PATH, "data.json")
+        start_time = time.perf_counter()
+        json_data_file = path or DATA_FILE_PATH
         with open(json_data_file, "r") as file:
-            data = json.load(file)
+            text = file.read()
+        data = json.loads(text)
+        METRICS.increment("json_operations_total", operation="load")
+        METRICS.increment("json_bytes_total", len(text), operation="load")
+        METRICS.observe(
+            "json_operation_seconds", time.perf_counter() - start_time, operation="load"
+        )
         return data
 
     @staticmethod
-    def save_data(data: dict):
+    def save_data_json(data: dict, path: Path | None = None):
         """
         Saves the data to data.json
 
         :param data: dictionary with data from data.json
+        :param path: The path of the data.json file, by default the one of the active profile
+        """
+        start_time = time.perf_counter()
+        text = json.dumps(data, indent=4)
+        json_data_file = path or DATA_FILE_PATH
+        write_file_atomically(json_data_file, text)
+        FILE_WATCHER.record_own_write(json_data_file)
+        METRICS.increment("json_operations_total", operation="save")
+        METRICS.increment("json_bytes_total", len(text), operation="save")
+        METRICS.observe(
+            "json_operation_seconds", time.perf_counter() - start_time, operation="save"
+        )
+
+    @staticmethod
+    def next_task_id(base: str, existing_task_ids: list[str]) -> str:
         """
-        json_data_file = Path(MAIN_PATH, "data.json")
-        with open(json_data_file, "w") as file:
-            json.dump(data, file, indent=4)
+        Generates the id for a new task
+
+        :param base: The start of the task id (e.g. "colony_1", "main_planet_laboratory")
+        :param existing_task_ids: The ids of the existing tasks with the same base
+        :return: The task id, numbered one higher than the highest existing task id
+        """
+        existing_ids = [int(task_id.split("_")[-1]) for task_id in existing_task_ids]
+        next_id = max(existing_ids) + 1 if existing_ids else 1
+        return f"{base}_{next_id}"
+
+    @staticmethod
+    def insert_task_sorted(tasks: dict, task_id: str, new_task: Task) -> dict:
+        """
+        Inserts a task before the first task which finishes later, so the tasks stay sorted on their deadline
+
+        :param tasks: The tasks of a section of data.json (e.g. data["workers"])
+        :param task_id: The id of the new task
+        :param new_task: The new task
+        :return: The tasks including the new task
+        """
+        tasks_list = list(tasks.items())
+        # Find the correct position to insert the new task, at the end if no later deadline is found
+        insert_index = next(
+            (
+                i
+                for i, (_, task) in enumerate(tasks_list)
+                if new_task.deadline < task.deadline
+            ),
+            len(tasks_list),
+        )
+
+        tasks_list.insert(insert_index, (task_id, new_task))
+        return dict(tasks_list)
+
+    @staticmethod
+    def remove_task(data: dict, section: str, task_id: str) -> bool:
+        """
+        Removes a task from data
+
+        :param data: dictionary with the item cooldowns and tasks from data.json
+        :param section: The section of the task (e.g. "workers", "buildings")
+        :param task_id: The id of the task
+        :return: True if the task was removed, False if it doesn't exist
+        """
+        if task_id not in data[section]:
+            return False
+        del data[section][task_id]
+        return True
+
+    @staticmethod
+    def remove_finished_tasks(data: dict) -> None:
+        """
+        Removes the finished workers and buildings tasks from data
+
+        :param data: dictionary with the item cooldowns and tasks from data.json
+        """
+        for section in TASK_CLASSES:
+            data[section] = {
+                task_id: task
+                for task_id, task in data[section].items()
+                if not task.cooldown_finished
+            }
+
+    @staticmethod
+    def reindex_tasks(tasks: dict) -> dict:
+        """
+        Renumbers the task ids, so the tasks with the same base are numbered 1, 2, 3, ... in their current order
+
+        :param tasks: The tasks of a section of data.json (e.g. data["workers"])
+        :return: The tasks with the new task ids
+        """
+        new_tasks = {}
+        counter = {}
+        for task_id, task in tasks.items():
+            base = task_id.rsplit("_", 1)[0]
+            counter[base] = counter.get(base, 0) + 1
+            new_tasks[f"{base}_{counter[base]}"] = task
+        return new_tasks
 
     @staticmethod
-    def load_settings() -> dict:
+    def load_settings(path: Path | None = None) -> dict:
         """
         Loads the settings from settings.json
 
+        :param path: The path of the settings.json file, by default the one of the active profile
         :return: dictionary with all the settings from settings.json
         """
 
-        json_settings_file = Path(MAIN_PATH, "settings.json")
+        json_settings_file = path or SETTINGS_FILE_PATH
         with open(json_settings_file, "r") as file:
             settings = json.load(file)
         return settings
 
     @staticmethod
-    def save_settings(settings: dict):
+    def save_settings(settings: dict, path: Path | None = None):
         """
         Save the provided settings to the specified JSON settings file.
 
         :param settings: A dictionary containing the settings to be saved.
+        :param path: The path of the settings.json file, by default the one of the active profile
         """
 
-        json_settings_file = Path(MAIN_PATH, "settings.json")
-        with open(json_settings_file, "w") as file:
-            json.dump(settings, file, indent=4)
+        json_settings_file = path or SETTINGS_FILE_PATH
+        write_file_atomically(json_settings_file, json.dumps(settings, indent=4))
+        FILE_WATCHER.record_own_write(json_settings_file)
 
     @staticmethod
     def load_color_palette() -> dict:
@@ -2416,24 +7384,21 @@ class MainWindow(ctk.CTk):
             json.dump(color_palette, file, indent=4)
 
     @staticmethod
-    def compare_to_current_time(cooldown_date: str) -> bool:
+    def compare_to_current_time(
+        deadline: float, current_time: float | None = None
+    ) -> bool:
         """
-        Compares the current time to the provided cooldown_date datetime
+        Compares the current time to the provided deadline
 
-        :param cooldown_date: The datetime to compare to the current time, must be in ISO 8601 format (datetime.isoformat())
-        :return: True if the current datetime is later or equal to the provided cooldown date, False if the current datetime is earlier than the provided cooldown date
+        :param deadline: The POSIX timestamp to compare to the current time
+        :param current_time: The current POSIX timestamp, by default the real current time
+        :return: True if the current time is later or equal to the provided deadline, False if the current time is earlier than the provided deadline
         """
 
-        current_datetime = datetime.now()
-
-        try:
-            cooldown_datetime = datetime.fromisoformat(cooldown_date)
-        except:
-            raise ValueError(
-                "Invalid datetime format. Please format the datetime to isoformat"
-            )
+        if current_time is None:
+            current_time = time.time()
 
-        return current_datetime >= cooldown_datetime
+        return current_time >= deadline
 
     @staticmethod
     def toggle_command_window(action: str) -> None:
@@ -2460,55 +7425,823 @@ class MainWindow(ctk.CTk):
             ctypes.windll.kernel32.CloseHandle(whnd)
 
     def on_closing(self) -> None:
-        """Closes the window and reindexes the task ids from workers and buildings. If enabled in the settings, it will also delete expired tasks"""
-        print("Closing window")
+        """Closes the window and reindexes the task ids from workers and buildings. Finished tasks are moved to the history archive, or deleted if the archive is disabled and enabled in the settings"""
+        UI_LOGGER.info("Closing window")
 
-        data = self.load_data()
         settings = self.load_settings()
+        with DATA_LOCK:
+            data = self.load_data()
 
-        # Remove expired workers tasks if enabled in the settings
-        if settings["global_settings"]["auto_delete_completed_tasks"]:
-            keys_to_delete = []
-            for section in ["workers", "buildings"]:
-                for task_id, task_info in data[section].items():
-                    if task_info["cooldown_finished"]:
-                        keys_to_delete.append((section, task_id))
-
-            # Delete the expired tasks
-            for section, task_id in keys_to_delete:
-                del data[section][task_id]
-
-        # Reindex the task ids
-        for section in ["workers", "buildings"]:
-            new_section = {}
-            counter = {}
-            for task_id, task_info in data[section].items():
-                parts = task_id.rsplit("_", 1)
-                base = "_".join(parts[:-1])
-                if base not in counter:
-                    counter[base] = 1
-                else:
-                    counter[base] += 1
-                new_task_id = f"{base}_{counter[base]}"
-                new_section[new_task_id] = task_info
-            data[section] = new_section
+            # Move the finished tasks to the history archive, or remove them if enabled in the settings
+            history_settings = settings["history_settings"]
+            if history_settings["enabled"]:
+                keep_seconds = (
+                    0
+                    if settings["global_settings"]["auto_delete_completed_tasks"]
+                    else history_settings["keep_finished_hours"] * 3600
+                )
+                try:
+                    HistoryArchive.from_settings(
+                        history_settings, DATA_FILE_PATH.parent
+                    ).move_finished_tasks(data, self.clock.time() - keep_seconds)
+                except (OSError, ValueError, KeyError):
+                    # The finished tasks stay in data.json, and are archived the next time
+                    STORAGE_LOGGER.exception(
+                        "Couldn't archive the finished tasks, keeping them in data.json"
+                    )
+            elif settings["global_settings"]["auto_delete_completed_tasks"]:
+                self.remove_finished_tasks(data)
+
+            # Reindex the task ids
+            for section in TASK_CLASSES:
+                data[section] = self.reindex_tasks(data[section])
 
-        self.save_data(data)
+            self.save_data(data)
 
         if settings["global_settings"]["run_notifications_in_background"]:
             self.background_command_window()
+        elif self.notification_manager is not None:
+            self.notification_manager.remove_lock_files()
+
+        self.destroy()
+
+
+TASK_BATCH_CSV_COLUMNS = [
+    "type",
+    "planet",
+    "building",
+    "hours",
+    "minutes",
+    "instant_build_time",
+    "item",
+]
+
+
+def parse_task_batch(text: str, batch_format: str = "json") -> list[dict]:
+    """
+    Parses a batch of tasks and collected items. Every entry has a "type": "workers" and "buildings"
+    entries have the fields of MainWindow.create_task(), "item" entries have the "item" which was just
+    collected.
+
+    :param text: A JSON list of entries (or {"tasks": [...]}), or CSV with a header row of TASK_BATCH_CSV_COLUMNS
+    :param batch_format: "json" or "csv"
+    :return: The entries
+    :raises ValueError: When the text can't be parsed
+    """
+    if batch_format == "csv":
+        entries = []
+        for row in csv.DictReader(io.StringIO(text)):
+            entry = {
+                column: value.strip()
+                for column, value in row.items()
+                if column in TASK_BATCH_CSV_COLUMNS and value and value.strip()
+            }
+            if "instant_build_time" in entry:
+                entry["instant_build_time"] = entry["instant_build_time"].lower() in (
+                    "1",
+                    "true",
+                    "yes",
+                )
+            entries.append(entry)
+        return entries
+    if batch_format != "json":
+        raise ValueError(f"Unknown batch format {batch_format!r}, use json or csv")
+
+    document = json.loads(text)
+    if isinstance(document, dict):
+        document = document.get("tasks")
+    if not isinstance(document, list) or not all(
+        isinstance(entry, dict) for entry in document
+    ):
+        raise ValueError("The batch has to be a list of objects")
+    return document
+
+
+def apply_task_batch(
+    data: dict, entries: list[dict], now: datetime, planets_settings: dict
+) -> list[str]:
+    """
+    Adds a batch of tasks and item cooldowns to data as one transaction: every entry is checked before
+    anything is added
+
+    :param data: dictionary with the item cooldowns and tasks from data.json
+    :param entries: The tasks and items, as returned by parse_task_batch()
+    :param now: The current time
+    :param planets_settings: The "planets_settings" section of settings.json, only enabled planets get tasks
+    :return: The task id of every entry, the item for item entries
+    :raises ValueError: When an entry is invalid, with the problems of all invalid entries
+    """
+    changes = []
+    errors = []
+    for number, entry in enumerate(entries, start=1):
+        entry_type = entry.get("type")
+        try:
+            if entry_type == "item":
+                item = entry.get("item")
+                if item not in ITEM_COOLDOWN_HOURS:
+                    raise ValueError(f"Unknown item {item!r}")
+                changes.append(
+                    (
+                        item,
+                        ItemCooldown(
+                            (
+                                now + timedelta(hours=ITEM_COOLDOWN_HOURS[item])
+                            ).timestamp()
+                        ),
+                    )
+                )
+            else:
+                new_task = MainWindow.create_task(entry_type, entry, now)
+                planet_settings = planets_settings.get(
+                    MainWindow.convert_to_snake_case(new_task.planet), {}
+                )
+                if not planet_settings.get("enabled"):
+                    raise ValueError(
+                        f"{new_task.planet} isn't enabled in the Planets Settings"
+                    )
+                changes.append((None, new_task))
+        except ValueError as e:
+            errors.append(f"entry {number}: {e}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    ids = []
+    for item, change in changes:
+        if item is not None:
+            data[item] = change
+            ids.append(item)
+        else:
+            ids.append(MainWindow.add_task(data, change))
+    return ids
+
+
+def add_tasks_from_file(path: str) -> None:
+    """
+    Adds the tasks and items of a JSON or CSV file to data.json with one save. A running notifier and
+    window pick the change up by watching data.json.
+
+    :param path: The path of the file, "-" to read JSON from stdin. Files ending with .csv are read as CSV.
+    """
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+    entries = parse_task_batch(text, "csv" if path.lower().endswith(".csv") else "json")
+
+    data = MainWindow.load_data()
+    ids = apply_task_batch(
+        data, entries, utc_now(), MainWindow.load_settings()["planets_settings"]
+    )
+    MainWindow.save_data(data)
+    STORAGE_LOGGER.info(
+        "Added %d task(s) and item(s) from %s",
+        len(ids),
+        path,
+        extra={"data": {"ids": ids}},
+    )
+    print(json.dumps({"added": ids}))
+
+
+# The fields of an exported task, in the order of the CSV columns
+TASK_RECORD_FIELDS = [
+    "section",
+    "task_id",
+    "planet",
+    "building",
+    "deadline",
+    "finished",
+]
+
+
+def task_to_record(section: str, task_id: str, task: Task) -> dict:
+    """
+    :param section: The section of the task (e.g. "workers", "buildings")
+    :param task_id: The id of the task
+    :param task: The task
+    :return: The task as an export record, with the fields of TASK_RECORD_FIELDS
+    """
+    return {
+        "section": section,
+        "task_id": task_id,
+        "planet": task.planet,
+        "building": getattr(task, "building", ""),
+        "deadline": format_deadline(task.deadline),
+        "finished": task.cooldown_finished,
+    }
+
+
+def record_to_task(record: dict) -> tuple[str, str, Task]:
+    """
+    :param record: An export record, from JSON Lines or CSV
+    :return: The section, id and task of the record
+    :raises ValueError: When a field of the record is missing or invalid
+    """
+    section = record.get("section")
+    planet = record.get("planet")
+    task_id = record.get("task_id")
+    finished = record.get("finished", False)
+    if section not in TASK_CLASSES:
+        raise ValueError(f"Unknown section {section!r}")
+    if planet not in PLANETS:
+        raise ValueError(f"Unknown planet {planet!r}")
+    if not isinstance(task_id, str) or not task_id:
+        raise ValueError("The task_id is missing")
+    if isinstance(finished, str):
+        finished = finished.lower() in ("1", "true", "yes")
+    try:
+        deadline = parse_deadline(record["deadline"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid deadline {record.get('deadline')!r}")
+
+    if section == "workers":
+        return section, task_id, WorkerTask(planet, deadline, bool(finished))
+    building = record.get("building")
+    if building not in MainWindow.get_buildings_options(planet):
+        raise ValueError(f"{building!r} can't be upgraded on {planet}")
+    return section, task_id, BuildingTask(planet, building, deadline, bool(finished))
+
+
+UNIX_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def task_natural_key(task: Task) -> tuple[str, str, str, int]:
+    """
+    Identifies a task by what it is instead of by its id, which changes when the ids are renumbered on closing
+
+    :param task: The task
+    :return: The section, planet, type (e.g. "workers", "Laboratory") and deadline in whole microseconds, as stored in data.json
+    """
+    # Rounded to whole microseconds like format_deadline(), round(deadline * 1000000) can be one microsecond off
+    deadline = datetime.fromtimestamp(task.deadline, timezone.utc)
+    deadline_microseconds = (deadline - UNIX_EPOCH) // timedelta(microseconds=1)
+    return task.section, task.planet, task.task_type, deadline_microseconds
+
+
+def iter_task_records(data: dict) -> Iterator[dict]:
+    """
+    :param data: dictionary with the item cooldowns and tasks from data.json
+    :return: The export record of every workers and buildings task, one at a time
+    """
+    for section in TASK_CLASSES:
+        for task_id, task in data[section].items():
+            yield task_to_record(section, task_id, task)
+
+
+def filter_task_records(
+    records: Iterable[dict],
+    planets: Iterable[str] | None = None,
+    sections: Iterable[str] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> Iterator[dict]:
+    """
+    Checks every record and passes on the records which match every given filter, without keeping them
+
+    :param records: Export records
+    :param planets: Only the tasks on these planets, None for every planet
+    :param sections: Only the tasks in these sections, None for every section
+    :param since: Only the tasks with a deadline at or after this time
+    :param until: Only the tasks with a deadline before this time
+    :return: The matching records
+    :raises ValueError: When a record is invalid, also when the filters would have skipped it
+    """
+    planets = set(planets) if planets else None
+    sections = set(sections) if sections else None
+    since = since.timestamp() if since is not None else None
+    until = until.timestamp() if until is not None else None
+    for number, record in enumerate(records, start=1):
+        try:
+            section, _, task = record_to_task(record)
+        except ValueError as e:
+            raise ValueError(f"record {number}: {e}")
+        if planets is not None and task.planet not in planets:
+            continue
+        if sections is not None and section not in sections:
+            continue
+        if since is not None and task.deadline < since:
+            continue
+        if until is not None and task.deadline >= until:
+            continue
+        yield record
+
+
+def get_records_format(path: str) -> str:
+    """
+    :param path: The path of a records file, which may be gzip-compressed (ending with .gz)
+    :return: "csv" for .csv files, "jsonl" for every other file
+    """
+    return "csv" if path.lower().removesuffix(".gz").endswith(".csv") else "jsonl"
+
+
+def open_records_file(path: str, mode: str):
+    """
+    Opens a records file as text, decompressing or compressing files ending with .gz on the fly
+
+    :param path: The path of the file, "-" for stdin or stdout
+    :param mode: "r" to read, "w" to write, "a" to append
+    :return: The file object
+    """
+    if path == "-":
+        # Closing the returned file mustn't close stdin or stdout
+        stream = sys.stdin if mode == "r" else sys.stdout
+        return open(stream.fileno(), mode, encoding="utf-8", newline="", closefd=False)
+    if path.lower().endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def read_task_records(file, records_format: str) -> Iterator[dict]:
+    """
+    Reads export records one line at a time, so files of any size can be read with little memory
+
+    :param file: A text file opened with open_records_file()
+    :param records_format: "jsonl" or "csv"
+    :return: The records
+    :raises ValueError: When a line can't be parsed
+    """
+    if records_format == "csv":
+        for record in csv.DictReader(file):
+            record["finished"] = record.get("finished", "").lower() in ("1", "true")
+            yield record
+        return
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {line_number}: {e}")
+
+
+def write_task_records(
+    records: Iterable[dict], file, records_format: str, header: bool = True
+) -> int:
+    """
+    Writes export records one line at a time
+
+    :param records: The records
+    :param file: A text file opened with open_records_file()
+    :param records_format: "jsonl" or "csv"
+    :param header: Whether to write the header row of a CSV file, which is left out when appending
+    :return: The amount of written records
+    """
+    if records_format == "csv":
+        writer = csv.DictWriter(file, TASK_RECORD_FIELDS, extrasaction="ignore")
+        if header:
+            writer.writeheader()
+        write_row = writer.writerow
+    else:
+        write_row = None
+
+    amount = 0
+    for record in records:
+        if write_row is not None:
+            write_row(record)
         else:
+            file.write(json.dumps(record) + "\n")
+        amount += 1
+    return amount
+
+
+def import_task_records(data: dict, records: Iterable[dict]) -> int:
+    """
+    Adds the tasks of export records to data. A task which is already in data, with the same section, planet,
+    building and deadline, is skipped whatever its id is, so importing the same file twice adds nothing. A
+    task whose id is already used by another task gets a new id.
+
+    :param data: dictionary with the item cooldowns and tasks from data.json
+    :param records: Export records
+    :return: The amount of added tasks
+    :raises ValueError: When a record is invalid, in which case data may already contain some of the tasks
+    """
+    existing_keys = {
+        task_natural_key(task)
+        for section in TASK_CLASSES
+        for task in data[section].values()
+    }
+    added_sections = set()
+    amount = 0
+    for number, record in enumerate(records, start=1):
+        try:
+            section, task_id, task = record_to_task(record)
+        except ValueError as e:
+            raise ValueError(f"record {number}: {e}")
+        if task_natural_key(task) in existing_keys:
+            continue
+        existing_keys.add(task_natural_key(task))
+        tasks = data[section]
+        if task_id in tasks:
+            base = task_id.rsplit("_", 1)[0]
+            task_id = MainWindow.next_task_id(
+                base,
+                [
+                    existing_id
+                    for existing_id in tasks
+                    if existing_id.rsplit("_", 1)[0] == base
+                    and existing_id.rsplit("_", 1)[-1].isdigit()
+                ],
+            )
+        # Appending and sorting once afterwards is much faster than insert_task_sorted() for many tasks
+        tasks[task_id] = task
+        added_sections.add(section)
+        amount += 1
+
+    for section in added_sections:
+        data[section] = dict(
+            sorted(data[section].items(), key=lambda item: item[1].deadline)
+        )
+    return amount
+
+
+class HistoryArchive:
+    """
+    Append-only archive of finished tasks, so data.json only has to hold the pending and recently finished
+    tasks. The tasks are appended as export records to history.jsonl; when it reaches max_bytes it is
+    compressed with gzip to history-TIME.jsonl.gz and a new history.jsonl is started. The range of deadlines
+    and the natural keys (see task_natural_key()) of every compressed file are kept in index.json, so queries
+    skip the files outside their range, and archiving never has to decompress a file.
+
+    Every step can be interrupted by a crash without losing or duplicating a task: tasks which are already
+    in the archive are not appended again, a half-written last line is cut off before the next append, and
+    history.jsonl is renamed to history-TIME.jsonl before it is compressed, so an interrupted compression
+    is finished by recover().
+    """
+
+    active_file_name = "history.jsonl"
+    index_file_name = "index.json"
+
+    def __init__(
+        self, directory: str | Path, max_bytes: int = 1000000, max_files: int = 0
+    ):
+        """
+        :param directory: The directory of the archive, which is created when the first task is archived
+        :param max_bytes: The size at which history.jsonl is compressed and a new one is started
+        :param max_files: The amount of compressed files which are kept, 0 to keep all
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+
+    @classmethod
+    def from_settings(
+        cls, history_settings: dict, directory: str | Path
+    ) -> "HistoryArchive":
+        """
+        :param history_settings: The "history_settings" section of settings.json
+        :param directory: The directory of the profile, which the archive directory is relative to
+        :return: The history archive of the profile
+        """
+        return cls(
+            Path(directory, history_settings["directory"]),
+            history_settings["max_bytes"],
+            history_settings["max_files"],
+        )
+
+    @property
+    def active_file_path(self) -> Path:
+        return Path(self.directory, self.active_file_name)
+
+    def load_index(self) -> dict:
+        """
+        :return: Per compressed file the "first" and "last" deadline as POSIX timestamps, the amount of "records" and the natural "keys" of its tasks
+        """
+        try:
+            with open(Path(self.directory, self.index_file_name), "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_index(self, index: dict) -> None:
+        write_file_atomically(
+            Path(self.directory, self.index_file_name), json.dumps(index, indent=4)
+        )
+
+    def compressed_file_names(self) -> list[str]:
+        """
+        :return: The names of the compressed files, from old to new
+        """
+        if not self.directory.is_dir():
+            return []
+        return sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.startswith("history-") and name.endswith(".jsonl.gz")
+        )
+
+    def recover(self) -> None:
+        """
+        Finishes what a crash interrupted: compresses the renamed files which weren't compressed yet, and cuts
+        off a half-written last line of history.jsonl
+        """
+        if not self.directory.is_dir():
+            return
+        for name in sorted(os.listdir(self.directory)):
+            if name.startswith("history-") and name.endswith(".jsonl"):
+                if os.path.exists(Path(self.directory, f"{name}.gz")):
+                    os.remove(Path(self.directory, name))
+                else:
+                    self.compress(name)
+
+        try:
+            file = open(self.active_file_path, "rb+")
+        except FileNotFoundError:
+            return
+        with file:
+            size = file.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            file.seek(size - 1)
+            if file.read(1) == b"\n":
+                return
+            # The last record wasn't completely written, so its task is still in data.json
+            file.seek(0)
+            complete_size = file.read().rfind(b"\n") + 1
+            file.truncate(complete_size)
+            STORAGE_LOGGER.warning(
+                "Removed an incomplete record at the end of %s", self.active_file_name
+            )
+
+    def append(self, records: Iterable[dict]) -> int:
+        """
+        Appends export records to the archive and makes sure they are on disk, and compresses history.jsonl
+        when it has become too big
+
+        :param records: The records of the finished tasks
+        :return: The amount of appended records
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.recover()
+        with open_records_file(str(self.active_file_path), "a") as file:
+            amount = write_task_records(records, file, "jsonl")
+            size = file.tell()
+            file.flush()
+            os.fsync(file.fileno())
+        METRICS.increment("history_records_archived_total", amount)
+        if size >= self.max_bytes:
+            self.rotate()
+        return amount
+
+    def rotate(self) -> None:
+        """Compresses history.jsonl and removes the oldest compressed files which are too many"""
+        name = f"history-{utc_now():%Y%m%dT%H%M%S%f}.jsonl"
+        # From here on the records are in exactly one file, so queries never see them twice
+        os.replace(self.active_file_path, Path(self.directory, name))
+        self.compress(name)
+
+        index = self.load_index()
+        file_names = self.compressed_file_names()
+        if self.max_files:
+            for old_name in file_names[: -self.max_files]:
+                os.remove(Path(self.directory, old_name))
+                index.pop(old_name, None)
+            self.save_index(index)
+
+    def compress(self, name: str) -> None:
+        """
+        Compresses a renamed history.jsonl and adds the range of its deadlines to the index
+
+        :param name: The name of the renamed file, e.g. history-20261019T120000000000.jsonl
+        """
+        first = last = None
+        amount = 0
+        keys = []
+        with open(
+            Path(self.directory, name), "r", encoding="utf-8"
+        ) as source, open_atomically(
+            Path(self.directory, f"{name}.gz"), "wb"
+        ) as compressed_file, gzip.open(
+            compressed_file, "wt", encoding="utf-8"
+        ) as target:
+            for line in source:
+                try:
+                    task = record_to_task(json.loads(line))[2]
+                except (ValueError, KeyError):
+                    # An incomplete last line, whose task is still in data.json
+                    continue
+                target.write(line)
+                keys.append(task_natural_key(task))
+                deadline = task.deadline
+                first = deadline if first is None else min(first, deadline)
+                last = deadline if last is None else max(last, deadline)
+                amount += 1
+        index = self.load_index()
+        index[f"{name}.gz"] = {
+            "first": first,
+            "last": last,
+            "records": amount,
+            "keys": keys,
+        }
+        self.save_index(index)
+        os.remove(Path(self.directory, name))
+        STORAGE_LOGGER.info("Compressed %d archived task(s) to %s.gz", amount, name)
+
+    def iter_records(
+        self, since: datetime | None = None, until: datetime | None = None
+    ) -> Iterator[dict]:
+        """
+        Reads the archived records one at a time, from old to new. Compressed files whose deadlines are all
+        outside the range are skipped without reading them; the records of the other files still have to be
+        filtered with filter_task_records().
+
+        :param since: Skip the files with only deadlines before this time
+        :param until: Skip the files with only deadlines at or after this time
+        :return: The records
+        """
+        self.recover()
+        index = self.load_index()
+        for name in self.compressed_file_names():
+            if not self.in_range(index.get(name), since, until):
+                continue
+            with open_records_file(str(Path(self.directory, name)), "r") as file:
+                yield from read_task_records(file, "jsonl")
+        yield from self.iter_active_records()
+
+    @staticmethod
+    def in_range(
+        file_index: dict | None, since: datetime | None, until: datetime | None
+    ) -> bool:
+        """
+        :param file_index: The entry of a compressed file in index.json, None when it's missing
+        :param since: The start of the range
+        :param until: The end of the range
+        :return: False if the file has no deadlines in the range, True if it has or when it's unknown
+        """
+        if file_index is None:
+            return True
+        if file_index["records"] == 0:
+            return False
+        return not (
+            (since is not None and file_index["last"] < since.timestamp())
+            or (until is not None and file_index["first"] >= until.timestamp())
+        )
+
+    def iter_active_records(self) -> Iterator[dict]:
+        """
+        :return: The records of history.jsonl, which is read through a memory map so its lines are read without copying the file
+        """
+        try:
+            file = open(self.active_file_path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as memory_map:
+                for line in iter(memory_map.readline, b""):
+                    if line.strip():
+                        yield json.loads(line)
+
+    def archived_keys(self, tasks: list[Task]) -> set[tuple[str, str, str, int]]:
+        """
+        :param tasks: Tasks which are about to be archived
+        :return: The natural keys (see task_natural_key()) of the tasks which are already in the archive
+        """
+        keys = {task_natural_key(task) for task in tasks}
+        if not keys or not self.directory.is_dir():
+            return set()
+        deadlines = [task.deadline for task in tasks]
+        since = datetime.fromtimestamp(min(deadlines) - 1, timezone.utc)
+        until = datetime.fromtimestamp(max(deadlines) + 1, timezone.utc)
+        self.recover()
+        index = self.load_index()
+        archived = set()
+        unindexed_names = []
+        for name in self.compressed_file_names():
+            file_index = index.get(name)
+            if not self.in_range(file_index, since, until):
+                continue
+            if file_index is not None and "keys" in file_index:
+                archived.update(keys.intersection(map(tuple, file_index["keys"])))
+            else:
+                # The index was lost, so the file has to be read
+                unindexed_names.append(name)
+
+        def iter_unindexed_records() -> Iterator[dict]:
+            for name in unindexed_names:
+                with open_records_file(str(Path(self.directory, name)), "r") as file:
+                    yield from read_task_records(file, "jsonl")
+
+        for record in itertools.chain(
+            iter_unindexed_records(), self.iter_active_records()
+        ):
             try:
-                os.remove(LOCK_FILE_PATH)
-            except:
-                pass
+                key = task_natural_key(record_to_task(record)[2])
+            except ValueError:
+                continue
+            if key in keys:
+                archived.add(key)
+        return archived
 
-        self.destroy()
+    def move_finished_tasks(self, data: dict, finished_before: float) -> int:
+        """
+        Moves the finished tasks out of data into the archive. The tasks are archived before data is saved, and
+        tasks which are already in the archive aren't appended again, so a crash in between neither loses nor
+        duplicates a task.
+
+        :param data: dictionary with the item cooldowns and tasks from data.json
+        :param finished_before: Only the tasks with a deadline before this POSIX timestamp are moved
+        :return: The amount of moved tasks
+        """
+        finished = [
+            (section, task_id)
+            for section in TASK_CLASSES
+            for task_id, task in data[section].items()
+            if task.cooldown_finished and task.deadline < finished_before
+        ]
+        if not finished:
+            return 0
+        archived = self.archived_keys(
+            [data[section][task_id] for section, task_id in finished]
+        )
+        self.append(
+            task_to_record(section, task_id, data[section][task_id])
+            for section, task_id in finished
+            if task_natural_key(data[section][task_id]) not in archived
+        )
+        for section, task_id in finished:
+            MainWindow.remove_task(data, section, task_id)
+        STORAGE_LOGGER.info("Archived %d finished task(s)", len(finished))
+        return len(finished)
+
+
+def parse_filter_time(value: str) -> datetime:
+    """
+    :param value: A date or time in ISO 8601 format (e.g. "2026-10-01"), in local time without a timezone
+    :return: The time in UTC
+    """
+    try:
+        return parse_deadline(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid date {value!r}, use e.g. 2026-10-01")
+
+
+def export_tasks(arguments: argparse.Namespace) -> None:
+    """
+    Streams the tasks of data.json, of the history archive or of another export file to a JSON Lines or CSV file
+
+    :param arguments: The command line arguments with the output file, the optional --from file or --history and the filters
+    """
+    if arguments.records_from:
+        source = open_records_file(arguments.records_from, "r")
+        records = read_task_records(source, get_records_format(arguments.records_from))
+    elif arguments.history:
+        source = None
+        records = HistoryArchive.from_settings(
+            MainWindow.load_settings()["history_settings"], DATA_FILE_PATH.parent
+        ).iter_records(arguments.since, arguments.until)
+    else:
+        source = None
+        records = iter_task_records(MainWindow.load_data())
+
+    try:
+        records = filter_task_records(
+            records,
+            arguments.planet,
+            arguments.section,
+            arguments.since,
+            arguments.until,
+        )
+        with open_records_file(arguments.export, "w") as file:
+            amount = write_task_records(
+                records, file, get_records_format(arguments.export)
+            )
+    finally:
+        if source is not None:
+            source.close()
+    STORAGE_LOGGER.info("Exported %d task(s) to %s", amount, arguments.export)
+    if arguments.export != "-":
+        print(json.dumps({"exported": amount}))
+
+
+def import_tasks(arguments: argparse.Namespace) -> None:
+    """
+    Adds the tasks of a JSON Lines or CSV export file to data.json with one save. The file is read one record at
+    a time, and nothing is saved when a record is invalid.
+
+    :param arguments: The command line arguments with the input file and the filters
+    """
+    data = MainWindow.load_data()
+    with open_records_file(arguments.import_file, "r") as file:
+        amount = import_task_records(
+            data,
+            filter_task_records(
+                read_task_records(file, get_records_format(arguments.import_file)),
+                arguments.planet,
+                arguments.section,
+                arguments.since,
+                arguments.until,
+            ),
+        )
+    if amount:
+        MainWindow.save_data(data)
+    STORAGE_LOGGER.info("Imported %d task(s) from %s", amount, arguments.import_file)
+    print(json.dumps({"imported": amount}))
 
 
 def create_data_json() -> None:
     """Creates the data.json file if it doesn't exist"""
-    print("Creating data.json")
+    STORAGE_LOGGER.info("Creating data.json")
 
     default_data_json_template = {
         "star_battery": {"cooldown": "", "cooldown_finished": False},
@@ -2516,52 +8249,167 @@ def create_data_json() -> None:
         "helmet": {"cooldown": "", "cooldown_finished": False},
         "workers": {},
         "buildings": {},
+        "deadline_timezone": "UTC",
     }
-    with open("data.json", "w") as file:
+    with open(DATA_FILE_PATH, "w") as file:
         json.dump(default_data_json_template, file, indent=4)
 
 
-def create_settings_json() -> None:
-    """Creates the settings.json file if it doesn't exist"""
-    print("Creating settings.json")
-
-    default_settings_json_template = {
-        "global_settings": {
-            "star_battery": True,
-            "tool_case": True,
-            "helmet": True,
-            "workers": True,
-            "buildings": True,
-            "unique_icons": True,
-            "unique_messages": True,
-            "auto_delete_completed_tasks": False,
-            "check_checkbox_instant_build_time_on_startup": True,
-            "disable_notifications_during_startup": True,
-            "run_notifications_in_background": True,
-            "show_command_window": False,
+def update_data_json() -> None:
+    """
+    Converts the deadlines in data.json files of older versions, which were stored in local time without a
+    timezone, to UTC. The data.json file is marked as converted, so this only happens once.
+    """
+    document = MainWindow.load_data_json()
+    if document.get("deadline_timezone") == "UTC":
+        return
+
+    STORAGE_LOGGER.info("Converting the deadlines in data.json to UTC")
+    # Loading treats deadlines without a timezone as local time, and saving stores them in UTC
+    MainWindow.save_data(data_from_json(document))
+
+
+DEFAULT_SETTINGS_JSON_TEMPLATE = {
+    "global_settings": {
+        "star_battery": True,
+        "tool_case": True,
+        "helmet": True,
+        "workers": True,
+        "buildings": True,
+        "unique_icons": True,
+        "unique_messages": True,
+        "auto_delete_completed_tasks": False,
+        "check_checkbox_instant_build_time_on_startup": True,
+        "disable_notifications_during_startup": True,
+        "run_notifications_in_background": True,
+        "show_command_window": False,
+    },
+    "planets_settings": {
+        "main_planet": {"enabled": True, "planet_image": "Planet_main.png"},
+        "colony_1": {"enabled": False, "planet_image": ""},
+        "colony_2": {"enabled": False, "planet_image": ""},
+        "colony_3": {"enabled": False, "planet_image": ""},
+        "colony_4": {"enabled": False, "planet_image": ""},
+        "colony_5": {"enabled": False, "planet_image": ""},
+        "colony_6": {"enabled": False, "planet_image": ""},
+        "colony_7": {"enabled": False, "planet_image": ""},
+        "colony_8": {"enabled": False, "planet_image": ""},
+        "colony_9": {"enabled": False, "planet_image": ""},
+        "colony_10": {"enabled": False, "planet_image": ""},
+        "colony_11": {"enabled": False, "planet_image": ""},
+    },
+    "notification_settings": {
+        "backends": ["winotify"],
+        "jsonl_path": "notifications.jsonl",
+        "webhook_url": "http://127.0.0.1:8080/notifications",
+        "webhook_timeout": 5,
+        "discord_webhook_url": "",
+        "discord_max_retries": 5,
+        "discord_backoff": 1,
+        "language": "en",
+        "digest_window": 60,
+        "queue_size": 100,
+        "overflow_policy": "drop_lowest_priority",
+        "rate_limits": {
+            "winotify": {"rate": 1, "burst": 5},
+            "webhook": {"rate": 0.5, "burst": 5},
+            "discord": {"rate": 2, "burst": 10},
         },
-        "planets_settings": {
-            "main_planet": {"enabled": True, "planet_image": "Planet_main.png"},
-            "colony_1": {"enabled": False, "planet_image": ""},
-            "colony_2": {"enabled": False, "planet_image": ""},
-            "colony_3": {"enabled": False, "planet_image": ""},
-            "colony_4": {"enabled": False, "planet_image": ""},
-            "colony_5": {"enabled": False, "planet_image": ""},
-            "colony_6": {"enabled": False, "planet_image": ""},
-            "colony_7": {"enabled": False, "planet_image": ""},
-            "colony_8": {"enabled": False, "planet_image": ""},
-            "colony_9": {"enabled": False, "planet_image": ""},
-            "colony_10": {"enabled": False, "planet_image": ""},
-            "colony_11": {"enabled": False, "planet_image": ""},
+    },
+    "scheduler_settings": {
+        "max_sleep": 60,
+        "clock_check_interval": 30,
+        "clock_jump_tolerance": 5,
+        "low_power_mode": False,
+        "low_power_clock_check_interval": 0,
+        "timer_slack": 0,
+    },
+    "alliance_server_settings": {
+        "host": "127.0.0.1",
+        "port": 8766,
+        "api_token": "",
+        "store_file": "alliance_store.jsonl",
+        "shards": 16,
+        "long_poll_timeout": 60,
+        "kept_notifications": 100,
+        "webhook_timeout": 5,
+        "delivery_concurrency": 8,
+        "auto_delete_completed_tasks": True,
+    },
+    "history_settings": {
+        "enabled": True,
+        "directory": "History",
+        "keep_finished_hours": 24,
+        "max_bytes": 1000000,
+        "max_files": 0,
+    },
+    "file_watcher_settings": {
+        "enabled": True,
+        "poll_interval": 5,
+    },
+    "metrics_settings": {
+        "file": "metrics.prom",
+        "write_interval": 60,
+    },
+    "local_server_settings": {
+        "enabled": False,
+        "host": "127.0.0.1",
+        "port": 8765,
+    },
+    "logging_settings": {
+        "file": "galaxy_life_notifier.log",
+        "max_bytes": 1000000,
+        "backup_count": 3,
+        "console": False,
+        "levels": {
+            "scheduler": "INFO",
+            "storage": "INFO",
+            "ui": "INFO",
+            "delivery": "INFO",
+            "server": "INFO",
+            "profiling": "INFO",
         },
-    }
-    with open("settings.json", "w") as file:
-        json.dump(default_settings_json_template, file, indent=4)
+    },
+}
+
+
+def create_settings_json() -> None:
+    """Creates the settings.json file if it doesn't exist"""
+    STORAGE_LOGGER.info("Creating settings.json")
+
+    with open(SETTINGS_FILE_PATH, "w") as file:
+        json.dump(DEFAULT_SETTINGS_JSON_TEMPLATE, file, indent=4)
+
+
+def update_settings_json(path: Path | None = None) -> None:
+    """
+    Adds the settings which were introduced after settings.json was created, keeping all existing values
+
+    :param path: The path of the settings.json file, by default the one of the active profile
+    """
+
+    def add_missing_settings(settings: dict, template: dict) -> bool:
+        changed = False
+        for key, value in template.items():
+            if key not in settings:
+                settings[key] = copy.deepcopy(value)
+                changed = True
+            elif isinstance(value, dict) and isinstance(settings[key], dict):
+                changed = add_missing_settings(settings[key], value) or changed
+        return changed
+
+    settings = MainWindow.load_settings(path)
+    if add_missing_settings(settings, DEFAULT_SETTINGS_JSON_TEMPLATE):
+        STORAGE_LOGGER.info(
+            "Updating settings.json",
+            extra={"data": {"path": str(path or SETTINGS_FILE_PATH)}},
+        )
+        MainWindow.save_settings(settings, path)
 
 
 def create_color_palette_json() -> None:
     """Creates the color_palette.json file if it doesn't exist"""
-    print("Creating color_palette.json")
+    STORAGE_LOGGER.info("Creating color_palette.json")
 
     default_color_palette_json_template = {
         "MAIN_FG_COLOR": DEFAULT_MAIN_FG_COLOR,
@@ -2590,23 +8438,253 @@ def initialize_colors() -> None:
     REMOVE_TASK_BUTTON_HOVER_COLOR = color_palette["REMOVE_TASK_BUTTON_HOVER_COLOR"]
 
 
+def run_simulation(data_file: str, speed: float | None) -> None:
+    """
+    Replays the tasks of a data.json file against a virtual clock, and writes the notifications as JSON
+    lines to the console instead of showing them. The data.json file itself is left untouched.
+
+    :param data_file: The path of the data.json file with the tasks to replay
+    :param speed: How many times faster than the real time the simulation runs, None to jump straight from deadline to deadline
+    """
+    global DATA_FILE_PATH, OUTBOX_FILE_PATH
+
+    # The simulation works on a copy, so the tasks and the outbox of the application aren't changed
+    simulation_directory = tempfile.mkdtemp(prefix="galaxy_life_notifier_simulation_")
+    simulation_profile = AccountProfile(ACTIVE_PROFILE_NAME, simulation_directory)
+    DATA_FILE_PATH = simulation_profile.data_file_path
+    OUTBOX_FILE_PATH = simulation_profile.outbox_file_path
+    shutil.copyfile(data_file, DATA_FILE_PATH)
+    shutil.copyfile(SETTINGS_FILE_PATH, simulation_profile.settings_file_path)
+    update_data_json()
+
+    clock = VirtualClock(speed=speed)
+    memory_backend = MemoryBackend()
+    notification_manager = NotificationManager(
+        backends=[JsonlBackend("-"), memory_backend],
+        clock=clock,
+        stop_when_idle=True,
+        profiles=[simulation_profile],
+    )
+
+    real_start_time = time.monotonic()
+    try:
+        asyncio.run(notification_manager.notification_checker())
+    finally:
+        # Not cleanup(), because the lock file belongs to the notification manager of the application
+        notification_manager.close_profiles()
+        shutil.rmtree(simulation_directory, ignore_errors=True)
+
+    print(
+        f"Simulated {clock.elapsed() / 3600:.1f} hours in {time.monotonic() - real_start_time:.1f} seconds, "
+        f"{len(memory_backend.notifications)} notification(s) sent"
+    )
+
+
+def parse_arguments() -> argparse.Namespace:
+    """
+    Parses the command line arguments
+
+    :return: The parsed command line arguments
+    """
+    parser = argparse.ArgumentParser(description="Galaxy Life Notifier")
+    parser.add_argument(
+        "--simulate",
+        metavar="DATA_FILE",
+        help="replay the tasks of a data.json file against a virtual clock and print the notifications",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1000,
+        help="how many times faster than the real time the simulation runs (default: 1000)",
+    )
+    parser.add_argument(
+        "--jump",
+        action="store_true",
+        help="jump straight from deadline to deadline instead of running at --speed",
+    )
+    parser.add_argument(
+        "--add-tasks",
+        metavar="FILE",
+        help="add the tasks and items of a JSON or CSV file (- for JSON from stdin) in one go and exit",
+    )
+    parser.add_argument(
+        "--export",
+        metavar="FILE",
+        help="write the tasks as JSON Lines, or as CSV when FILE ends with .csv (- for stdout), and exit",
+    )
+    parser.add_argument(
+        "--import",
+        dest="import_file",
+        metavar="FILE",
+        help="add the tasks of a JSON Lines or CSV file written by --export (- for stdin) and exit",
+    )
+    parser.add_argument(
+        "--from",
+        dest="records_from",
+        metavar="FILE",
+        help="export the tasks of this JSON Lines or CSV file instead of data.json, e.g. to convert or filter it",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="export the archived finished tasks instead of data.json",
+    )
+    parser.add_argument(
+        "--planet",
+        action="append",
+        choices=PLANETS,
+        help="only export or import the tasks on this planet, can be given more than once",
+    )
+    parser.add_argument(
+        "--section",
+        action="append",
+        choices=list(TASK_CLASSES),
+        help="only export or import the tasks in this section, can be given more than once",
+    )
+    parser.add_argument(
+        "--since",
+        type=parse_filter_time,
+        help="only export or import the tasks with a deadline at or after this local date or time",
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_filter_time,
+        help="only export or import the tasks with a deadline before this local date or time",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="run the alliance timer server instead of the window",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="NAME",
+        help="show the tasks of this profile, which is created when it doesn't exist yet",
+    )
+    arguments = parser.parse_args()
+    if arguments.profile is not None:
+        try:
+            AccountProfile.named(arguments.profile)
+        except ValueError as e:
+            parser.error(str(e))
+    return arguments
+
+
 if __name__ == "__main__":
-    # Check if data.json exists
-    if not os.path.exists(Path(MAIN_PATH, "data.json")):
-        create_data_json()
+    arguments = parse_arguments()
+
+    if arguments.profile is not None:
+        # The GUI shows the files of the profile, the notifier schedules every profile
+        active_profile = AccountProfile.named(arguments.profile)
+        os.makedirs(active_profile.directory, exist_ok=True)
+        ACTIVE_PROFILE_NAME = active_profile.name
+        DATA_FILE_PATH = active_profile.data_file_path
+        SETTINGS_FILE_PATH = active_profile.settings_file_path
+        OUTBOX_FILE_PATH = active_profile.outbox_file_path
 
     # Check if settings.json exists
-    if not os.path.exists(Path(MAIN_PATH, "settings.json")):
+    if not os.path.exists(SETTINGS_FILE_PATH):
         create_settings_json()
 
+    # Add the settings which are missing in settings.json files of older versions, in every profile
+    for settings_file_path in dict.fromkeys(
+        [SETTINGS_FILE_PATH]
+        + [profile.settings_file_path for profile in AccountProfile.load_all()]
+    ):
+        update_settings_json(settings_file_path)
+
+    settings = MainWindow.load_settings()
+    log_listener = setup_logging(
+        settings["logging_settings"],
+        console=settings["global_settings"]["show_command_window"],
+    )
+    atexit.register(log_listener.stop)
+
+    # Memory tracing starts this early, so the snapshot at exit includes the whole run
+    if "memory" in PROFILER.read_environment():
+        tracemalloc.start(25)
+        atexit.register(PROFILER.take_memory_snapshot)
+
+    if settings["metrics_settings"]["file"]:
+        metrics_file_writer = MetricsFileWriter(
+            Path(MAIN_PATH, settings["metrics_settings"]["file"]),
+            settings["metrics_settings"]["write_interval"],
+        )
+        metrics_file_writer.start()
+        atexit.register(metrics_file_writer.stop)
+
+    # The commands which change the files and exit don't serve, so they can run next to the window
+    runs_file_command = any(
+        (arguments.add_tasks, arguments.export, arguments.import_file)
+    )
+    if settings["local_server_settings"]["enabled"] and not runs_file_command:
+        local_server = LocalHttpServer(
+            settings["local_server_settings"]["host"],
+            settings["local_server_settings"]["port"],
+        )
+        local_server.add_route(
+            "GET",
+            "/metrics",
+            lambda request_body, query: (200, "text/plain", METRICS.render()),
+        )
+        PROFILER.add_routes(local_server)
+        local_server.start()
+    else:
+        local_server = None
+
+    # Check if data.json exists
+    if not os.path.exists(DATA_FILE_PATH):
+        create_data_json()
+
+    # Convert the deadlines in data.json files of older versions to UTC
+    update_data_json()
+
     # Check if color_palette.json exists
     if not os.path.exists(Path(MAIN_PATH, "color_palette.json")):
         create_color_palette_json()
 
+    if arguments.add_tasks:
+        try:
+            add_tasks_from_file(arguments.add_tasks)
+        except (OSError, ValueError) as e:
+            sys.exit(f"No tasks were added: {e}")
+        sys.exit()
+
+    if arguments.export:
+        try:
+            export_tasks(arguments)
+        except (OSError, ValueError) as e:
+            sys.exit(f"The export failed: {e}")
+        sys.exit()
+
+    if arguments.import_file:
+        try:
+            import_tasks(arguments)
+        except (OSError, ValueError) as e:
+            sys.exit(f"No tasks were imported: {e}")
+        sys.exit()
+
+    if arguments.serve:
+        run_alliance_server(settings)
+        sys.exit()
+
+    if arguments.simulate:
+        run_simulation(arguments.simulate, None if arguments.jump else arguments.speed)
+        sys.exit()
+
+    if settings["file_watcher_settings"]["enabled"]:
+        FILE_WATCHER.poll_interval = settings["file_watcher_settings"]["poll_interval"]
+        FILE_WATCHER.start()
+        atexit.register(FILE_WATCHER.stop)
+
     initialize_colors()
 
     # Start the GUI
     main_window = MainWindow()
     main_window.run()
+    # Only registered now, so no request reaches a window which isn't built yet
+    if local_server is not None:
+        local_server.add_route("POST", "/tasks", main_window.tasks_route)
     main_window.protocol("WM_DELETE_WINDOW", main_window.on_closing)
     main_window.mainloop()
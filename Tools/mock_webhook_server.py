@@ -0,0 +1,210 @@
+"""
+A local stand-in for a chat webhook (Discord-style) and for the plain webhook backend, to test the
+notification delivery without sending anything to the internet. Every posted message is printed as one
+JSON line, and GET /stats shows how many requests, connections, messages and embeds were received.
+
+The server keeps connections open between requests like a real webhook, and can imitate its failures:
+a rate limit of a number of messages per window which is answered with 429 and a retry_after, and a
+fraction of requests which fail with a 500.
+
+Point the notifier to it with "discord_webhook_url": "http://127.0.0.1:8080/webhook" (or "webhook_url")
+in the "notification_settings" section of settings.json.
+
+Usage: python Tools/mock_webhook_server.py [--port 8080] [--rate-limit 5] [--rate-limit-window 2] [--failure-rate 0.1]
+"""
+
+import argparse
+import http.server
+import json
+import random
+import sys
+import threading
+import time
+
+
+class MockWebhookRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Answers like a webhook, as configured on the MockWebhookServer"""
+
+    # HTTP/1.1 keeps the connections open between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.mock.record_connection()
+
+    def do_POST(self) -> None:
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, response = self.server.mock.handle_message(body)
+        self.send_json(status, response)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self.send_json(200, self.server.mock.stats())
+        else:
+            self.send_json(404, {"message": "Not found"})
+
+    def send_json(self, status: int, document: dict | None) -> None:
+        body = b"" if document is None else json.dumps(document).encode("utf-8")
+        self.send_response(status)
+        if document is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class MockWebhookServer:
+    """
+    Webhook stand-in which can be started from a test as well as from the command line. The received
+    messages are kept in self.messages.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: int | None = None,
+        rate_limit_window: float = 2,
+        failure_rate: float = 0,
+        print_messages: bool = False,
+    ):
+        """
+        :param host: The address to listen on
+        :param port: The port to listen on, 0 to let the system choose a free port
+        :param rate_limit: The amount of messages per window before 429 responses are sent, None for no limit
+        :param rate_limit_window: The length of a rate limit window in seconds
+        :param failure_rate: The fraction of the requests which fail with a 500
+        :param print_messages: Print every received message as one JSON line
+        """
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.failure_rate = failure_rate
+        self.print_messages = print_messages
+        self.messages = []
+        self.requests = 0
+        self.connections = 0
+        self.rate_limited = 0
+        self.failed = 0
+        self.window_start = time.monotonic()
+        self.window_messages = 0
+        self.lock = threading.Lock()
+        self.http_server = http.server.ThreadingHTTPServer(
+            (host, port), MockWebhookRequestHandler
+        )
+        self.http_server.daemon_threads = True
+        self.http_server.mock = self
+
+    @property
+    def url(self) -> str:
+        host, port = self.http_server.server_address[:2]
+        return f"http://{host}:{port}/webhook"
+
+    def record_connection(self) -> None:
+        with self.lock:
+            self.connections += 1
+
+    def handle_message(self, body: bytes) -> tuple[int, dict | None]:
+        """
+        :param body: The body of a posted message
+        :return: The status and JSON body of the response
+        """
+        with self.lock:
+            self.requests += 1
+            now = time.monotonic()
+            if now - self.window_start >= self.rate_limit_window:
+                self.window_start = now
+                self.window_messages = 0
+
+            if self.rate_limit is not None and self.window_messages >= self.rate_limit:
+                self.rate_limited += 1
+                retry_after = self.rate_limit_window - (now - self.window_start)
+                return 429, {
+                    "message": "You are being rate limited.",
+                    "retry_after": round(retry_after, 3),
+                    "global": False,
+                }
+            if random.random() < self.failure_rate:
+                self.failed += 1
+                return 500, {"message": "Internal server error"}
+
+            try:
+                message = json.loads(body)
+            except json.JSONDecodeError:
+                return 400, {"message": "Invalid JSON"}
+            self.window_messages += 1
+            self.messages.append(message)
+
+        if self.print_messages:
+            print(json.dumps(message), flush=True)
+        # Discord answers an accepted message without content
+        return 204, None
+
+    def stats(self) -> dict:
+        """
+        :return: The amount of requests, connections, messages and embeds which were received
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "messages": len(self.messages),
+                "embeds": sum(
+                    len(message.get("embeds", message.get("notifications", [])))
+                    for message in self.messages
+                ),
+                "rate_limited": self.rate_limited,
+                "failed": self.failed,
+            }
+
+    def start(self) -> None:
+        """Starts serving in a background thread"""
+        threading.Thread(target=self.http_server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self.http_server.shutdown()
+        self.http_server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        help="answer with 429 after this amount of messages per window (default: no limit)",
+    )
+    parser.add_argument(
+        "--rate-limit-window",
+        type=float,
+        default=2,
+        help="the length of a rate limit window in seconds (default: 2)",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0,
+        help="the fraction of the requests which fail with a 500 (default: 0)",
+    )
+    arguments = parser.parse_args()
+
+    mock_webhook_server = MockWebhookServer(
+        arguments.host,
+        arguments.port,
+        arguments.rate_limit,
+        arguments.rate_limit_window,
+        arguments.failure_rate,
+        print_messages=True,
+    )
+    print(f"Listening on {mock_webhook_server.url}", file=sys.stderr, flush=True)
+    try:
+        mock_webhook_server.http_server.serve_forever()
+    except KeyboardInterrupt:
+        print(json.dumps(mock_webhook_server.stats()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Fixtures of the tests of Galaxy Life Notifier.py. Every test gets its own directory with a fresh data.json
+and settings.json, so the tests never touch the files of the application.
+
+Run the tests with: python -m pytest
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY_PATH = Path(__file__).resolve().parent
+
+sys.path.insert(0, str(Path(REPOSITORY_PATH, "Benchmarks")))
+sys.path.insert(0, str(Path(REPOSITORY_PATH, "Tools")))
+
+from benchmark_common import load_notifier_module  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def notifier():
+    """The Galaxy Life Notifier.py module"""
+    return load_notifier_module()
+
+
+@pytest.fixture
+def profile(notifier, tmp_path, monkeypatch):
+    """The default profile, in a temporary directory with a fresh data.json and settings.json"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(notifier, "MAIN_PATH", str(tmp_path))
+    monkeypatch.setattr(notifier, "DATA_FILE_PATH", Path(tmp_path, "data.json"))
+    monkeypatch.setattr(
+        notifier, "OUTBOX_FILE_PATH", Path(tmp_path, "notification_outbox.jsonl")
+    )
+    monkeypatch.setattr(notifier, "SETTINGS_FILE_PATH", Path(tmp_path, "settings.json"))
+    monkeypatch.setattr(notifier, "PROFILES_PATH", Path(tmp_path, "Profiles"))
+
+    notifier.create_data_json()
+    notifier.create_settings_json()
+    settings = notifier.MainWindow.load_settings()
+    # Tasks which are already finished when the notifier starts have to be notified as well
+    settings["global_settings"]["disable_notifications_during_startup"] = False
+    notifier.MainWindow.save_settings(settings)
+    return notifier.AccountProfile.named(notifier.DEFAULT_PROFILE_NAME)
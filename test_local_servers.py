@@ -0,0 +1,150 @@
+import asyncio
+import concurrent.futures
+import copy
+import http.client
+import json
+import types
+
+import pytest
+from mock_webhook_server import MockWebhookServer
+
+
+class WindowStub:
+    """Stands in for the main window, and runs the calls right away instead of on the Tk thread"""
+
+    def __init__(self):
+        self.batches = []
+
+    def call_in_ui_thread(self, function) -> concurrent.futures.Future:
+        future = concurrent.futures.Future()
+        future.set_result(function())
+        return future
+
+    def add_tasks_batch(self, entries: list[dict]) -> list[str]:
+        self.batches.append(entries)
+        return [f"task_{number}" for number in range(len(entries))]
+
+
+@pytest.fixture
+def local_server(notifier):
+    """The local server with the POST /tasks route of a WindowStub, on a free port"""
+    window = WindowStub()
+    local_server = notifier.LocalHttpServer("127.0.0.1", 0)
+    local_server.add_route(
+        "POST", "/tasks", types.MethodType(notifier.MainWindow.tasks_route, window)
+    )
+    local_server.start()
+    local_server.window = window
+    yield local_server
+    local_server.stop()
+
+
+def post(local_server, target: str, body: bytes) -> tuple[int, dict]:
+    host, port = local_server.http_server.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=5)
+    try:
+        connection.request("POST", target, body)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"", b"{", b"1", b'"tasks"', b"null", b'[{"type": "workers"}, []]', b"\xff"],
+)
+def test_post_tasks_rejects_bodies_which_arent_a_list_of_objects(local_server, body):
+    status, response = post(local_server, "/tasks", body)
+    assert status == 400
+    assert "error" in response
+    assert local_server.window.batches == []
+
+
+def test_post_tasks_adds_the_batch_through_the_window(local_server):
+    body = b"type,planet,hours,minutes\nworkers,Main Planet,1,0\n"
+    status, response = post(local_server, "/tasks?format=csv", body)
+    assert status == 200
+    assert response == {"added": ["task_0"]}
+    assert local_server.window.batches == [
+        [{"type": "workers", "planet": "Main Planet", "hours": "1", "minutes": "0"}]
+    ]
+
+
+@pytest.mark.parametrize("body", [b"[]", b"1", b'"text"', b"null", b"{"])
+def test_alliance_server_rejects_bodies_which_arent_an_object(notifier, profile, body):
+    settings = copy.deepcopy(notifier.DEFAULT_SETTINGS_JSON_TEMPLATE)
+    server = notifier.AllianceTimerServer(
+        settings["alliance_server_settings"],
+        settings["global_settings"],
+        settings["notification_settings"]["language"],
+        notifier.VirtualClock(speed=None),
+    )
+    status, _, response = asyncio.run(
+        server.handle_request("POST", "/players/alice/workers", {}, body)
+    )
+    assert status == 400
+    assert "error" in response
+    assert "alice" not in server.players
+
+
+@pytest.fixture
+def mock_webhook():
+    mock_webhook = MockWebhookServer(rate_limit=1, rate_limit_window=0.2)
+    mock_webhook.start()
+    yield mock_webhook
+    mock_webhook.stop()
+
+
+def create_notification(number: int) -> dict:
+    return {
+        "profile": "default",
+        "title": "Galaxy Life Notifier",
+        "message": f"Notification {number}",
+        "icon_image": "Star_Battery.png",
+        "priority": "item",
+        "created_at": "2026-10-19T12:00:00+00:00",
+        "outbox_ids": [f"star_battery:{number}"],
+    }
+
+
+def test_webhook_backend_posts_every_batch_as_one_message(notifier, mock_webhook):
+    mock_webhook.rate_limit = None
+    backend = notifier.WebhookBackend(mock_webhook.url)
+    try:
+        backend.send_batch([create_notification(1), create_notification(2)])
+        backend.send_batch([create_notification(3)])
+    finally:
+        backend.close()
+    assert [len(message["notifications"]) for message in mock_webhook.messages] == [
+        2,
+        1,
+    ]
+    # The connection is reused for the second batch
+    assert mock_webhook.connections == 1
+
+
+def test_webhook_backend_raises_when_the_webhook_fails(notifier, mock_webhook):
+    mock_webhook.failure_rate = 1
+    backend = notifier.WebhookBackend(mock_webhook.url)
+    try:
+        with pytest.raises(RuntimeError):
+            backend.send_batch([create_notification(1)])
+    finally:
+        backend.close()
+    assert mock_webhook.messages == []
+
+
+def test_discord_backend_waits_out_the_rate_limit(notifier, mock_webhook):
+    backend = notifier.DiscordWebhookBackend(mock_webhook.url, 5, 3, 0.05)
+    try:
+        backend.send_batch([create_notification(1)])
+        backend.send_batch([create_notification(2)])
+    finally:
+        backend.close()
+    assert mock_webhook.rate_limited >= 1
+    assert [
+        embed["description"]
+        for message in mock_webhook.messages
+        for embed in message["embeds"]
+    ] == ["Notification 1", "Notification 2"]
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+
+def run_notifier(notifier, profile, backend):
+    """
+    Runs a notification manager with a virtual clock until no deadline is left, and delivers its queued
+    notifications
+
+    :return: The outbox ids of the delivered notifications, in the order they were delivered
+    """
+    notification_manager = notifier.NotificationManager(
+        backends=[backend],
+        clock=notifier.VirtualClock(speed=None),
+        stop_when_idle=True,
+        profiles=[profile],
+    )
+    try:
+        asyncio.run(notification_manager.notification_checker())
+    finally:
+        notification_manager.close_profiles()
+    return [
+        outbox_id
+        for notification in backend.notifications
+        for outbox_id in notification["outbox_ids"]
+    ]
+
+
+def test_replays_undelivered_notifications_once_after_a_crash(notifier, profile):
+    data = notifier.MainWindow.load_data()
+    finished_at = time.time() - 60
+    for number in range(3):
+        data["workers"][f"colony_1_{number}"] = notifier.WorkerTask(
+            "Colony 1", finished_at + number
+        )
+    outbox_ids = [
+        f"workers:{task_id}:{notifier.format_deadline(task.deadline)}"
+        for task_id, task in data["workers"].items()
+    ]
+
+    # The process crashed after the tasks were added to the outbox and marked as finished, when only the
+    # first notification was delivered and the last outbox line was written halfway
+    outbox = notifier.NotificationOutbox(profile.outbox_file_path)
+    for outbox_id, task in zip(outbox_ids, data["workers"].values()):
+        outbox.add(
+            outbox_id, {"section": "workers", "task_info": task.to_dict()}, ["memory"]
+        )
+        task.cooldown_finished = True
+    outbox.mark_delivered(outbox_ids[:1], "memory")
+    outbox.file.write('{"op": "delivered", "id": "workers:colony_1')
+    outbox.file.close()
+    notifier.MainWindow.save_data(data)
+
+    delivered = run_notifier(notifier, profile, notifier.MemoryBackend())
+    assert sorted(delivered) == sorted(outbox_ids[1:])
+
+    # Everything was delivered, so the next start sends nothing
+    assert run_notifier(notifier, profile, notifier.MemoryBackend()) == []
+
+
+def test_notifies_finished_tasks_once(notifier, profile):
+    data = notifier.MainWindow.load_data()
+    data["workers"]["colony_1"] = notifier.WorkerTask("Colony 1", time.time() - 60)
+    data["buildings"]["main_planet_laboratory"] = notifier.BuildingTask(
+        "Main Planet", "Laboratory", time.time() + 3600
+    )
+    notifier.MainWindow.save_data(data)
+
+    delivered = run_notifier(notifier, profile, notifier.MemoryBackend())
+    assert len(delivered) == 2
+    assert len(set(delivered)) == 2
+    data = notifier.MainWindow.load_data()
+    assert data["workers"]["colony_1"].cooldown_finished
+    assert data["buildings"]["main_planet_laboratory"].cooldown_finished
+
+    assert run_notifier(notifier, profile, notifier.MemoryBackend()) == []
+
+
+def test_outbox_ignores_an_incomplete_last_line(notifier, tmp_path):
+    path = tmp_path / "notification_outbox.jsonl"
+    outbox = notifier.NotificationOutbox(path)
+    outbox.add("star_battery:1", {"item": "star_battery"}, ["memory", "jsonl"])
+    outbox.mark_delivered(["star_battery:1"], "memory")
+    outbox.file.write('{"op": "delivered", "id": "star_')
+    outbox.file.close()
+
+    outbox = notifier.NotificationOutbox(path)
+    assert outbox.pending_entries() == [
+        ("star_battery:1", {"item": "star_battery"}, {"jsonl"})
+    ]
+    # An entry which was delivered before isn't added again
+    outbox.mark_delivered(["star_battery:1"], "jsonl")
+    assert not outbox.add("star_battery:1", {"item": "star_battery"}, ["memory"])
+    outbox.close()
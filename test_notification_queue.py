@@ -0,0 +1,36 @@
+import pytest
+
+
+def create_notification(priority: str, number: int) -> dict:
+    return {"priority": priority, "message": f"{priority} {number}"}
+
+
+@pytest.mark.parametrize("max_size", [0, -1, 1.5, "10"])
+def test_rejects_queue_sizes_below_one(notifier, max_size):
+    with pytest.raises(ValueError):
+        notifier.NotificationQueue(max_size)
+
+
+def test_drop_lowest_priority_drops_the_oldest_lowest_priority(notifier):
+    queue = notifier.NotificationQueue(2, "drop_lowest_priority")
+    assert queue.put(create_notification("refinery", 1)) == []
+    assert queue.put(create_notification("workers", 1)) == []
+    assert queue.put(create_notification("item", 1)) == [
+        create_notification("refinery", 1)
+    ]
+    # A notification with a lower priority than everything in the full queue is dropped itself
+    assert queue.put(create_notification("buildings", 1)) == [
+        create_notification("buildings", 1)
+    ]
+    assert queue.get_batch(10) == [
+        create_notification("item", 1),
+        create_notification("workers", 1),
+    ]
+
+
+@pytest.mark.parametrize("overflow_policy", ["drop_newest", "block"])
+def test_drops_the_new_notification_when_full(notifier, overflow_policy):
+    queue = notifier.NotificationQueue(1, overflow_policy, block_timeout=0.01)
+    assert queue.put(create_notification("buildings", 1)) == []
+    assert queue.put(create_notification("item", 1)) == [create_notification("item", 1)]
+    assert queue.get_batch(10) == [create_notification("buildings", 1)]
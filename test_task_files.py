@@ -0,0 +1,187 @@
+import copy
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "not json",
+        "1",
+        '"workers"',
+        "null",
+        '[{"type": "workers"}, 2]',
+        '{"tasks": {"type": "workers"}}',
+        '{"type": "workers"}',
+    ],
+)
+def test_parse_task_batch_rejects_what_isnt_a_list_of_objects(notifier, text):
+    with pytest.raises(ValueError):
+        notifier.parse_task_batch(text)
+
+
+def test_parse_task_batch_reads_csv(notifier):
+    text = "type,planet,hours,minutes,instant_build_time,item\n"
+    text += "workers,Main Planet,2,30,yes,\n"
+    text += "item,,,,,tool_case\n"
+    assert notifier.parse_task_batch(text, "csv") == [
+        {
+            "type": "workers",
+            "planet": "Main Planet",
+            "hours": "2",
+            "minutes": "30",
+            "instant_build_time": True,
+        },
+        {"type": "item", "item": "tool_case"},
+    ]
+
+
+def test_apply_task_batch_rejects_bad_rows_without_adding_anything(notifier, profile):
+    data = notifier.MainWindow.load_data()
+    planets_settings = notifier.MainWindow.load_settings()["planets_settings"]
+    entries = [
+        {"type": "workers", "planet": "Main Planet", "hours": 1, "minutes": 0},
+        {"type": "item", "item": "sword"},
+        {"type": "workers", "planet": "Colony 1", "hours": 1, "minutes": 0},
+        {"type": "buildings", "planet": "Main Planet", "hours": "x", "minutes": 0},
+        {"type": "fleet"},
+    ]
+    with pytest.raises(ValueError) as error:
+        notifier.apply_task_batch(
+            data, entries, datetime.now(timezone.utc), planets_settings
+        )
+    for number in (2, 3, 4, 5):
+        assert f"entry {number}:" in str(error.value)
+    assert "entry 1:" not in str(error.value)
+    assert data == notifier.MainWindow.load_data()
+
+
+def test_apply_task_batch_adds_every_row(notifier, profile):
+    data = notifier.MainWindow.load_data()
+    planets_settings = notifier.MainWindow.load_settings()["planets_settings"]
+    entries = notifier.parse_task_batch(
+        '{"tasks": ['
+        '{"type": "workers", "planet": "Main Planet", "hours": 1, "minutes": 0},'
+        '{"type": "buildings", "planet": "Main Planet", "building": "Laboratory", "hours": 2, "minutes": 0},'
+        '{"type": "item", "item": "helmet"}'
+        "]}"
+    )
+    ids = notifier.apply_task_batch(
+        data, entries, datetime.now(timezone.utc), planets_settings
+    )
+    assert ids[2] == "helmet"
+    assert ids[0] in data["workers"]
+    assert ids[1] in data["buildings"]
+    assert data["buildings"][ids[1]].building == "Laboratory"
+
+
+def create_tasks(notifier) -> dict:
+    """
+    :return: data with finished and unfinished workers and buildings tasks
+    """
+    data = notifier.MainWindow.load_data()
+    now = time.time()
+    data["workers"]["main_planet"] = notifier.WorkerTask(
+        "Main Planet", now - 7200, True
+    )
+    data["workers"]["colony_1"] = notifier.WorkerTask("Colony 1", now + 3600.123456)
+    data["buildings"]["main_planet_laboratory"] = notifier.BuildingTask(
+        "Main Planet", "Laboratory", now - 60, True
+    )
+    data["buildings"]["main_planet_factory"] = notifier.BuildingTask(
+        "Main Planet", "Factory", now + 600
+    )
+    return data
+
+
+def get_natural_keys(notifier, data: dict) -> set:
+    return {
+        notifier.task_natural_key(task)
+        for section in notifier.TASK_CLASSES
+        for task in data[section].values()
+    }
+
+
+@pytest.mark.parametrize("file_name", ["tasks.jsonl", "tasks.csv", "tasks.jsonl.gz"])
+def test_export_import_round_trip(notifier, profile, tmp_path, file_name):
+    data = create_tasks(notifier)
+    path = str(tmp_path / file_name)
+    records_format = notifier.get_records_format(path)
+    with notifier.open_records_file(path, "w") as file:
+        amount = notifier.write_task_records(
+            notifier.iter_task_records(data), file, records_format
+        )
+    assert amount == 4
+
+    imported = notifier.MainWindow.load_data()
+    with notifier.open_records_file(path, "r") as file:
+        assert (
+            notifier.import_task_records(
+                imported, notifier.read_task_records(file, records_format)
+            )
+            == 4
+        )
+    assert get_natural_keys(notifier, imported) == get_natural_keys(notifier, data)
+    for section in notifier.TASK_CLASSES:
+        assert {
+            task_id: task.cooldown_finished for task_id, task in data[section].items()
+        } == {
+            task_id: task.cooldown_finished
+            for task_id, task in imported[section].items()
+        }
+
+    # Importing the same file again adds nothing
+    with notifier.open_records_file(path, "r") as file:
+        assert (
+            notifier.import_task_records(
+                imported, notifier.read_task_records(file, records_format)
+            )
+            == 0
+        )
+
+
+def test_import_rejects_invalid_records(notifier, profile):
+    data = notifier.MainWindow.load_data()
+    records = [
+        notifier.task_to_record(
+            "workers", "main_planet", notifier.WorkerTask("Main Planet", time.time())
+        ),
+        {"section": "workers", "task_id": "x", "planet": "Pluto", "deadline": ""},
+    ]
+    with pytest.raises(ValueError, match="record 2"):
+        notifier.import_task_records(data, records)
+
+
+def test_move_finished_tasks_twice_archives_every_task_once(
+    notifier, profile, tmp_path
+):
+    archive = notifier.HistoryArchive(tmp_path / "History", 1024 * 1024, 3)
+    data = create_tasks(notifier)
+    saved_data = copy.deepcopy(data)
+
+    assert archive.move_finished_tasks(data, time.time()) == 2
+    assert set(data["workers"]) == {"colony_1"}
+    assert set(data["buildings"]) == {"main_planet_factory"}
+    assert archive.move_finished_tasks(data, time.time()) == 0
+
+    # A crash before data.json was saved leaves the archived tasks in data.json, which are moved again
+    # without being archived twice
+    assert archive.move_finished_tasks(saved_data, time.time()) == 2
+    records = list(archive.iter_records())
+    assert sorted(record["task_id"] for record in records) == [
+        "main_planet",
+        "main_planet_laboratory",
+    ]
+
+
+def test_move_finished_tasks_after_rotation(notifier, profile, tmp_path):
+    # A tiny max_bytes rotates the active file on every append, so the tasks end up in compressed files
+    archive = notifier.HistoryArchive(tmp_path / "History", 1, 0)
+    data = create_tasks(notifier)
+    saved_data = copy.deepcopy(data)
+    archive.move_finished_tasks(data, time.time())
+    archive.move_finished_tasks(saved_data, time.time())
+    assert any(path.suffix == ".gz" for path in (tmp_path / "History").iterdir())
+    assert len(list(archive.iter_records())) == 2